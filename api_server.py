@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+별자리 운세 JSON API 서버 (WSGI)
+
+Streamlit 세션 없이 모바일 / 위젯 클라이언트에 운세를 JSON으로 제공합니다.
+show_horoscope_results와 같은 HoroscopeService(메모리 캐시 + 디스크 저장소)를 사용합니다.
+
+    GET /horoscope/{sign}/{date}   한 별자리 운세 (sign: 물병자리 또는 aquarius, date: YYYY-MM-DD 또는 today,
+                                   2020-01-01 ~ 2030-12-31)
+    GET /horoscope/{date}          12개 별자리 운세
+    GET /search?q=금전&sign=taurus&from=2020-01&to=2025-12&limit=50
+                                   지난 운세 검색 (네트워크 요청 없이 아카이브 색인에서 검색)
+    GET /metrics                   Prometheus 형식 지표 (API_METRICS=local이면 이 서버의 루프백 주소에서 온 요청만,
+                                   public이면 모두, off면 404)
+    GET /healthz                   상태 확인
+
+응답에는 ETag가 붙으며, If-None-Match가 일치하거나 *이면 304로 응답합니다.
+
+HOROSCOPE_SCHEDULER=1이면 main()으로 실행할 때는 시작할 때, gunicorn처럼 application만 불러오는 경우에는
+각 작업자 프로세스가 첫 요청을 받을 때 미리 생성 스케줄러를 시작합니다.
+
+사용 예:
+    python api_server.py --port 8000
+    gunicorn --threads 8 api_server:application
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import logging
+import ipaddress
+import os
+from socketserver import ThreadingMixIn
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from startup import load_env
+
+# 환경 변수 로드 (설정을 읽는 모듈보다 먼저, gunicorn api_server:application처럼 main()을 거치지 않아도 실행)
+load_env()
+
+from archive import DEFAULT_SEARCH_LIMIT, PERIOD_PATTERN, get_default_archive  # noqa: E402
+from metrics import render_prometheus, timer  # noqa: E402
+from scheduler import start_default_scheduler  # noqa: E402
+from segmenter import ENGLISH_ZODIAC, ZODIAC_ENGLISH  # noqa: E402
+from service import SUMMARY_SOURCE_FALLBACK, get_default_service  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = os.getenv("API_HOST", "127.0.0.1")
+DEFAULT_PORT = int(os.getenv("API_PORT", "8000"))
+FRESH_MAX_AGE = 300  # 새로 생성된 결과의 클라이언트 캐시 시간(초)
+# /metrics 노출 범위: local(루프백 주소에서 온 요청만, 기본값) / public / off
+# (공개 서버에서 지표를 수집하려면 METRICS_PORT의 별도 엔드포인트를 내부망에 바인딩해 사용)
+METRICS_ACCESS = os.getenv("API_METRICS", "local").lower()
+# 조회 가능한 날짜 범위 (main.py의 날짜 선택 범위와 같음, 범위 밖 날짜로 스크래핑 / 생성을 유발하지 않도록 제한)
+MIN_DATE = datetime.date(2020, 1, 1)
+MAX_DATE = datetime.date(2030, 12, 31)
+
+_STATUS_TEXT = {
+    200: "200 OK",
+    304: "304 Not Modified",
+    400: "400 Bad Request",
+    404: "404 Not Found",
+    405: "405 Method Not Allowed",
+    500: "500 Internal Server Error",
+}
+
+Response = Tuple[int, List[Tuple[str, str]], bytes]
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def parse_sign(value: str) -> str:
+    """한글 별자리 이름 또는 영어 이름(aquarius)을 한글 이름으로 바꿉니다."""
+    if value in ZODIAC_ENGLISH:
+        return value
+    zodiac = ENGLISH_ZODIAC.get(value.lower())
+    if zodiac is None:
+        raise ApiError(404, f"알 수 없는 별자리입니다: {value}")
+    return zodiac
+
+
+def parse_date(value: str) -> datetime.date:
+    if value == "today":
+        return datetime.date.today()
+    try:
+        date = datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(400, f"날짜 형식이 올바르지 않습니다 (YYYY-MM-DD): {value}")
+    if not MIN_DATE <= date <= MAX_DATE:
+        raise ApiError(400, f"{MIN_DATE.isoformat()}부터 {MAX_DATE.isoformat()}까지의 날짜만 조회할 수 있습니다: {value}")
+    return date
+
+
+def serialize_entry(entry: dict) -> dict:
+    return {
+        "date": entry["date"].isoformat(),
+        "zodiac": entry["zodiac"],
+        "sign": ZODIAC_ENGLISH.get(entry["zodiac"]),
+        "marie_claire": entry["marie_claire"],
+        "summary": entry["summary"],
+        "summary_source": entry["summary_source"],
+        "stale": entry["stale"],
+    }
+
+
+def _cache_control(entries: List[dict]) -> str:
+    # 기본 요약으로 대신했거나 새로 고치는 중인 결과는 클라이언트가 다시 확인하도록 함
+    if any(entry["stale"] or entry["summary_source"] == SUMMARY_SOURCE_FALLBACK for entry in entries):
+        return "no-cache"
+    return f"public, max-age={FRESH_MAX_AGE}"
+
+
+def _json_response(status: int, payload: dict, environ: dict, cache_control: str = "no-store") -> Response:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    headers = [("ETag", etag), ("Cache-Control", cache_control)]
+
+    if status == 200:
+        tags = _if_none_match(environ)
+        if "*" in tags or etag in tags:
+            return 304, headers, b""
+
+    headers.append(("Content-Type", "application/json; charset=utf-8"))
+    return status, headers, body
+
+
+def _if_none_match(environ: dict) -> List[str]:
+    value = environ.get("HTTP_IF_NONE_MATCH", "")
+    return [tag.strip().removeprefix("W/") for tag in value.split(",") if tag.strip()]
+
+
+def horoscope_for_sign(environ: dict, sign: str, date_value: str) -> Response:
+    zodiac = parse_sign(sign)
+    date = parse_date(date_value)
+    with timer("api_request", route="sign"):
+        entry = get_default_service().get_horoscope(date, zodiac)
+    return _json_response(200, serialize_entry(entry), environ, _cache_control([entry]))
+
+
+def horoscope_for_date(environ: dict, date_value: str) -> Response:
+    date = parse_date(date_value)
+    with timer("api_request", route="date"):
+        entries = get_default_service().get_horoscopes(date, list(ZODIAC_ENGLISH.keys()))
+    payload = {
+        "date": date.isoformat(),
+        "horoscopes": [serialize_entry(entry) for entry in entries.values()],
+    }
+    return _json_response(200, payload, environ, _cache_control(list(entries.values())))
+
+
+def parse_period(value: Optional[str]) -> Optional[str]:
+    if value and not PERIOD_PATTERN.match(value):
+        raise ApiError(400, f"기간 형식이 올바르지 않습니다 (YYYY-MM): {value}")
+    return value or None
+
+
+def search_endpoint(environ: dict) -> Response:
+    params = {name: values[0] for name, values in parse_qs(environ.get("QUERY_STRING", "")).items()}
+    query = params.get("q", "").strip()
+    if not query:
+        raise ApiError(400, "검색어(q)를 입력해주세요.")
+    zodiac = parse_sign(params["sign"]) if params.get("sign") else None
+    try:
+        limit = max(1, min(int(params.get("limit", DEFAULT_SEARCH_LIMIT)), 500))
+    except ValueError:
+        raise ApiError(400, f"limit은 숫자여야 합니다: {params['limit']}")
+    with timer("api_request", route="search"):
+        results = get_default_archive().search(
+            query, zodiac=zodiac,
+            period_from=parse_period(params.get("from")), period_to=parse_period(params.get("to")),
+            limit=limit,
+        )
+    payload = {"query": query, "count": len(results), "results": results}
+    # 아카이브는 백필 / 새 달 저장으로 늘어나므로 ETag로 재검증하게 함
+    return _json_response(200, payload, environ, "no-cache")
+
+
+def _is_loopback(address: str) -> bool:
+    try:
+        return ipaddress.ip_address(address).is_loopback
+    except ValueError:
+        return False
+
+
+def metrics_endpoint(environ: dict) -> Response:
+    if METRICS_ACCESS == "off" or (METRICS_ACCESS != "public" and not _is_loopback(environ.get("REMOTE_ADDR", ""))):
+        raise ApiError(404, "요청한 경로를 찾을 수 없습니다.")
+    body = render_prometheus().encode("utf-8")
+    return 200, [("Content-Type", "text/plain; version=0.0.4; charset=utf-8")], body
+
+
+def health_endpoint(environ: dict) -> Response:
+    return _json_response(200, {"status": "ok"}, environ)
+
+
+def route(path: str) -> Optional[Tuple[Callable[..., Response], List[str]]]:
+    """경로를 처리 함수와 경로 인자로 바꿉니다. 일치하는 경로가 없으면 None."""
+    parts = [part for part in path.strip("/").split("/") if part]
+    if parts == ["metrics"]:
+        return metrics_endpoint, []
+    if parts == ["healthz"]:
+        return health_endpoint, []
+    if parts == ["search"]:
+        return search_endpoint, []
+    if parts and parts[0] == "horoscope":
+        if len(parts) == 3:
+            return horoscope_for_sign, parts[1:]
+        if len(parts) == 2:
+            return horoscope_for_date, parts[1:]
+    return None
+
+
+_scheduler_checked = False
+
+
+def _ensure_scheduler() -> None:
+    # gunicorn 작업자는 main()을 거치지 않으므로 첫 요청에서 시작 (fork 뒤라 스레드가 작업자에 남음)
+    global _scheduler_checked
+    if not _scheduler_checked:
+        _scheduler_checked = True
+        try:
+            start_default_scheduler()
+        except Exception as e:
+            logger.exception("스케줄러를 시작할 수 없습니다: %s", e)
+
+
+def application(environ: dict, start_response) -> List[bytes]:
+    """WSGI 애플리케이션"""
+    _ensure_scheduler()
+    method = environ.get("REQUEST_METHOD", "GET")
+    try:
+        if method not in ("GET", "HEAD"):
+            raise ApiError(405, "GET 요청만 지원합니다.")
+        # PEP 3333: PATH_INFO는 URL 디코딩된 바이트를 latin-1로 읽은 문자열
+        path = environ.get("PATH_INFO", "/").encode("latin-1").decode("utf-8", "replace")
+        matched = route(path)
+        if matched is None:
+            raise ApiError(404, "요청한 경로를 찾을 수 없습니다.")
+        handler, args = matched
+        status, headers, body = handler(environ, *args)
+    except ApiError as e:
+        status, headers, body = _json_response(e.status, {"error": e.message}, environ)
+    except Exception as e:
+        logger.exception("API 처리 오류: %s", e)
+        status, headers, body = _json_response(500, {"error": "서버 오류가 발생했습니다."}, environ)
+
+    if method == "HEAD":
+        headers.append(("Content-Length", str(len(body))))
+        body = b""
+    elif status != 304:
+        headers.append(("Content-Length", str(len(body))))
+    if status == 405:
+        headers.append(("Allow", "GET, HEAD"))
+    start_response(_STATUS_TEXT[status], headers)
+    return [body]
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """요청마다 스레드를 사용하는 WSGI 서버 (동시 클라이언트 처리)"""
+    daemon_threads = True
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        logger.debug("%s - " + format, self.address_string(), *args)
+
+
+def create_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> WSGIServer:
+    return make_server(host, port, application, server_class=ThreadingWSGIServer, handler_class=QuietRequestHandler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="별자리 운세 JSON API 서버")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"바인딩 주소 (기본값: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"포트 (기본값: {DEFAULT_PORT})")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    server = create_server(args.host, args.port)
+    start_default_scheduler()
+    logger.info("운세 API 서버 시작: http://%s:%d", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
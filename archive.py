@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+지난 운세 아카이브와 전문 검색
+
+저장소(horoscopes 테이블)에 쌓인 월별 원문 섹션을 글자 2-gram / 3-gram 역색인으로 색인하여
+형태소 분석기 없이 한국어 검색어를 네트워크 요청 없이 밀리초 단위로 찾습니다.
+색인은 저장소와 같은 SQLite 파일에 두며, 검색할 때 새로 저장되거나 바뀐 섹션만 이어서 색인합니다.
+
+사용 예:
+    python archive.py backfill --start 2020-01 --end 2025-07   # 지난 월별 페이지 수집 + 색인
+    python archive.py search 금전 --sign 황소자리
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterator, List, Optional, Set
+
+from startup import load_env
+
+# 환경 변수 로드 (설정을 읽는 모듈보다 먼저, import 시점에 한 번)
+load_env()
+
+from metrics import timer  # noqa: E402
+from store import KIND_RAW, HoroscopeStore, get_default_store, month_key  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+NGRAM_SIZES = (2, 3)
+DEFAULT_SEARCH_LIMIT = 50
+SNIPPET_CHARS = 40  # 검색어 앞뒤로 보여줄 글자 수
+PERIOD_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """색인 / 검색에 사용할 형태로 바꿉니다 (호환 문자 통일, 소문자)."""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """공백과 문장 부호로 나눈 단어 목록 (한글 음절도 \\w에 포함)"""
+    return _TOKEN_PATTERN.findall(normalize(text))
+
+
+def ngrams(token: str, sizes=NGRAM_SIZES) -> Iterator[str]:
+    for size in sizes:
+        for start in range(len(token) - size + 1):
+            yield token[start:start + size]
+
+
+def document_grams(text: str) -> Set[str]:
+    """문서의 모든 단어에서 만든 2-gram / 3-gram 집합 (단어 경계를 넘는 n-gram은 만들지 않음)"""
+    grams = set()
+    for token in tokenize(text):
+        grams.update(ngrams(token))
+    return grams
+
+
+def query_grams(token: str) -> Set[str]:
+    """
+    검색어 단어 하나를 찾는 데 필요한 n-gram.
+
+    3글자 이상이면 더 선택적인 3-gram만, 2글자면 2-gram을 사용하고,
+    1글자 단어는 색인으로 거르지 않고 본문 확인에서만 검사합니다.
+    """
+    if len(token) >= 3:
+        return set(ngrams(token, (3,)))
+    if len(token) == 2:
+        return {token}
+    return set()
+
+
+def make_snippet(content: str, token: str, width: int = SNIPPET_CHARS) -> str:
+    """본문에서 검색어가 처음 나오는 부분의 앞뒤를 잘라 반환합니다."""
+    text = unicodedata.normalize("NFKC", content)
+    position = text.lower().find(token)
+    if position < 0:
+        return text[:width * 2].strip()
+    start = max(0, position - width)
+    end = min(len(text), position + len(token) + width)
+    snippet = " ".join(text[start:end].split())
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
+
+
+class HoroscopeArchive:
+    """
+    저장소의 월별 원문 섹션에 대한 n-gram 역색인
+
+    저장소와 같은 SQLite 파일을 별도 연결로 열어 archive_docs / archive_postings 테이블에 색인하며,
+    검색은 n-gram 게시 목록의 교집합으로 후보를 고른 뒤 본문에 검색어가 실제로 있는지 확인합니다.
+    """
+
+    def __init__(self, store: Optional[HoroscopeStore] = None):
+        # 저장소가 horoscopes 테이블을 만들어 두므로 같은 파일을 열기 전에 먼저 생성
+        self.store = store or get_default_store()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.store.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS archive_docs (
+                doc_id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                period TEXT NOT NULL,
+                zodiac TEXT NOT NULL,
+                content TEXT NOT NULL,
+                indexed_at REAL NOT NULL,
+                UNIQUE (source, period, zodiac)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS archive_postings (
+                gram TEXT NOT NULL,
+                doc_id INTEGER NOT NULL,
+                PRIMARY KEY (gram, doc_id)
+            ) WITHOUT ROWID
+            """
+        )
+        # 다시 색인할 때 문서의 기존 n-gram을 지우기 위한 색인
+        self._conn.execute("CREATE INDEX IF NOT EXISTS archive_postings_doc ON archive_postings (doc_id)")
+        self._conn.commit()
+
+    def sync(self) -> int:
+        """
+        저장소에 새로 저장되었거나 바뀐 원문 섹션을 색인합니다.
+
+        Returns:
+            새로 색인한 문서 수
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT h.source, h.period, h.zodiac, h.content, h.updated_at
+                FROM horoscopes h
+                LEFT JOIN archive_docs d
+                    ON d.source = h.source AND d.period = h.period AND d.zodiac = h.zodiac
+                WHERE h.kind = ? AND (d.doc_id IS NULL OR d.indexed_at < h.updated_at)
+                """,
+                (KIND_RAW,),
+            ).fetchall()
+            if not rows:
+                return 0
+
+            with timer("archive_index"):
+                for source, period, zodiac, content, updated_at in rows:
+                    self._conn.execute(
+                        """
+                        INSERT INTO archive_docs (source, period, zodiac, content, indexed_at) VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT (source, period, zodiac) DO UPDATE SET content=excluded.content, indexed_at=excluded.indexed_at
+                        """,
+                        (source, period, zodiac, content, updated_at),
+                    )
+                    doc_id = self._conn.execute(
+                        "SELECT doc_id FROM archive_docs WHERE source=? AND period=? AND zodiac=?",
+                        (source, period, zodiac),
+                    ).fetchone()[0]
+                    self._conn.execute("DELETE FROM archive_postings WHERE doc_id=?", (doc_id,))
+                    self._conn.executemany(
+                        "INSERT INTO archive_postings (gram, doc_id) VALUES (?, ?)",
+                        [(gram, doc_id) for gram in document_grams(content)],
+                    )
+                self._conn.commit()
+        logger.info("아카이브 색인: %d개 섹션", len(rows))
+        return len(rows)
+
+    def search(self, query: str, zodiac: Optional[str] = None, source: Optional[str] = None,
+               period_from: Optional[str] = None, period_to: Optional[str] = None,
+               limit: int = DEFAULT_SEARCH_LIMIT) -> List[dict]:
+        """
+        검색어의 모든 단어가 들어 있는 월별 운세를 최신 순으로 찾습니다.
+
+        Args:
+            query: 검색어 (공백으로 나눈 단어를 모두 포함하는 섹션을 찾음)
+            zodiac: 별자리 이름 (None이면 전체)
+            source: 출처 (None이면 전체)
+            period_from, period_to: 기간 범위 (YYYY-MM, 양 끝 포함)
+            limit: 최대 결과 수
+
+        Returns:
+            [{'source', 'period', 'zodiac', 'snippet', 'matches'}] (matches: 첫 단어가 나온 횟수)
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        self.sync()
+
+        with timer("archive_search"):
+            grams = set()
+            for token in tokens:
+                grams.update(query_grams(token))
+
+            conditions, params = [], []
+            if grams:
+                placeholders = ",".join("?" * len(grams))
+                conditions.append(
+                    f"doc_id IN (SELECT doc_id FROM archive_postings WHERE gram IN ({placeholders}) "
+                    f"GROUP BY doc_id HAVING COUNT(*) = ?)"
+                )
+                params.extend(grams)
+                params.append(len(grams))
+            for column, operator, value in (("zodiac", "=", zodiac), ("source", "=", source),
+                                            ("period", ">=", period_from), ("period", "<=", period_to)):
+                if value:
+                    conditions.append(f"{column} {operator} ?")
+                    params.append(value)
+            where = " AND ".join(conditions) or "1"
+
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT source, period, zodiac, content FROM archive_docs WHERE {where} ORDER BY period DESC, zodiac",
+                    params,
+                ).fetchall()
+
+            # n-gram 교집합은 후보일 뿐이므로 본문에 단어가 실제로 있는지 확인
+            results = []
+            for source_name, period, zodiac_name, content in rows:
+                normalized = normalize(content)
+                if not all(token in normalized for token in tokens):
+                    continue
+                results.append({
+                    "source": source_name,
+                    "period": period,
+                    "zodiac": zodiac_name,
+                    "snippet": make_snippet(content, tokens[0]),
+                    "matches": normalized.count(tokens[0]),
+                })
+                if len(results) >= limit:
+                    break
+        return results
+
+    def periods(self) -> List[str]:
+        """색인된 기간 목록 (최신 순)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT period FROM archive_docs ORDER BY period DESC").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def month_range(start: datetime.date, end: datetime.date) -> List[datetime.date]:
+    """start와 end가 속한 달을 포함한 매달 1일 목록"""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(datetime.date(year, month, 1))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def backfill(archive: HoroscopeArchive, start: datetime.date, end: datetime.date) -> Dict[str, int]:
+    """
+    기간 내 월별 페이지 중 저장소에 없는 달을 가져와 저장하고 색인합니다.
+
+    Returns:
+        {기간: 저장된 별자리 수} (가져오지 못한 달은 0)
+    """
+    from scraper import HoroscopeScraper
+
+    scraper = HoroscopeScraper(store=archive.store)
+    counts = {}
+    for date in month_range(start, end):
+        key = month_key(date)
+        stored = archive.store.get_period(KIND_RAW, "marie_claire", key)
+        if stored:
+            counts[key] = len(stored)
+            continue
+        try:
+            counts[key] = len(scraper.get_marie_claire_sections(date))
+            print(f"📖 {key} 마리끌레어 페이지: {counts[key]}개 별자리 저장")
+        except Exception as e:
+            print(f"⚠️  {key} 마리끌레어 페이지를 가져오지 못했습니다: {e}")
+            counts[key] = 0
+    indexed = archive.sync()
+    print(f"🔎 색인: {indexed}개 섹션")
+    return counts
+
+
+_default_archive = None
+_default_archive_lock = threading.Lock()
+
+
+def get_default_archive() -> HoroscopeArchive:
+    """기본 저장소를 색인하는 프로세스 공용 아카이브를 반환합니다."""
+    global _default_archive
+    with _default_archive_lock:
+        if _default_archive is None:
+            _default_archive = HoroscopeArchive()
+        return _default_archive
+
+
+def _month(value: str) -> datetime.date:
+    if not PERIOD_PATTERN.match(value):
+        raise argparse.ArgumentTypeError(f"기간 형식이 올바르지 않습니다 (YYYY-MM): {value}")
+    return datetime.date.fromisoformat(f"{value}-01")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="지난 운세 아카이브 / 검색")
+    parser.add_argument("--db", help="저장소 경로 (기본값: HOROSCOPE_DB_PATH 또는 horoscope_cache.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill_parser = commands.add_parser("backfill", help="지난 월별 페이지를 가져와 저장하고 색인")
+    backfill_parser.add_argument("--start", type=_month, default=datetime.date(2020, 1, 1), help="시작 달 (YYYY-MM, 기본값: 2020-01)")
+    backfill_parser.add_argument("--end", type=_month, default=datetime.date.today(), help="마지막 달 (YYYY-MM, 기본값: 이번 달)")
+
+    search_parser = commands.add_parser("search", help="색인된 운세 검색")
+    search_parser.add_argument("query", help="검색어")
+    search_parser.add_argument("--sign", help="별자리 이름")
+    search_parser.add_argument("--limit", type=int, default=DEFAULT_SEARCH_LIMIT, help=f"최대 결과 수 (기본값: {DEFAULT_SEARCH_LIMIT})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    archive = HoroscopeArchive(HoroscopeStore(args.db) if args.db else None)
+    if args.command == "backfill":
+        counts = backfill(archive, args.start, args.end)
+        missing = [period for period, count in counts.items() if count == 0]
+        print(f"✨ 완료: {len(counts) - len(missing)}/{len(counts)}개월 저장")
+        sys.exit(0 if not missing else 1)
+
+    started = time.perf_counter()
+    results = archive.search(args.query, zodiac=args.sign, limit=args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    for result in results:
+        print(f"[{result['period']}] {result['zodiac']} ({result['matches']}회): {result['snippet']}")
+    print(f"🔎 {len(results)}건 ({elapsed:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
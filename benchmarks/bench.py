@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+스크래퍼 / 종합 운세 경로 벤치마크
+
+녹화된 HTML 픽스처와 로컬 스텁 messages API로 네트워크 없이 다음 단계를 측정합니다.
+    - parse: 사이트별 본문 추출 (설치된 파서 백엔드별)
+    - segment: 12개 별자리 섹션 분할
+    - clean_text: 텍스트 정리
+    - prompt_build: 종합 운세 프롬프트 생성
+    - e2e_cold / e2e_warm: show_horoscope_results와 같은 경로 (스크래핑 + 종합 운세), 12개 별자리
+
+사용 예:
+    python -m benchmarks.bench
+    python -m benchmarks.bench --save bench_baseline.json
+    python -m benchmarks.bench --baseline bench_baseline.json --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import html_parsing  # noqa: E402
+from benchmarks.stubs import load_fixture, start_stub_server  # noqa: E402
+from cache import TTLCache  # noqa: E402
+from claude_api import ClaudeAPI  # noqa: E402
+from rate_limit import HostRateLimiter  # noqa: E402
+from scraper import HoroscopeScraper  # noqa: E402
+from segmenter import ZODIAC_ENGLISH, clean_text, default_segmenter  # noqa: E402
+
+BENCH_DATE = datetime.date(2025, 7, 15)  # 픽스처(horoscope2507)와 같은 달
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """초 단위 측정값을 p50/p95/평균(ms)과 초당 처리량으로 요약합니다."""
+    total = sum(samples)
+    return {
+        "iterations": len(samples),
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "mean_ms": statistics.mean(samples) * 1000,
+        "ops_per_sec": len(samples) / total if total > 0 else float("inf"),
+    }
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int = 3) -> List[float]:
+    """fn을 반복 실행하며 호출별 소요 시간(초)을 측정합니다. 스크래퍼 디버그 출력은 숨깁니다."""
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            fn()
+        for _ in range(iterations):
+            started = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def peak_rss_mb() -> float:
+    # 리눅스에서 ru_maxrss는 KB 단위
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_clients(base_url: str, page_cache: TTLCache, summary_cache: TTLCache):
+    """스텁 서버를 바라보는 스크래퍼와 Claude 클라이언트를 만듭니다."""
+    scraper = HoroscopeScraper(page_cache=page_cache, http_cache=TTLCache(), failure_cache=TTLCache())
+    scraper.marie_claire_base_url = base_url
+    scraper.elle_urls = [f"{base_url}/elle/horoscope/"]
+    scraper.singles_urls = [f"{base_url}/singles/horoscope/"]
+    scraper.rate_limiter = HostRateLimiter(min_interval=0)
+
+    claude_api = ClaudeAPI()
+    claude_api.base_url = f"{base_url}/v1/messages"
+    claude_api.summary_cache = summary_cache
+    return scraper, claude_api
+
+
+def run_benchmarks(iterations: int) -> Dict[str, Dict[str, float]]:
+    os.environ.setdefault("CLAUDE_API_KEY", "bench-key")
+    marie_html = load_fixture("marie_claire_2507.html")
+    signs = list(ZODIAC_ENGLISH.keys())
+    results = {}
+
+    # 1. 파싱: 설치된 백엔드별로 본문 영역 추출과 전체 페이지 추출을 측정
+    backends = ["html.parser"]
+    if html_parsing.HAS_LXML:
+        backends.append("lxml")
+    if html_parsing.SelectolaxParser is not None:
+        backends.append("selectolax")
+    previous_backend = os.environ.get("HTML_PARSER_BACKEND")
+    try:
+        for backend in backends:
+            os.environ["HTML_PARSER_BACKEND"] = backend
+            results[f"parse[{backend}]"] = summarize(measure(lambda: html_parsing.extract_text(marie_html, "marie_claire"), iterations))
+            results[f"parse_full_page[{backend}]"] = summarize(measure(lambda: html_parsing.extract_text(marie_html), iterations))
+    finally:
+        if previous_backend is None:
+            os.environ.pop("HTML_PARSER_BACKEND", None)
+        else:
+            os.environ["HTML_PARSER_BACKEND"] = previous_backend
+
+    # 2. 분할 / 정리
+    text = html_parsing.extract_text(marie_html, "marie_claire")
+    results["segment"] = summarize(measure(lambda: default_segmenter.segment(text), iterations))
+    results["clean_text"] = summarize(measure(lambda: clean_text(text), iterations))
+
+    # 3. 프롬프트 생성 (12개 별자리)
+    sections = default_segmenter.segment(text)
+    prompt_api = ClaudeAPI()
+    results["prompt_build"] = summarize(measure(
+        lambda: [prompt_api._create_comprehensive_prompt(sections.get(sign, ""), sign, BENCH_DATE) for sign in signs],
+        iterations,
+    ))
+
+    # 4. 전체 경로: 스텁 서버로 스크래핑 + 종합 운세 생성 (별자리별 1회 = 1 샘플)
+    server, base_url = start_stub_server()
+    try:
+        def e2e(scraper: HoroscopeScraper, claude_api: ClaudeAPI, sign: str) -> None:
+            marie_result = scraper.get_marie_claire_horoscope(BENCH_DATE, sign)
+            claude_api.get_comprehensive_summary([("마리끌레어 코리아", marie_result)], sign, BENCH_DATE)
+
+        cold_samples = []
+        for _ in range(max(1, iterations // len(signs))):
+            for sign in signs:
+                # 매번 새 캐시: 페이지 요청과 API 호출이 모두 발생
+                scraper, claude_api = make_clients(base_url, TTLCache(), TTLCache())
+                cold_samples.extend(measure(lambda: e2e(scraper, claude_api, sign), 1, warmup=0))
+        results["e2e_cold"] = summarize(cold_samples)
+
+        scraper, claude_api = make_clients(base_url, TTLCache(), TTLCache())
+        warm_samples = []
+        for _ in range(max(1, iterations // len(signs))):
+            for sign in signs:
+                warm_samples.extend(measure(lambda: e2e(scraper, claude_api, sign), 1, warmup=1))
+        results["e2e_warm"] = summarize(warm_samples)
+        results["e2e_warm"]["api_calls"] = server.api_calls
+    finally:
+        server.shutdown()
+
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """p50이 기준보다 threshold 비율 이상 느려진 단계를 찾습니다."""
+    regressions = []
+    for stage, stats in results.items():
+        base = baseline.get(stage)
+        if not base or not base.get("p50_ms"):
+            continue
+        ratio = stats["p50_ms"] / base["p50_ms"] - 1
+        if ratio > threshold:
+            regressions.append(f"{stage}: p50 {base['p50_ms']:.3f}ms -> {stats['p50_ms']:.3f}ms (+{ratio * 100:.0f}%)")
+    return regressions
+
+
+def print_report(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'단계':<28}{'p50(ms)':>10}{'p95(ms)':>10}{'평균(ms)':>10}{'ops/s':>12}")
+    print("-" * 70)
+    for stage, stats in results.items():
+        print(f"{stage:<28}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['mean_ms']:>10.3f}{stats['ops_per_sec']:>12.1f}")
+    print("-" * 70)
+    print(f"최대 RSS: {peak_rss_mb():.1f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스크래퍼 / 종합 운세 벤치마크 (오프라인)")
+    parser.add_argument("--iterations", type=int, default=50, help="단계별 반복 횟수 (기본값: 50)")
+    parser.add_argument("--save", help="결과를 JSON으로 저장할 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 판단할 p50 증가 비율 (기본값: 0.2)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(max(1, args.iterations))
+    print_report(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "peak_rss_mb": peak_rss_mb()}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("⚠️  성능 회귀 감지:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print("✅ 기준 대비 성능 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
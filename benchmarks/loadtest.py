@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+로컬 스텁 서버 대상 부하 테스트
+
+마리끌레어 월별 페이지와 Claude messages API를 흉내 내는 스텁 서버(지연 / 오류 / 429 / 스트리밍 설정 가능)를
+띄우고, 가상 사용자 N명이 show_horoscope_results와 같은 순서로 HoroscopeService를 호출합니다.
+처리량, 지연 시간 백분위, 외부 호출 수, 캐시 효과를 보고하며 기준 결과와 비교할 수 있습니다.
+
+사용 예:
+    python -m benchmarks.loadtest --users 50 --duration 30
+    python -m benchmarks.loadtest --users 50 --api-latency 2 --api-429-rate 0.1 --page-error-rate 0.05
+    python -m benchmarks.loadtest --save loadtest_baseline.json
+    python -m benchmarks.loadtest --baseline loadtest_baseline.json --threshold 0.2
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.bench import BENCH_DATE, compare, peak_rss_mb, percentile  # noqa: E402
+from benchmarks.stubs import StubConfig, start_stub_server  # noqa: E402
+from claude_api import StreamIncompleteError  # noqa: E402
+from local_summary import generate_summary  # noqa: E402
+from metrics import API_RETRIES, CACHE_HITS, CACHE_MISSES, CIRCUIT_SHORT_CIRCUITS, FALLBACKS  # noqa: E402
+from segmenter import ZODIAC_ENGLISH  # noqa: E402
+from service import REFRESH_WORKERS, SUMMARY_SOURCE_FALLBACK, HoroscopeService  # noqa: E402
+from store import HoroscopeStore  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+Record = Tuple[str, float]  # (결과 종류, 소요 시간(초))
+
+
+def view_horoscope(service: HoroscopeService, date: datetime.date, zodiac: str) -> str:
+    """
+    show_horoscope_results와 같은 순서로 서비스를 호출하고 결과 종류를 반환합니다.
+
+    Streamlit의 세션 간 결과 캐시(st.cache_data)는 제외하며, 화면 출력 대신 스트림을 끝까지 읽습니다.
+
+    Returns:
+        hit / stale / fallback (저장된 결과), cold_stream / cold_fallback (결과가 없어 생성)
+    """
+    entry = service.lookup(date, zodiac)
+    if entry is not None:
+        if entry["stale"]:
+            return "stale"
+        return "fallback" if entry["summary_source"] == SUMMARY_SOURCE_FALLBACK else "hit"
+
+    marie_result = service.get_marie_claire(date, zodiac)
+    if service.claude_api.api_key:
+        generate_summary(marie_result, zodiac, date)  # 첫 화면의 로컬 요약
+        stream = service.stream_summary(date, zodiac, marie_result)
+        if stream is not None:
+            try:
+                "".join(stream)
+            except StreamIncompleteError:
+                return "cold_fallback"
+            return "cold_stream"
+        return "cold_fallback"
+    service.remember(date, zodiac, marie_result, None)
+    return "cold_fallback"
+
+
+def virtual_user(index: int, service: HoroscopeService, dates: List[datetime.date], zodiacs: List[str],
+                 stop_at: float, think_time: float, seed: int, records: List[Record]) -> None:
+    """마감 시각까지 무작위 (날짜, 별자리)를 조회합니다."""
+    rng = random.Random(seed + index)
+    while time.monotonic() < stop_at:
+        date, zodiac = rng.choice(dates), rng.choice(zodiacs)
+        started = time.perf_counter()
+        try:
+            outcome = view_horoscope(service, date, zodiac)
+        except Exception as e:
+            logger.exception("가상 사용자 %d 오류: %s", index, e)
+            outcome = "error"
+        records.append((outcome, time.perf_counter() - started))
+        if think_time > 0:
+            time.sleep(rng.expovariate(1 / think_time))
+
+
+def latency_stats(samples: List[float]) -> Dict[str, float]:
+    return {
+        "requests": len(samples),
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p90_ms": percentile(samples, 90) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples) * 1000,
+        "mean_ms": statistics.mean(samples) * 1000,
+    }
+
+
+def _ratio(hits: float, misses: float) -> float:
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def cache_report() -> Dict[str, float]:
+    """프로세스 지표에서 캐시 적중률과 대체 수를 모읍니다."""
+    page_hits = sum(CACHE_HITS.total(cache=name) for name in ("page", "page_revalidated", "page_stale", "store"))
+    return {
+        "result_hit_ratio": _ratio(CACHE_HITS.total(cache="result"), CACHE_MISSES.total(cache="result")),
+        "result_stale_hits": CACHE_HITS.total(cache="result", stale="true"),
+        "page_hit_ratio": _ratio(page_hits, CACHE_MISSES.total(cache="page") + CACHE_MISSES.total(cache="store")),
+        "http_not_modified": CACHE_HITS.total(cache="http_not_modified"),
+        "summary_hit_ratio": _ratio(CACHE_HITS.total(cache="summary") + CACHE_HITS.total(cache="summary_store"),
+                                    CACHE_MISSES.total(cache="summary")),
+        "fallback_sample": FALLBACKS.total(kind="sample"),
+        "fallback_summary": FALLBACKS.total(kind="summary"),
+        "fallback_deadline": FALLBACKS.total(kind="deadline"),
+        "fallback_shed": FALLBACKS.total(kind="shed"),
+    }
+
+
+def run_loadtest(users: int, duration: float, days: int, think_time: float, workers: int,
+                 config: StubConfig, seed: int, db_path: str) -> Dict[str, object]:
+    server, base_url = start_stub_server(config=config)
+    # 스크래퍼 / Claude 클라이언트가 스텁 서버를 바라보도록 생성 전에 설정
+    os.environ["MARIE_CLAIRE_BASE_URL"] = base_url
+    os.environ["CLAUDE_API_URL"] = f"{base_url}/v1/messages"
+    os.environ["CLAUDE_API_KEY"] = "loadtest-key"
+
+    service = HoroscopeService(store=HoroscopeStore(db_path), workers=workers)
+    dates = [BENCH_DATE + datetime.timedelta(days=offset) for offset in range(days)]
+    zodiacs = list(ZODIAC_ENGLISH.keys())
+    records: List[Record] = []
+
+    started = time.monotonic()
+    stop_at = started + duration
+    threads = [
+        threading.Thread(target=virtual_user, name=f"vu-{index}",
+                         args=(index, service, dates, zodiacs, stop_at, think_time, seed, records))
+        for index in range(users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    try:
+        latencies = {"view": latency_stats([seconds for _, seconds in records])} if records else {}
+        for outcome in sorted({outcome for outcome, _ in records}):
+            latencies[f"view[{outcome}]"] = latency_stats([seconds for name, seconds in records if name == outcome])
+        return {
+            "results": latencies,
+            "throughput_rps": len(records) / elapsed if elapsed > 0 else 0.0,
+            "duration_s": elapsed,
+            "upstream": {
+                "page_requests": server.page_requests,
+                "page_not_modified": server.not_modified,
+                "page_errors": server.page_errors,
+                "api_calls": server.api_calls,
+                "api_stream_calls": server.api_stream_calls,
+                "api_rate_limited": server.api_rate_limited,
+                "api_errors": server.api_errors,
+                "api_stream_cuts": server.api_stream_cuts,
+                "client_retries": API_RETRIES.total(),
+                "short_circuits": CIRCUIT_SHORT_CIRCUITS.total(),
+            },
+            "cache": cache_report(),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+    finally:
+        service.shutdown(wait=False)
+        server.shutdown()
+
+
+def print_report(report: Dict[str, object]) -> None:
+    print(f"{'구분':<24}{'요청':>8}{'p50(ms)':>10}{'p90(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'최대(ms)':>10}")
+    print("-" * 82)
+    for name, stats in report["results"].items():
+        print(f"{name:<24}{stats['requests']:>8}{stats['p50_ms']:>10.1f}{stats['p90_ms']:>10.1f}"
+              f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}")
+    print("-" * 82)
+    print(f"처리량: {report['throughput_rps']:.1f} req/s ({report['duration_s']:.1f}초)")
+    print("외부 호출: " + ", ".join(f"{name}={value:g}" for name, value in report["upstream"].items()))
+    print("캐시: " + ", ".join(
+        f"{name}={value:.1%}" if name.endswith("ratio") else f"{name}={value:g}"
+        for name, value in report["cache"].items()
+    ))
+    print(f"최대 RSS: {report['peak_rss_mb']:.1f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 스텁 서버 대상 부하 테스트 (오프라인)")
+    parser.add_argument("--users", type=int, default=20, help="동시 가상 사용자 수 (기본값: 20)")
+    parser.add_argument("--duration", type=float, default=20, help="실행 시간(초, 기본값: 20)")
+    parser.add_argument("--days", type=int, default=3, help="조회할 날짜 수 (기본값: 3, 날짜 x 12개 별자리가 조회 대상)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="가상 사용자의 평균 요청 간격(초, 기본값: 0)")
+    parser.add_argument("--workers", type=int, default=REFRESH_WORKERS, help=f"서비스 작업자 수 (기본값: {REFRESH_WORKERS})")
+    parser.add_argument("--page-latency", type=float, default=0.2, help="월별 페이지 응답 지연(초, 기본값: 0.2)")
+    parser.add_argument("--page-error-rate", type=float, default=0.0, help="월별 페이지 503 응답 비율 (기본값: 0)")
+    parser.add_argument("--api-latency", type=float, default=1.0, help="messages API 첫 응답 지연(초, 기본값: 1)")
+    parser.add_argument("--api-chunk-delay", type=float, default=0.02, help="스트리밍 조각 사이 지연(초, 기본값: 0.02)")
+    parser.add_argument("--api-429-rate", type=float, default=0.0, help="messages API 429 응답 비율 (기본값: 0)")
+    parser.add_argument("--api-error-rate", type=float, default=0.0, help="messages API 529 응답 비율 (기본값: 0)")
+    parser.add_argument("--api-stream-cut-rate", type=float, default=0.0, help="스트리밍 응답을 중간에 끊을 비율 (기본값: 0)")
+    parser.add_argument("--retry-after", type=float, default=0.5, help="429 응답의 retry-after(초, 기본값: 0.5)")
+    parser.add_argument("--seed", type=int, default=1, help="난수 시드 (기본값: 1)")
+    parser.add_argument("--db", help="저장소 경로 (기본값: 임시 파일)")
+    parser.add_argument("--log-level", default="ERROR", help="로그 수준 (기본값: ERROR)")
+    parser.add_argument("--save", help="결과를 JSON으로 저장할 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 판단할 p50 증가 / 처리량 감소 비율 (기본값: 0.2)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    config = StubConfig(
+        page_latency=args.page_latency, page_error_rate=args.page_error_rate,
+        api_latency=args.api_latency, api_chunk_delay=args.api_chunk_delay,
+        api_429_rate=args.api_429_rate, api_error_rate=args.api_error_rate,
+        api_stream_cut_rate=args.api_stream_cut_rate, retry_after=args.retry_after, seed=args.seed,
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report = run_loadtest(
+            max(1, args.users), args.duration, max(1, args.days), args.think_time, max(1, args.workers),
+            config, args.seed, args.db or os.path.join(tmp_dir, "loadtest.db"),
+        )
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report["results"], baseline["results"], args.threshold)
+        base_rps = baseline.get("throughput_rps")
+        if base_rps and report["throughput_rps"] < base_rps * (1 - args.threshold):
+            regressions.append(f"throughput: {base_rps:.1f} -> {report['throughput_rps']:.1f} req/s")
+        if regressions:
+            print("⚠️  성능 회귀 감지:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print("✅ 기준 대비 성능 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
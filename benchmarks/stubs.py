@@ -0,0 +1,215 @@
+"""
+벤치마크용 로컬 스텁 서버
+
+녹화된 마리끌레어/엘르/싱글즈 HTML 픽스처와 Claude messages API 응답을
+로컬 HTTP 서버로 흉내 내어 네트워크 없이 전체 경로를 측정할 수 있게 합니다.
+부하 테스트용으로 응답 지연, 오류 비율, 429 응답, 스트리밍(SSE)을 설정할 수 있습니다.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 스텁 API가 돌려주는 종합 운세 (실제 응답과 비슷한 길이)
+STUB_SUMMARY = "\n".join([
+    "## 🌟 전체 운세",
+    "오늘은 그동안 준비해온 일들이 하나씩 자리를 잡아가는 하루입니다. 주변의 조언에 귀를 기울이면 더 좋은 결과를 얻을 수 있어요.",
+    "## 💕 사랑/인간관계",
+    "가까운 사람과 솔직한 대화를 나누기 좋은 날입니다. 작은 배려가 관계를 더욱 단단하게 만들어줄 거예요.",
+    "## 💼 직업/재정",
+    "업무에서는 우선순위를 정리하는 것이 중요합니다. 계획에 없던 지출은 한 번 더 생각해보세요.",
+    "## 🌿 건강/라이프스타일",
+    "가벼운 스트레칭과 충분한 수분 섭취로 컨디션을 관리해보세요.",
+    "## ✨ 럭키 아이템/컬러",
+    "럭키 컬러는 하늘색, 럭키 아이템은 작은 수첩입니다.",
+    "## 💡 오늘의 조언",
+    "서두르지 말고 한 걸음씩 나아가면 원하는 방향에 닿을 수 있습니다.",
+])
+
+_MARIE_CLAIRE_PATH = re.compile(r"^/horoscope/\d{4}/\d{2}/horoscope(\d{4})$")
+
+
+@dataclass
+class StubConfig:
+    """
+    스텁 서버의 지연 / 오류 설정 (기본값은 지연과 오류 없음)
+
+    지연은 설정값의 0.5~1.5배 사이에서 고르게 정하고, 비율은 요청마다 독립적으로 적용합니다.
+    """
+    page_latency: float = 0.0       # 페이지 응답 지연(초)
+    page_error_rate: float = 0.0    # 페이지 요청 중 503으로 응답할 비율
+    api_latency: float = 0.0        # messages API 응답 지연(초, 스트리밍은 첫 조각까지)
+    api_chunk_delay: float = 0.0    # 스트리밍 조각 사이 지연(초)
+    api_429_rate: float = 0.0       # messages API 요청 중 429로 응답할 비율
+    api_error_rate: float = 0.0     # messages API 요청 중 529(overloaded)로 응답할 비율
+    api_stream_cut_rate: float = 0.0  # 스트리밍 응답 중 message_stop 전에 연결을 끊을 비율
+    retry_after: float = 0.0        # 429 응답의 retry-after(초)
+    seed: Optional[int] = None
+
+
+def load_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def load_month_pages() -> Dict[str, bytes]:
+    """녹화된 월별 페이지 픽스처 (marie_claire_YYMM.html)를 {YYMM: HTML}로 읽습니다."""
+    pages = {}
+    for path in glob.glob(os.path.join(FIXTURES_DIR, "marie_claire_*.html")):
+        suffix = os.path.basename(path)[len("marie_claire_"):-len(".html")]
+        with open(path, "rb") as f:
+            pages[suffix] = f.read()
+    return pages
+
+
+def _jittered(seconds: float, rng: random.Random) -> float:
+    return seconds * rng.uniform(0.5, 1.5) if seconds > 0 else 0.0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """마리끌레어/엘르/싱글즈 페이지와 /v1/messages를 흉내 내는 요청 처리기"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # 벤치마크 출력이 요청 로그로 덮이지 않도록 무시
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Dict[str, str] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _count(self, name: str) -> None:
+        with self.server.counter_lock:
+            setattr(self.server, name, getattr(self.server, name) + 1)
+
+    def _send_page(self, body: bytes) -> None:
+        """ETag를 붙여 페이지를 보내고, If-None-Match가 일치하면 304로 응답합니다."""
+        config: StubConfig = self.server.config
+        self._count("page_requests")
+        time.sleep(_jittered(config.page_latency, self.server.rng))
+        if config.page_error_rate and self.server.rng.random() < config.page_error_rate:
+            self._count("page_errors")
+            return self._send(503, b"unavailable", "text/plain")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._count("not_modified")
+            return self._send(304, b"", "text/html; charset=utf-8", {"ETag": etag})
+        self._send(200, body, "text/html; charset=utf-8", {"ETag": etag})
+
+    def do_GET(self):
+        pages: Dict[str, bytes] = self.server.pages
+        path = self.path.split("?", 1)[0]
+        match = _MARIE_CLAIRE_PATH.match(path)
+        if match:
+            # 녹화된 달이 아니면 기본 픽스처로 응답
+            return self._send_page(self.server.month_pages.get(match.group(1), pages["marie_claire"]))
+        if path.startswith("/elle/"):
+            return self._send_page(pages["elle"])
+        if path.startswith("/singles/"):
+            return self._send_page(pages["singles"])
+        self._send(404, b"not found", "text/plain")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path != "/v1/messages":
+            return self._send(404, b"not found", "text/plain")
+        config: StubConfig = self.server.config
+        self._count("api_calls")
+        time.sleep(_jittered(config.api_latency, self.server.rng))
+        if config.api_429_rate and self.server.rng.random() < config.api_429_rate:
+            self._count("api_rate_limited")
+            error = {"type": "error", "error": {"type": "rate_limit_error", "message": "stub rate limit"}}
+            return self._send(429, json.dumps(error).encode("utf-8"), "application/json",
+                              {"retry-after": f"{config.retry_after:g}"})
+        if config.api_error_rate and self.server.rng.random() < config.api_error_rate:
+            self._count("api_errors")
+            error = {"type": "error", "error": {"type": "overloaded_error", "message": "stub overloaded"}}
+            return self._send(529, json.dumps(error).encode("utf-8"), "application/json")
+        if request.get("stream"):
+            return self._stream(request)
+        body = {
+            "id": "msg_stub",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model"),
+            "content": [{"type": "text", "text": STUB_SUMMARY}],
+            "usage": {"input_tokens": 600, "output_tokens": 400},
+        }
+        self._send(200, json.dumps(body, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    def _stream(self, request: dict) -> None:
+        """messages API 스트리밍 응답(SSE)을 줄 단위 조각으로 보냅니다 (응답이 끝나면 연결 종료)."""
+        self._count("api_stream_calls")
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        def event(payload: dict) -> None:
+            self.wfile.write(f"event: {payload['type']}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        event({"type": "message_start", "message": {"id": "msg_stub", "model": request.get("model"), "usage": {"input_tokens": 600}}})
+        event({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+        config: StubConfig = self.server.config
+        cut = config.api_stream_cut_rate and self.server.rng.random() < config.api_stream_cut_rate
+        for index, line in enumerate(STUB_SUMMARY.split("\n")):
+            if cut and index == 2:
+                # 조각 두 개를 보낸 뒤 message_stop 없이 연결 종료
+                self._count("api_stream_cuts")
+                return
+            event({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": line + "\n"}})
+            time.sleep(_jittered(config.api_chunk_delay, self.server.rng))
+        event({"type": "content_block_stop", "index": 0})
+        event({"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": 400}})
+        event({"type": "message_stop"})
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 부하 테스트에서 동시 연결이 몰려도 연결 대기열이 넘치지 않도록 함
+    request_queue_size = 128
+
+
+def start_stub_server(handler=StubHandler, config: Optional[StubConfig] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """스텁 서버를 백그라운드 스레드로 시작하고 (서버, 기본 URL)을 반환합니다."""
+    server = StubServer(("127.0.0.1", 0), handler)
+    server.config = config or StubConfig()
+    server.rng = random.Random(server.config.seed)
+    server.counter_lock = threading.Lock()
+    server.pages = {
+        "marie_claire": load_fixture("marie_claire_2507.html"),
+        "elle": load_fixture("elle.html"),
+        "singles": load_fixture("singles.html"),
+    }
+    server.month_pages = load_month_pages()
+    server.api_calls = 0
+    server.api_stream_calls = 0
+    server.api_rate_limited = 0
+    server.api_errors = 0
+    server.api_stream_cuts = 0
+    server.page_requests = 0
+    server.page_errors = 0
+    server.not_modified = 0
+    thread = threading.Thread(target=server.serve_forever, name="stub-server", daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """TTL과 최대 크기(LRU)를 가진 스레드 안전 메모리 캐시"""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (저장 시각, 값)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """만료되지 않은 값을 반환합니다. 없거나 만료되었으면 None."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            stored_at, value = item
+            if time.monotonic() - stored_at > self.ttl:
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """만료 여부와 관계없이 저장된 값을 반환합니다 (재검증용)."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            self._data.move_to_end(key)
+            return item[1]
+
+    def is_fresh(self, key: Hashable) -> bool:
+        """키가 존재하고 TTL 이내인지 확인합니다."""
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and time.monotonic() - item[0] <= self.ttl
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """값을 저장하고 최대 크기를 넘으면 가장 오래 사용되지 않은 항목을 제거합니다."""
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def touch(self, key: Hashable) -> None:
+        """저장 시각을 갱신합니다 (304 Not Modified 응답 처리용)."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                self._data[key] = (time.monotonic(), item[1])
+                self._data.move_to_end(key)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.is_fresh(key)
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """같은 키에 대한 동시 호출을 하나의 실제 호출로 합칩니다."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        key에 대해 진행 중인 호출이 있으면 그 결과를 기다려 공유하고,
+        없으면 fn()을 직접 실행합니다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
@@ -1,18 +1,117 @@
 import os
 import requests
 import json
-from typing import List, Tuple, Optional
+import hashlib
+import logging
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Generator, Iterator, List, Tuple, Optional
 import datetime
+from cache import SingleFlight, TTLCache
+from http_client import DEFAULT_CONNECT_TIMEOUT, DEFAULT_MAX_RETRIES, DEFAULT_READ_TIMEOUT, get_adaptive_timeout, get_breaker, get_shared_session, get_with_retry, post_with_retry
+from local_summary import generate_summary
+from metrics import API_ERRORS, CACHE_HITS, CACHE_MISSES, STAGE_SECONDS, TOKENS, timer
+from store import HoroscopeStore, day_key
+
+logger = logging.getLogger(__name__)
+
+# 생성 결과 메모이제이션 설정
+SUMMARY_CACHE_TTL = 24 * 60 * 60  # 24시간
+SUMMARY_CACHE_SIZE = 512
+
+# 프로세스 전체에서 공유하는 생성 결과 캐시와 동시 요청 병합기
+_summary_cache = TTLCache(maxsize=SUMMARY_CACHE_SIZE, ttl=SUMMARY_CACHE_TTL)
+_summary_flight = SingleFlight()
+
+# 종합 운세 프롬프트의 고정 부분 (요청마다 같으므로 프롬프트 캐싱 대상 system 블록으로 전송)
+COMPREHENSIVE_SYSTEM_PROMPT = """
+당신은 전문 점성술사입니다. 사용자가 알려주는 날짜와 별자리, 마리끌레어 코리아의 기본 운세를 바탕으로 완성된 하루 운세를 생성합니다.
+
+기본 운세를 바탕으로 하되, 다음 영역들을 추가로 보완하여 완성된 하루 운세를 만들어주세요:
+
+**구성 요소:**
+1. **전체 운세**: 마리끌레어 내용을 요약하고 하루 전체의 흐름을 제시
+2. **사랑/인간관계**: 연애, 가족, 친구 관계에서의 운세
+3. **직업/재정**: 일, 학업, 금전과 관련된 운세  
+4. **건강/라이프스타일**: 몸과 마음의 건강, 일상 관리
+5. **럭키 아이템/컬러**: 오늘 도움이 될 색깔이나 아이템
+6. **오늘의 조언**: 하루를 잘 보내기 위한 실용적 조언
+
+**작성 지침:**
+- 마리끌레어 내용과 자연스럽게 연결되도록 작성
+- 해당 별자리의 성격적 특성을 반영
+- 구체적이고 실용적인 조언 포함
+- 긍정적이고 희망적인 톤 유지
+- 자연스럽고 읽기 쉬운 한국어로 작성
+- 각 섹션을 명확히 구분하여 정리
+"""
+
+# 토큰 사용량 / 프롬프트 캐시 적중 통계 (프로세스 전체)
+_usage_lock = threading.Lock()
+_usage_stats = {
+    "requests": 0,
+    "input_tokens": 0,
+    "output_tokens": 0,
+    "cache_creation_input_tokens": 0,
+    "cache_read_input_tokens": 0,
+    "prompt_cache_hits": 0,
+    "prompt_cache_misses": 0,
+}
+
+def record_usage(usage: Optional[dict]) -> None:
+    """응답의 usage 정보를 누적합니다. 캐시에서 읽은 입력 토큰이 있으면 캐시 적중으로 셉니다."""
+    if not usage:
+        return
+    for field in ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens"):
+        if usage.get(field):
+            TOKENS.inc(usage[field], type=field[:-len("_tokens")])
+    with _usage_lock:
+        _usage_stats["requests"] += 1
+        for field in ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens"):
+            _usage_stats[field] += usage.get(field) or 0
+        if usage.get("cache_read_input_tokens"):
+            _usage_stats["prompt_cache_hits"] += 1
+        else:
+            _usage_stats["prompt_cache_misses"] += 1
+
+def get_usage_stats() -> dict:
+    """누적된 토큰 사용량 / 프롬프트 캐시 통계를 반환합니다."""
+    with _usage_lock:
+        return dict(_usage_stats)
+
+# Message Batches API 설정
+BATCH_POLL_INTERVAL = 10  # 상태 확인 간격(초)
+BATCH_TIMEOUT = 24 * 60 * 60  # 일괄 처리 최대 대기 시간(초)
+BATCH_CANCEL_GRACE = 60  # 시간 초과로 취소한 뒤 이미 끝난 항목의 결과를 기다릴 시간(초)
+
+
+class StreamIncompleteError(Exception):
+    """스트림이 message_stop 전에 끝남 (받은 조각은 완성된 운세가 아니므로 캐시 / 저장하지 않음)"""
+
 
 class ClaudeAPI:
-    def __init__(self):
+    def __init__(self, store: Optional[HoroscopeStore] = None):
         self.api_key = os.getenv('CLAUDE_API_KEY')
-        self.base_url = "https://api.anthropic.com/v1/messages"
+        self.base_url = os.getenv('CLAUDE_API_URL', "https://api.anthropic.com/v1/messages")
         self.headers = {
             "Content-Type": "application/json",
             "x-api-key": self.api_key,
             "anthropic-version": "2023-06-01"
         }
+        self.model = "claude-3-haiku-20240307"  # 비용 효율적인 모델 사용
+        self.max_tokens = 1000
+        self.store = store
+        self.summary_cache = _summary_cache
+        
+        # 프로세스 전체에서 공유하는 keep-alive 연결 풀
+        self.session = get_shared_session("claude")
+        self.timeout = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)  # (연결, 읽기)
+        self.max_retries = DEFAULT_MAX_RETRIES
+    
+    def is_available(self) -> bool:
+        """API 키가 있고 API 호스트의 회로 차단기가 열려 있지 않은지 확인합니다."""
+        return bool(self.api_key) and not get_breaker(self.base_url).is_open()
     
     def get_summary(self, horoscope_data: List[Tuple[str, str]], zodiac: str, date: datetime.date) -> Optional[str]:
         """
@@ -39,8 +138,8 @@ class ClaudeAPI:
             # 프롬프트 생성
             prompt = self._create_summary_prompt(horoscope_text, zodiac, date)
             
-            # Claude API 호출
-            response = self._call_claude_api(prompt)
+            # Claude API 호출 (같은 요청은 캐시된 결과 사용)
+            response = self._call_claude_api_cached(prompt)
             
             if response:
                 return response
@@ -48,7 +147,7 @@ class ClaudeAPI:
                 return "요약을 생성할 수 없습니다. API 호출에 실패했습니다."
                 
         except Exception as e:
-            print(f"Claude API 오류: {e}")
+            logger.exception("Claude API 오류: %s", e)
             return f"요약 생성 중 오류가 발생했습니다: {str(e)}"
     
     def get_comprehensive_summary(self, horoscope_data: List[Tuple[str, str]], zodiac: str, date: datetime.date) -> Optional[str]:
@@ -71,27 +170,325 @@ class ClaudeAPI:
         
         try:
             # 마리끌레어 운세 정보 준비
-            marie_claire_content = ""
-            for site_name, content in horoscope_data:
-                if "마리끌레어" in site_name and content and content.strip():
-                    marie_claire_content = content.strip()
-                    break
+            marie_claire_content = self._extract_marie_claire_content(horoscope_data)
             
             # 종합 운세 생성 프롬프트
             prompt = self._create_comprehensive_prompt(marie_claire_content, zodiac, date)
+            key = self._cache_key(prompt, COMPREHENSIVE_SYSTEM_PROMPT)
+            
+            # 디스크 저장소에 같은 입력으로 생성된 운세가 있으면 API 호출 없이 반환
+            stored = self._get_stored_summary(key, zodiac, date)
+            if stored:
+                return stored
             
-            # Claude API 호출
-            response = self._call_claude_api(prompt)
+            # Claude API 호출 (같은 요청은 캐시된 결과 사용)
+            response = self._call_claude_api_cached(prompt, COMPREHENSIVE_SYSTEM_PROMPT)
             
             if response:
+                self._put_stored_summary(key, zodiac, date, response)
                 return response
             else:
                 return "종합 운세를 생성할 수 없습니다. API 호출에 실패했습니다."
                 
         except Exception as e:
-            print(f"Claude API 오류: {e}")
+            logger.exception("Claude API 오류: %s", e)
             return f"종합 운세 생성 중 오류가 발생했습니다: {str(e)}"
     
+    def lookup_comprehensive_summary(self, horoscope_data: List[Tuple[str, str]], zodiac: str, date: datetime.date, include_cache: bool = True) -> Optional[str]:
+        """
+        API를 호출하지 않고 저장소나 생성 결과 캐시에 있는 종합 운세만 반환합니다.
+        
+        Args:
+            horoscope_data: (사이트명, 운세내용) 튜플의 리스트
+            zodiac: 별자리 이름
+            date: 선택된 날짜
+            include_cache: False면 디스크 저장소만 확인
+            
+        Returns:
+            같은 입력으로 이미 생성된 종합 운세 텍스트, 없으면 None
+        """
+        if not horoscope_data:
+            return None
+        
+        key = self.summary_key(horoscope_data, zodiac, date)
+        stored = self._get_stored_summary(key, zodiac, date)
+        if stored or not include_cache:
+            return stored
+        
+        cached = self.summary_cache.get(key)
+        if cached is not None:
+            CACHE_HITS.inc(cache="summary")
+        return cached
+    
+    def summary_key(self, horoscope_data: List[Tuple[str, str]], zodiac: str, date: datetime.date) -> str:
+        """
+        종합 운세 입력의 해시 (생성 결과 캐시와 저장소의 키).
+        
+        마리끌레어 운세, 별자리, 날짜, 모델이 모두 같을 때만 같은 값이 되므로
+        샘플 운세로 만든 결과가 실제 운세의 결과로 쓰이지 않습니다.
+        """
+        marie_claire_content = self._extract_marie_claire_content(horoscope_data)
+        prompt = self._create_comprehensive_prompt(marie_claire_content, zodiac, date)
+        return self._cache_key(prompt, COMPREHENSIVE_SYSTEM_PROMPT)
+    
+    def _get_stored_summary(self, key: str, zodiac: str, date: datetime.date) -> Optional[str]:
+        if self.store is None:
+            return None
+        stored = self.store.get_summary("claude", day_key(date), zodiac, key)
+        if stored:
+            CACHE_HITS.inc(cache="summary_store")
+        return stored
+    
+    def _put_stored_summary(self, key: str, zodiac: str, date: datetime.date, summary: str) -> None:
+        if self.store is not None:
+            self.store.put_summary("claude", day_key(date), zodiac, summary, key)
+    
+    def stream_comprehensive_summary(self, horoscope_data: List[Tuple[str, str]], zodiac: str, date: datetime.date) -> Iterator[str]:
+        """
+        get_comprehensive_summary의 스트리밍 버전. 생성되는 텍스트 조각을 순서대로 반환합니다.
+        
+        저장소나 캐시에 결과가 있으면 한 번에 반환하고, 스트림이 message_stop까지
+        끝났을 때만 결과를 캐시와 저장소에 기록합니다.
+        
+        Args:
+            horoscope_data: (사이트명, 운세내용) 튜플의 리스트
+            zodiac: 별자리 이름
+            date: 선택된 날짜
+            
+        Yields:
+            종합 운세 텍스트 조각
+            
+        Raises:
+            StreamIncompleteError: 스트림이 중간에 끊긴 경우 (받은 조각까지 반환한 뒤)
+        """
+        if not self.api_key:
+            yield "Claude API 키가 설정되지 않았습니다. .env 파일을 확인해주세요."
+            return
+        
+        if not horoscope_data:
+            yield "요약할 운세 정보가 없습니다."
+            return
+        
+        cached = self.lookup_comprehensive_summary(horoscope_data, zodiac, date)
+        if cached:
+            yield cached
+            return
+        
+        marie_claire_content = self._extract_marie_claire_content(horoscope_data)
+        prompt = self._create_comprehensive_prompt(marie_claire_content, zodiac, date)
+        key = self._cache_key(prompt, COMPREHENSIVE_SYSTEM_PROMPT)
+        
+        chunks = []
+        stream = self._stream_claude_api(prompt, COMPREHENSIVE_SYSTEM_PROMPT)
+        while True:
+            try:
+                delta = next(stream)
+            except StopIteration as stop:
+                complete = bool(stop.value)
+                break
+            chunks.append(delta)
+            yield delta
+        
+        response = "".join(chunks)
+        if not complete or not response:
+            raise StreamIncompleteError(f"{date} {zodiac} 종합 운세 스트림이 완료되지 않았습니다 ({len(response)}자 수신)")
+        self.summary_cache.set(key, response)
+        self._put_stored_summary(key, zodiac, date, response)
+    
+    def get_comprehensive_summaries(self, summary_requests: List[Tuple[List[Tuple[str, str]], str, datetime.date]], use_batch: bool = True, max_workers: int = 4, poll_interval: float = BATCH_POLL_INTERVAL, timeout: float = BATCH_TIMEOUT) -> List[dict]:
+        """
+        여러 (운세 데이터, 별자리, 날짜) 요청의 종합 운세를 한 번에 생성합니다.
+        
+        Message Batches API로 일괄 제출한 뒤 완료될 때까지 상태를 확인하고,
+        일괄 처리를 사용할 수 없으면 제한된 동시 호출로 대신 처리합니다.
+        저장소나 캐시에 이미 있는 항목은 API로 보내지 않습니다.
+        
+        Args:
+            summary_requests: (운세 데이터, 별자리, 날짜) 튜플의 리스트
+            use_batch: False면 일괄 처리 없이 동시 호출만 사용
+            max_workers: 동시 호출로 처리할 때의 최대 동시 요청 수
+            poll_interval: 일괄 처리 상태 확인 간격(초)
+            timeout: 일괄 처리 완료를 기다릴 최대 시간(초)
+            
+        Returns:
+            요청 순서대로 {'zodiac', 'date', 'summary', 'error'} 딕셔너리 리스트
+            (성공하면 summary, 실패하면 error가 채워짐)
+        """
+        results = [
+            {"zodiac": zodiac, "date": date, "summary": None, "error": None}
+            for _, zodiac, date in summary_requests
+        ]
+        
+        if not self.api_key:
+            for result in results:
+                result["error"] = "Claude API 키가 설정되지 않았습니다. .env 파일을 확인해주세요."
+            return results
+        
+        # 저장소 / 캐시 확인 후 남은 요청만 프롬프트로 준비
+        pending = {}  # custom_id -> (결과 인덱스, 프롬프트)
+        for index, (horoscope_data, zodiac, date) in enumerate(summary_requests):
+            if not horoscope_data:
+                results[index]["error"] = "요약할 운세 정보가 없습니다."
+                continue
+            marie_claire_content = self._extract_marie_claire_content(horoscope_data)
+            prompt = self._create_comprehensive_prompt(marie_claire_content, zodiac, date)
+            key = self._cache_key(prompt, COMPREHENSIVE_SYSTEM_PROMPT)
+            cached = self._get_stored_summary(key, zodiac, date) or self.summary_cache.get(key)
+            if cached:
+                results[index]["summary"] = cached
+                continue
+            pending[f"req-{index}"] = (index, prompt)
+        
+        if not pending:
+            return results
+        
+        outcomes = None
+        if use_batch:
+            outcomes = self._run_message_batch({custom_id: prompt for custom_id, (_, prompt) in pending.items()}, poll_interval, timeout, COMPREHENSIVE_SYSTEM_PROMPT)
+        if outcomes is None:
+            # 일괄 처리를 제출하지 못했을 때만 제한된 동시 호출로 처리 (제출 후에는 중복 과금을 막기 위해 다시 보내지 않음)
+            outcomes = self._run_concurrent({custom_id: prompt for custom_id, (_, prompt) in pending.items()}, max_workers, COMPREHENSIVE_SYSTEM_PROMPT)
+        
+        for custom_id, (index, prompt) in pending.items():
+            summary, error = outcomes.get(custom_id, (None, "결과를 받지 못했습니다."))
+            if summary:
+                key = self._cache_key(prompt, COMPREHENSIVE_SYSTEM_PROMPT)
+                self.summary_cache.set(key, summary)
+                self._put_stored_summary(key, results[index]["zodiac"], results[index]["date"], summary)
+                results[index]["summary"] = summary
+            else:
+                results[index]["error"] = error or "종합 운세를 생성할 수 없습니다. API 호출에 실패했습니다."
+        return results
+    
+    def _run_concurrent(self, prompts: Dict[str, str], max_workers: int, system: Optional[str] = None) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """프롬프트들을 제한된 동시 호출로 처리합니다. {custom_id: (결과, 오류)}를 반환합니다."""
+        outcomes = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(self._call_claude_api_cached, prompt, system): custom_id for custom_id, prompt in prompts.items()}
+            for future in as_completed(futures):
+                custom_id = futures[future]
+                try:
+                    summary = future.result()
+                    outcomes[custom_id] = (summary, None if summary else "API 호출에 실패했습니다.")
+                except Exception as e:
+                    outcomes[custom_id] = (None, str(e))
+        return outcomes
+    
+    def _run_message_batch(self, prompts: Dict[str, str], poll_interval: float, timeout: float, system: Optional[str] = None) -> Optional[Dict[str, Tuple[Optional[str], Optional[str]]]]:
+        """
+        Message Batches API로 프롬프트들을 일괄 처리합니다.
+        
+        제출한 뒤에는 상태 확인 / 결과 요청이 일시적으로 실패해도 마감까지 다시 확인하고,
+        마감을 넘기면 일괄 처리를 취소한 뒤 이미 끝난 항목의 결과만 받습니다
+        (제출 후에는 같은 프롬프트를 동시 호출로 다시 보내지 않도록 None을 반환하지 않음).
+        
+        Returns:
+            {custom_id: (결과, 오류)}. 일괄 처리를 제출하지 못했을 때만 None
+        """
+        batches_url = f"{self.base_url.rstrip('/')}/batches"
+        body = {
+            "requests": [
+                {"custom_id": custom_id, "params": self._build_request_body(prompt, system=system)}
+                for custom_id, prompt in prompts.items()
+            ]
+        }
+        
+        try:
+            response = post_with_retry(self.session, batches_url, max_retries=self.max_retries, headers=self.headers, json=body, timeout=self.timeout)
+            if response.status_code != 200:
+                logger.warning("일괄 처리 제출 실패: %s - %s", response.status_code, response.text)
+                API_ERRORS.inc(reason=str(response.status_code))
+                return None
+            batch = response.json()
+            batch_id = batch["id"]
+        except (requests.RequestException, KeyError, ValueError) as e:
+            logger.warning("일괄 처리 제출 오류: %s", e)
+            API_ERRORS.inc(reason="batch")
+            return None
+        logger.info("일괄 처리 제출: %s (%d건)", batch_id, len(prompts))
+        
+        batch_url = f"{batches_url}/{batch_id}"
+        batch = self._wait_for_batch(batch_url, batch, time.monotonic() + timeout, poll_interval)
+        if batch.get("processing_status") != "ended":
+            logger.warning("일괄 처리 대기 시간 초과, 취소합니다: %s", batch_id)
+            try:
+                response = post_with_retry(self.session, f"{batch_url}/cancel", max_retries=self.max_retries, headers=self.headers, timeout=self.timeout)
+                if response.status_code == 200:
+                    batch = response.json()
+            except (requests.RequestException, ValueError) as e:
+                logger.warning("일괄 처리 취소 오류: %s", e)
+            batch = self._wait_for_batch(batch_url, batch, time.monotonic() + BATCH_CANCEL_GRACE, poll_interval)
+        
+        failed = {custom_id: (None, f"일괄 처리 {batch_id}의 결과를 받지 못했습니다.") for custom_id in prompts}
+        if batch.get("processing_status") != "ended" or not batch.get("results_url"):
+            API_ERRORS.inc(reason="batch")
+            return failed
+        try:
+            response = get_with_retry(self.session, batch["results_url"], max_retries=self.max_retries, headers=self.headers, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning("일괄 처리 결과 요청 오류 (%s): %s", batch_id, e)
+            API_ERRORS.inc(reason="batch")
+            return failed
+        return {**failed, **self._parse_batch_results(response.content)}
+    
+    def _wait_for_batch(self, batch_url: str, batch: dict, deadline: float, poll_interval: float) -> dict:
+        """일괄 처리가 끝나거나 마감이 될 때까지 상태를 확인하고 마지막 상태를 반환합니다 (확인 실패는 다음 확인에서 다시 시도)."""
+        while batch.get("processing_status") != "ended":
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(poll_interval, remaining))
+            try:
+                response = get_with_retry(self.session, batch_url, max_retries=self.max_retries, headers=self.headers, timeout=self.timeout)
+                response.raise_for_status()
+                batch = response.json()
+            except (requests.RequestException, ValueError) as e:
+                logger.warning("일괄 처리 상태 확인 오류: %s", e)
+                API_ERRORS.inc(reason="batch_poll")
+                continue
+            counts = batch.get("request_counts", {})
+            logger.info("일괄 처리 진행 중: 처리 중 %s, 성공 %s, 오류 %s", counts.get('processing', 0), counts.get('succeeded', 0), counts.get('errored', 0))
+        return batch
+    
+    def _parse_batch_results(self, content: bytes) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """일괄 처리 결과(JSONL)를 {custom_id: (결과, 오류)}로 바꿉니다. 읽을 수 없는 줄은 건너뛰고 나머지는 유지합니다."""
+        outcomes = {}
+        for number, line in enumerate(content.decode("utf-8", errors="replace").splitlines(), 1):
+            if not line.strip():
+                continue
+            custom_id = None
+            try:
+                item = json.loads(line)
+                custom_id = item["custom_id"]
+                result = item.get("result") or {}
+                if result.get("type") == "succeeded":
+                    message = result.get("message", {})
+                    record_usage(message.get("usage"))
+                    outcomes[custom_id] = (self._message_text(message), None)
+                else:
+                    error = (result.get("error") or {}).get("error", {}).get("message") or result.get("type", "unknown")
+                    outcomes[custom_id] = (None, f"일괄 처리 항목 실패: {error}")
+            except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+                logger.warning("일괄 처리 결과 %d번째 줄을 읽을 수 없습니다: %s", number, e)
+                API_ERRORS.inc(reason="format")
+                if custom_id is not None:
+                    outcomes[custom_id] = (None, f"일괄 처리 결과를 읽을 수 없습니다: {e}")
+        return outcomes
+    
+    def _message_text(self, message: dict) -> Optional[str]:
+        """messages API 응답에서 텍스트를 꺼냅니다."""
+        if 'content' in message and message['content']:
+            return message['content'][0]['text']
+        return None
+    
+    def _extract_marie_claire_content(self, horoscope_data: List[Tuple[str, str]]) -> str:
+        """운세 데이터에서 마리끌레어 운세 내용을 찾습니다."""
+        for site_name, content in horoscope_data:
+            if "마리끌레어" in site_name and content and content.strip():
+                return content.strip()
+        return ""
+    
     def _prepare_horoscope_text(self, horoscope_data: List[Tuple[str, str]]) -> str:
         """운세 데이터를 텍스트로 준비합니다."""
         text_parts = []
@@ -130,84 +527,206 @@ class ClaudeAPI:
         return prompt
     
     def _create_comprehensive_prompt(self, marie_claire_content: str, zodiac: str, date: datetime.date) -> str:
-        """Claude API용 종합 운세 프롬프트를 생성합니다."""
+        """
+        Claude API용 종합 운세 프롬프트 중 요청마다 달라지는 부분을 생성합니다.
+        
+        고정된 점성술사 역할과 작성 지침은 COMPREHENSIVE_SYSTEM_PROMPT로 분리되어
+        프롬프트 캐싱 대상 system 블록으로 전송됩니다.
+        """
+        started = time.perf_counter()
         formatted_date = date.strftime('%Y년 %m월 %d일')
         
         prompt = f"""
-당신은 전문 점성술사입니다. {formatted_date} {zodiac}의 완성된 운세를 생성해주세요.
+{formatted_date} {zodiac}의 완성된 운세를 생성해주세요.
 
 다음은 마리끌레어 코리아에서 제공하는 기본 운세입니다:
 【마리끌레어 코리아 운세】
 {marie_claire_content}
 
-이 기본 운세를 바탕으로 하되, 다음 영역들을 추가로 보완하여 완성된 하루 운세를 만들어주세요:
-
-**구성 요소:**
-1. **전체 운세**: 마리끌레어 내용을 요약하고 하루 전체의 흐름을 제시
-2. **사랑/인간관계**: 연애, 가족, 친구 관계에서의 운세
-3. **직업/재정**: 일, 학업, 금전과 관련된 운세  
-4. **건강/라이프스타일**: 몸과 마음의 건강, 일상 관리
-5. **럭키 아이템/컬러**: 오늘 도움이 될 색깔이나 아이템
-6. **오늘의 조언**: 하루를 잘 보내기 위한 실용적 조언
-
-**작성 지침:**
-- 마리끌레어 내용과 자연스럽게 연결되도록 작성
-- {zodiac}의 성격적 특성을 반영
-- 구체적이고 실용적인 조언 포함
-- 긍정적이고 희망적인 톤 유지
-- 자연스럽고 읽기 쉬운 한국어로 작성
-- 각 섹션을 명확히 구분하여 정리
-
-완성된 종합 운세를 작성해주세요.
+{zodiac}의 성격적 특성을 반영하여 완성된 종합 운세를 작성해주세요.
 """
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage="prompt_build")
         return prompt
     
-    def _call_claude_api(self, prompt: str) -> Optional[str]:
-        """Claude API를 호출합니다."""
+    def _cache_key(self, prompt: str, system: Optional[str] = None) -> str:
+        """모델, system/user 프롬프트, max_tokens의 해시로 캐시 키를 만듭니다."""
+        payload = json.dumps([self.model, system, prompt, self.max_tokens], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _call_claude_api_cached(self, prompt: str, system: Optional[str] = None) -> Optional[str]:
+        """
+        메모이제이션된 Claude API 호출.
+        
+        같은 요청의 결과는 TTL 동안 재사용하고, 동시에 들어온 같은 요청은
+        한 번의 API 호출로 합칩니다. 실패(None)는 캐시하지 않습니다.
+        """
+        key = self._cache_key(prompt, system)
+        cached = self.summary_cache.get(key)
+        if cached is not None:
+            CACHE_HITS.inc(cache="summary")
+            return cached
+        CACHE_MISSES.inc(cache="summary")
+        
+        def call() -> Optional[str]:
+            # 기다리는 동안 다른 호출이 결과를 채웠을 수 있음
+            cached = self.summary_cache.get(key)
+            if cached is not None:
+                return cached
+            result = self._call_claude_api(prompt, system)
+            if result:
+                self.summary_cache.set(key, result)
+            return result
+        
+        return _summary_flight.do(key, call)
+    
+    def _build_request_body(self, prompt: str, stream: bool = False, system: Optional[str] = None) -> dict:
+        """
+        messages API 요청 본문을 만듭니다.
+        
+        system이 주어지면 프롬프트 캐싱(cache_control) 표시를 붙인 system 블록으로 보내
+        반복되는 고정 지침을 서버 측에서 재사용할 수 있게 합니다.
+        """
+        data = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
+        if system:
+            data["system"] = [
+                {
+                    "type": "text",
+                    "text": system,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ]
+        if stream:
+            data["stream"] = True
+        return data
+    
+    def _stream_claude_api(self, prompt: str, system: Optional[str] = None) -> Generator[str, None, bool]:
+        """
+        Claude API를 스트리밍 모드로 호출하고 텍스트 조각(SSE delta)을 반환합니다.
+        
+        제너레이터의 반환값(StopIteration.value)은 message_stop을 받았으면 True,
+        오류 이벤트 / 네트워크 오류 / 잘못된 JSON / 연결 종료로 중간에 끝났으면 False입니다.
+        """
+        started = time.perf_counter()
+        first_chunk = True
         try:
-            data = {
-                "model": "claude-3-haiku-20240307",  # 비용 효율적인 모델 사용
-                "max_tokens": 1000,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            }
-            
-            response = requests.post(
+            response = post_with_retry(
+                self.session,
                 self.base_url,
+                max_retries=self.max_retries,
                 headers=self.headers,
-                json=data,
-                timeout=30
+                json=self._build_request_body(prompt, stream=True, system=system),
+                timeout=self.timeout,
+                stream=True,
+                adaptive=get_adaptive_timeout(self.base_url, "stream", minimum=5.0)
             )
+        except requests.RequestException as e:
+            logger.warning("네트워크 오류: %s", e)
+            API_ERRORS.inc(reason="network")
+            return False
+        
+        try:
+            if response.status_code != 200:
+                logger.warning("API 오류: %s - %s", response.status_code, response.text)
+                API_ERRORS.inc(reason=str(response.status_code))
+                return False
+            
+            response.encoding = "utf-8"
+            usage = {}
+            for line in response.iter_lines(decode_unicode=True):
+                # 서버 전송 이벤트(SSE) 중 data 줄만 처리
+                if not line or not line.startswith("data:"):
+                    continue
+                event = json.loads(line[len("data:"):].strip())
+                event_type = event.get("type")
+                
+                if event_type == "message_start":
+                    usage.update(event.get("message", {}).get("usage", {}))
+                elif event_type == "message_delta":
+                    usage.update(event.get("usage", {}))
+                elif event_type == "content_block_delta":
+                    delta = event.get("delta", {})
+                    if delta.get("type") == "text_delta" and delta.get("text"):
+                        if first_chunk:
+                            first_chunk = False
+                            STAGE_SECONDS.observe(time.perf_counter() - started, stage="llm_first_chunk")
+                        yield delta["text"]
+                elif event_type == "error":
+                    logger.warning("API 스트림 오류: %s", event.get('error'))
+                    API_ERRORS.inc(reason="stream")
+                    return False
+                elif event_type == "message_stop":
+                    record_usage(usage)
+                    return True
+            logger.warning("message_stop 전에 스트림 연결이 끊겼습니다.")
+            API_ERRORS.inc(reason="stream")
+        except requests.RequestException as e:
+            logger.warning("스트림 수신 중 네트워크 오류: %s", e)
+            API_ERRORS.inc(reason="network")
+        except json.JSONDecodeError as e:
+            logger.warning("스트림 JSON 파싱 오류: %s", e)
+            API_ERRORS.inc(reason="format")
+        finally:
+            response.close()
+            STAGE_SECONDS.observe(time.perf_counter() - started, stage="llm_call", mode="stream")
+        return False
+    
+    def _call_claude_api(self, prompt: str, system: Optional[str] = None) -> Optional[str]:
+        """Claude API를 호출합니다."""
+        try:
+            data = self._build_request_body(prompt, system=system)
+            
+            with timer("llm_call", mode="blocking"):
+                response = post_with_retry(
+                    self.session,
+                    self.base_url,
+                    max_retries=self.max_retries,
+                    headers=self.headers,
+                    json=data,
+                    timeout=self.timeout,
+                    adaptive=get_adaptive_timeout(self.base_url, "messages", minimum=10.0)
+                )
             
             if response.status_code == 200:
                 result = response.json()
-                if 'content' in result and result['content']:
-                    return result['content'][0]['text']
+                record_usage(result.get("usage"))
+                text = self._message_text(result)
+                if text:
+                    return text
                 else:
-                    print(f"API 응답 형식 오류: {result}")
+                    logger.warning("API 응답 형식 오류: %s", result)
+                    API_ERRORS.inc(reason="format")
                     return None
             else:
-                print(f"API 오류: {response.status_code} - {response.text}")
+                logger.warning("API 오류: %s - %s", response.status_code, response.text)
+                API_ERRORS.inc(reason=str(response.status_code))
                 return None
                 
         except requests.RequestException as e:
-            print(f"네트워크 오류: {e}")
+            logger.warning("네트워크 오류: %s", e)
+            API_ERRORS.inc(reason="network")
             return None
         except json.JSONDecodeError as e:
-            print(f"JSON 파싱 오류: {e}")
+            logger.warning("JSON 파싱 오류: %s", e)
+            API_ERRORS.inc(reason="format")
             return None
         except Exception as e:
-            print(f"예상치 못한 오류: {e}")
+            logger.exception("예상치 못한 오류: %s", e)
+            API_ERRORS.inc(reason="unexpected")
             return None
     
     def test_api_connection(self) -> bool:
         """API 연결을 테스트합니다."""
         if not self.api_key:
-            print("API 키가 설정되지 않았습니다.")
+            logger.warning("API 키가 설정되지 않았습니다.")
             return False
         
         try:
@@ -215,14 +734,14 @@ class ClaudeAPI:
             response = self._call_claude_api(test_prompt)
             
             if response:
-                print("Claude API 연결 성공!")
+                logger.info("Claude API 연결 성공!")
                 return True
             else:
-                print("Claude API 연결 실패!")
+                logger.warning("Claude API 연결 실패!")
                 return False
                 
         except Exception as e:
-            print(f"API 연결 테스트 오류: {e}")
+            logger.warning("API 연결 테스트 오류: %s", e)
             return False
 
 # 대체 요약 생성 함수 (Claude API가 작동하지 않을 때 사용)
@@ -260,11 +779,15 @@ def create_simple_summary(horoscope_data: List[Tuple[str, str]], zodiac: str, da
 
 # 대체 종합 요약 생성 함수 (Claude API가 작동하지 않을 때 사용)
 def create_comprehensive_summary(horoscope_data: List[Tuple[str, str]], zodiac: str, date: datetime.date) -> str:
-    """종합 운세를 생성합니다 (Claude API 없이)."""
+    """
+    종합 운세를 생성합니다 (Claude API 없이, local_summary의 로컬 생성기 사용).
+    
+    대체 지표(FALLBACKS)는 기록하지 않으므로 AI 종합 운세 대신 사용하는 호출자가 기록합니다.
+    """
     if not horoscope_data:
         return "운세 정보가 없습니다."
     
-    formatted_date = date.strftime('%Y년 %m월 %d일')
+    started = time.perf_counter()
     
     # 마리끌레어 내용 추출
     marie_claire_content = ""
@@ -273,49 +796,9 @@ def create_comprehensive_summary(horoscope_data: List[Tuple[str, str]], zodiac:
             marie_claire_content = content.strip()
             break
     
-    # 별자리별 특성 정의
-    zodiac_traits = {
-        "물병자리": {"특성": "독창적이고 혁신적", "럭키컬러": "파란색", "럭키아이템": "독특한 액세서리"},
-        "물고기자리": {"특성": "감성적이고 직관적", "럭키컬러": "바다색", "럭키아이템": "물 관련 아이템"},
-        "양자리": {"특성": "활동적이고 리더십", "럭키컬러": "빨간색", "럭키아이템": "스포츠용품"},
-        "황소자리": {"특성": "안정적이고 실용적", "럭키컬러": "초록색", "럭키아이템": "자연 소재 아이템"},
-        "쌍둥이자리": {"특성": "소통능력과 호기심", "럭키컬러": "노란색", "럭키아이템": "책이나 펜"},
-        "게자리": {"특성": "가정적이고 따뜻함", "럭키컬러": "실버", "럭키아이템": "가족 사진"},
-        "사자자리": {"특성": "당당하고 창조적", "럭키컬러": "금색", "럭키아이템": "반짝이는 액세서리"},
-        "처녀자리": {"특성": "체계적이고 세심함", "럭키컬러": "베이지", "럭키아이템": "정리용품"},
-        "천칭자리": {"특성": "균형감각과 미적감각", "럭키컬러": "핑크", "럭키아이템": "예술 작품"},
-        "전갈자리": {"특성": "집중력과 통찰력", "럭키컬러": "검은색", "럭키아이템": "신비로운 소품"},
-        "궁수자리": {"특성": "자유롭고 모험적", "럭키컬러": "보라색", "럭키아이템": "여행 관련 아이템"},
-        "염소자리": {"특성": "성실하고 목표지향적", "럭키컬러": "갈색", "럭키아이템": "플래너"}
-    }
-    
-    traits = zodiac_traits.get(zodiac, {"특성": "독특하고 매력적", "럭키컬러": "하얀색", "럭키아이템": "개인적인 소품"})
-    
-    summary_parts = [
-        f"# 📅 {formatted_date} {zodiac} 종합 운세",
-        "",
-        "## 🌟 전체 운세",
-        f"{marie_claire_content}" if marie_claire_content else f"오늘은 {zodiac}에게 {traits['특성']}한 면이 돋보이는 하루가 될 것입니다.",
-        "",
-        "## 💕 사랑/인간관계", 
-        f"{zodiac}의 매력이 빛나는 하루입니다. 가까운 사람들과의 관계에서 따뜻한 소통이 이루어질 것 같아요. 진솔한 대화를 나누면 더욱 깊은 유대감을 형성할 수 있습니다.",
-        "",
-        "## 💼 직업/재정",
-        f"차근차근 계획을 세워 진행하는 것이 좋은 날입니다. {traits['특성']}한 {zodiac}의 장점을 살려 업무에 집중해보세요. 금전 관리에도 신중함을 기하는 것이 좋겠습니다.",
-        "",
-        "## 🌿 건강/라이프스타일", 
-        "몸과 마음의 균형을 맞추는 것이 중요한 하루입니다. 충분한 휴식과 함께 가벼운 운동이나 산책을 통해 활력을 충전해보세요. 규칙적인 생활 패턴이 도움이 될 것입니다.",
-        "",
-        "## ✨ 럭키 아이템/컬러",
-        f"**럭키 컬러**: {traits['럭키컬러']}  ",
-        f"**럭키 아이템**: {traits['럭키아이템']}  ",
-        f"{traits['럭키컬러']} 계열의 소품을 지니거나 의상에 포인트로 활용하면 긍정적인 에너지를 받을 수 있어요.",
-        "",
-        "## 💡 오늘의 조언",
-        f"오늘은 {zodiac}의 {traits['특성']}한 면을 자신있게 표현해보세요. 작은 변화라도 긍정적으로 받아들이고, 주변 사람들에게 따뜻한 마음을 전해보는 하루가 되길 바랍니다. ⭐"
-    ]
-    
-    return "\n".join(summary_parts)
+    summary = generate_summary(marie_claire_content, zodiac, date)
+    STAGE_SECONDS.observe(time.perf_counter() - started, stage="fallback_summary")
+    return summary
 
 # 테스트 함수
 def test_claude_api():
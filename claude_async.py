@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import os
+import time
+import datetime
+from typing import List, Optional, Tuple
+
+from claude_api import COMPREHENSIVE_SYSTEM_PROMPT, ClaudeAPI, create_comprehensive_summary, record_usage
+from http_client import DEFAULT_POOL_SIZE, RETRY_STATUS_CODES, adapt_timeout, get_adaptive_timeout, get_breaker, retry_delay
+from metrics import API_ERRORS, API_RETRIES, CACHE_HITS, CIRCUIT_SHORT_CIRCUITS, FALLBACKS, timer
+from rate_limit import TokenBucket
+from store import HoroscopeStore
+
+logger = logging.getLogger(__name__)
+
+# 선택 의존성: httpx가 설치되어 있으면 asyncio 네이티브 HTTP 클라이언트를 사용
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# 동시성 / 요청 제한 기본 설정 (환경 변수로 변경 가능)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("CLAUDE_MAX_CONCURRENCY", "8"))
+DEFAULT_REQUESTS_PER_MINUTE = float(os.getenv("CLAUDE_REQUESTS_PER_MINUTE", "50"))
+DEFAULT_TOKENS_PER_MINUTE = float(os.getenv("CLAUDE_TOKENS_PER_MINUTE", "50000"))
+DEFAULT_QUEUE_TIMEOUT = float(os.getenv("CLAUDE_QUEUE_TIMEOUT", "10"))
+
+# 마감 전에 요청 제한 / 동시성 대기열을 통과하지 못했음을 나타내는 내부 표식
+_RATE_LIMITED = object()
+
+
+class AsyncClaudeAPI:
+    """
+    asyncio용 Claude API 클라이언트
+
+    프롬프트, 캐시, 저장소는 동기 ClaudeAPI와 공유하고, 요청은 세마포어로 동시 실행 수를
+    제한하며 분당 요청 수 / 분당 토큰 수 토큰 버킷을 통과해야 전송됩니다.
+    대기 시간이 마감을 넘길 요청은 큐에 넣지 않고 바로 거절합니다.
+
+    세마포어, HTTP 클라이언트, 진행 중인 요청처럼 이벤트 루프에 묶이는 객체는 루프마다
+    따로 만들므로 여러 asyncio.run()에서 같은 인스턴스를 사용할 수 있습니다.
+    ``async with``로 사용하면 끝날 때 해당 루프의 연결을 닫습니다.
+    """
+
+    def __init__(self, store: Optional[HoroscopeStore] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+                 queue_timeout: float = DEFAULT_QUEUE_TIMEOUT):
+        self.sync_api = ClaudeAPI(store=store)
+        self.max_concurrency = max_concurrency
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.queue_timeout = queue_timeout
+
+        # 이벤트 루프별 {'semaphore', 'client', 'inflight'} (닫힌 루프의 항목은 새 루프에서 정리)
+        self._loops = {}
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return self.sync_api.api_key
+
+    async def __aenter__(self) -> "AsyncClaudeAPI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _loop_state(self) -> dict:
+        """현재 이벤트 루프의 세마포어 / 클라이언트 / 진행 중인 요청을 반환합니다 (처음 사용할 때 생성)."""
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            for closed in [other for other in self._loops if other.is_closed()]:
+                del self._loops[closed]
+            state = self._loops[loop] = {
+                "semaphore": asyncio.Semaphore(self.max_concurrency),
+                "client": None,
+                "inflight": {},
+            }
+        return state
+
+    def _get_client(self):
+        """httpx가 있으면 현재 루프에서 연결 풀을 공유하는 AsyncClient를 반환합니다."""
+        if httpx is None:
+            return None
+        state = self._loop_state()
+        if state["client"] is None:
+            connect_timeout, read_timeout = self.sync_api.timeout
+            state["client"] = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=DEFAULT_POOL_SIZE, max_keepalive_connections=DEFAULT_POOL_SIZE),
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            )
+        return state["client"]
+
+    async def aclose(self) -> None:
+        """현재 이벤트 루프에서 만든 HTTP 클라이언트를 닫습니다."""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None and state["client"] is not None:
+            await state["client"].aclose()
+
+    async def get_comprehensive_summary(self, horoscope_data: List[Tuple[str, str]], zodiac: str, date: datetime.date, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        ClaudeAPI.get_comprehensive_summary의 비동기 버전.
+
+        Args:
+            horoscope_data: (사이트명, 운세내용) 튜플의 리스트
+            zodiac: 별자리 이름
+            date: 선택된 날짜
+            timeout: 요청 제한 / 동시성 대기열에서 기다릴 최대 시간(초).
+                None이면 queue_timeout 사용
+
+        Returns:
+            종합 운세 텍스트. 대기 시간이 마감을 넘기면 로컬 생성기의 기본 요약(캐시에는 기록하지 않음),
+            API 키나 운세 데이터가 없거나 API 호출에 실패하면 None
+        """
+        if not self.api_key:
+            logger.warning("Claude API 키가 설정되지 않았습니다.")
+            return None
+
+        if not horoscope_data:
+            return None
+
+        api = self.sync_api
+        marie_claire_content = api._extract_marie_claire_content(horoscope_data)
+        prompt = api._create_comprehensive_prompt(marie_claire_content, zodiac, date)
+        key = api._cache_key(prompt, COMPREHENSIVE_SYSTEM_PROMPT)
+        stored = api._get_stored_summary(key, zodiac, date)
+        if stored:
+            return stored
+
+        cached = api.summary_cache.get(key)
+        if cached is not None:
+            CACHE_HITS.inc(cache="summary")
+            return cached
+
+        # 같은 요청이 이미 진행 중이면 그 결과를 함께 기다림
+        inflight_requests = self._loop_state()["inflight"]
+        inflight = inflight_requests.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        inflight_requests[key] = future
+        try:
+            deadline = time.monotonic() + (self.queue_timeout if timeout is None else timeout)
+            response = await self._call_limited(prompt, COMPREHENSIVE_SYSTEM_PROMPT, deadline)
+            if response is None:
+                result = None
+            elif response is _RATE_LIMITED:
+                API_ERRORS.inc(reason="rate_limited")
+                FALLBACKS.inc(kind="summary")
+                result = create_comprehensive_summary(horoscope_data, zodiac, date)
+            else:
+                api.summary_cache.set(key, response)
+                api._put_stored_summary(key, zodiac, date, response)
+                result = response
+            future.set_result(result)
+            return result
+        except Exception as e:
+            logger.exception("Claude API 오류: %s", e)
+            API_ERRORS.inc(reason="unexpected")
+            future.set_result(None)
+            return None
+        finally:
+            inflight_requests.pop(key, None)
+            if not future.done():
+                future.cancel()
+
+    def _estimate_tokens(self, prompt: str, system: Optional[str]) -> int:
+        """입력(한국어는 대략 2글자당 1토큰)과 최대 출력 토큰으로 사용량을 어림합니다."""
+        return (len(prompt) + len(system or "")) // 2 + self.sync_api.max_tokens
+
+    async def _call_limited(self, prompt: str, system: Optional[str], deadline: float):
+        """요청 제한과 동시성 제한을 통과한 뒤 API를 호출합니다."""
+        tokens = self._estimate_tokens(prompt, system)
+
+        request_delay = self.request_bucket.reserve(1, deadline)
+        if request_delay is None:
+            return _RATE_LIMITED
+        token_delay = self.token_bucket.reserve(tokens, deadline)
+        if token_delay is None:
+            self.request_bucket.refund(1)
+            return _RATE_LIMITED
+
+        delay = max(request_delay, token_delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        semaphore = self._loop_state()["semaphore"]
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            return _RATE_LIMITED
+        try:
+            return await self._call_claude_api(prompt, system)
+        finally:
+            semaphore.release()
+
+    async def _call_claude_api(self, prompt: str, system: Optional[str]) -> Optional[str]:
+        """Claude API를 비동기로 호출합니다. httpx가 없으면 공유 연결 풀의 동기 호출을 스레드에서 실행합니다."""
+        client = self._get_client()
+        if client is None:
+            return await asyncio.to_thread(self.sync_api._call_claude_api, prompt, system)
+
+        api = self.sync_api
+        body = api._build_request_body(prompt, system=system)
+        breaker = get_breaker(api.base_url)
+        # 동기 호출과 같은 호스트별 적응형 타임아웃 사용 (읽기 타임아웃을 최근 응답 시간에 맞춤)
+        adaptive = get_adaptive_timeout(api.base_url, "messages", minimum=10.0)
+        connect_timeout, read_timeout = adapt_timeout(api.timeout, adaptive)
+        request_timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        for attempt in range(api.max_retries + 1):
+            if not breaker.allow():
+                # API 장애로 회로 차단기가 열려 있으면 요청하지 않음
+                CIRCUIT_SHORT_CIRCUITS.inc(host=breaker.name)
+                return None
+            started = time.monotonic()
+            try:
+                with timer("llm_call", mode="async"):
+                    response = await client.post(api.base_url, headers=api.headers, json=body, timeout=request_timeout)
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                if attempt >= api.max_retries or isinstance(e, httpx.ReadTimeout):
+                    logger.warning("네트워크 오류: %s", e)
+                    API_ERRORS.inc(reason="network")
+                    return None
+                API_RETRIES.inc(reason="network")
+                await asyncio.sleep(retry_delay(attempt))
+                continue
+
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+                if response.status_code == 200:
+                    adaptive.observe(time.monotonic() - started)
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < api.max_retries:
+                API_RETRIES.inc(reason=str(response.status_code))
+                await asyncio.sleep(retry_delay(attempt, response))
+                continue
+
+            if response.status_code != 200:
+                logger.warning("API 오류: %s - %s", response.status_code, response.text)
+                API_ERRORS.inc(reason=str(response.status_code))
+                return None
+
+            result = response.json()
+            record_usage(result.get("usage"))
+            text = api._message_text(result)
+            if not text:
+                logger.warning("API 응답 형식 오류: %s", result)
+                API_ERRORS.inc(reason="format")
+            return text
+        return None
@@ -0,0 +1,109 @@
+import os
+from importlib.util import find_spec
+from typing import Dict, List, Optional, Tuple
+
+# 선택 의존성: 설치되어 있으면 더 빠른 파서를 사용
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+# BeautifulSoup 'lxml' 백엔드 확인용 (lxml은 실제로 파싱할 때 bs4가 불러옴)
+HAS_LXML = find_spec("lxml") is not None
+
+# 사이트별 운세 본문 영역 CSS 선택자 (앞에서부터 시도, "태그" 또는 "태그.클래스" 형식)
+SOURCE_SELECTORS: Dict[str, List[str]] = {
+    "marie_claire": ["div.entry-content", "div.post-content", "article"],
+    "elle": ["div.article-body", "div.atc_content", "article"],
+    "singles": ["div.article_body", "div.atc_content", "article"],
+}
+
+# 본문 텍스트에 포함하지 않을 태그
+_NON_CONTENT_TAGS = ["script", "style", "noscript", "template"]
+
+
+def available_backend() -> str:
+    """
+    사용할 파서 백엔드 이름을 반환합니다.
+
+    HTML_PARSER_BACKEND 환경 변수로 지정할 수 있으며, 지정하지 않으면
+    selectolax > lxml > html.parser 순서로 설치된 것을 사용합니다.
+    """
+    preferred = os.getenv("HTML_PARSER_BACKEND", "").strip()
+    if preferred == "selectolax" and SelectolaxParser is not None:
+        return "selectolax"
+    if preferred == "lxml" and HAS_LXML:
+        return "lxml"
+    if preferred == "html.parser":
+        return "html.parser"
+    if SelectolaxParser is not None:
+        return "selectolax"
+    if HAS_LXML:
+        return "lxml"
+    return "html.parser"
+
+
+def _split_selector(selector: str) -> Tuple[str, Optional[str]]:
+    tag, _, class_name = selector.partition(".")
+    return tag, class_name or None
+
+
+def _selectolax_text(content: bytes, selectors: List[str]) -> str:
+    tree = SelectolaxParser(content)
+    tree.strip_tags(_NON_CONTENT_TAGS)
+    for selector in selectors:
+        nodes = tree.css(selector)
+        if nodes:
+            return "".join(node.text(deep=True) for node in nodes)
+    if selectors:
+        return ""
+    root = tree.body or tree.root
+    return root.text(deep=True) if root is not None else ""
+
+
+def _soup_text(soup) -> str:
+    for tag in soup.find_all(_NON_CONTENT_TAGS):
+        tag.decompose()
+    return soup.get_text()
+
+
+def _bs4_text(content: bytes, selectors: List[str], parser: str) -> str:
+    # bs4(soupsieve 포함)는 불러오는 비용이 커서 bs4 백엔드를 쓸 때 처음 불러옴
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    # SoupStrainer로 본문 영역만 부분 파싱하여 트리 크기와 파싱 비용을 줄임
+    for selector in selectors:
+        tag, class_name = _split_selector(selector)
+        strainer = SoupStrainer(tag, class_=class_name) if class_name else SoupStrainer(tag)
+        soup = BeautifulSoup(content, parser, parse_only=strainer)
+        text = _soup_text(soup)
+        if text.strip():
+            return text
+    if selectors:
+        return ""
+    return _soup_text(BeautifulSoup(content, parser))
+
+
+def extract_text(content: bytes, source: Optional[str] = None) -> str:
+    """
+    HTML에서 텍스트를 추출합니다.
+
+    Args:
+        content: HTML 원문
+        source: 사이트 키 (marie_claire, elle, singles). 지정하면 해당 사이트의
+            운세 본문 영역만 추출하고, 본문 영역을 찾지 못하면 빈 문자열을 반환합니다.
+            None이면 페이지 전체 텍스트를 반환합니다.
+    """
+    selectors = SOURCE_SELECTORS.get(source, []) if source else []
+    backend = available_backend()
+    if backend == "selectolax":
+        return _selectolax_text(content, selectors)
+    return _bs4_text(content, selectors, backend)
+
+
+def candidate_texts(content: bytes, source: str):
+    """본문 영역 텍스트를 먼저, 그 다음 페이지 전체 텍스트를 차례로 반환합니다."""
+    text = extract_text(content, source)
+    if text.strip():
+        yield text
+    yield extract_text(content)
@@ -0,0 +1,321 @@
+import logging
+import os
+import random
+import threading
+import time
+import email.utils
+from collections import deque
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+from metrics import API_RETRIES, CIRCUIT_SHORT_CIRCUITS, CIRCUIT_TRANSITIONS
+
+logger = logging.getLogger(__name__)
+
+# 연결 풀 / 재시도 기본 설정 (환경 변수로 변경 가능)
+DEFAULT_POOL_SIZE = int(os.getenv("CLAUDE_POOL_SIZE", "10"))
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("CLAUDE_CONNECT_TIMEOUT", "3.05"))
+DEFAULT_READ_TIMEOUT = float(os.getenv("CLAUDE_READ_TIMEOUT", "30"))
+DEFAULT_MAX_RETRIES = int(os.getenv("CLAUDE_MAX_RETRIES", "3"))
+
+# 재시도 대상 상태 코드 (요청 제한 / 서버 오류 / 과부하)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504, 529}
+BACKOFF_BASE = 0.5  # 초
+BACKOFF_MAX = 20.0  # 초
+
+# 설치된 디코더 기준으로 가장 좋은 압축 방식을 요청 (brotli / zstandard가 있으면 br / zstd 포함)
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+# 호스트별 회로 차단기 설정 (최근 요청 실패율 기준)
+CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", "20"))  # 실패율을 계산할 최근 요청 수
+CIRCUIT_MIN_REQUESTS = int(os.getenv("CIRCUIT_MIN_REQUESTS", "5"))  # 차단 판단에 필요한 최소 요청 수
+CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))  # 이 비율 이상 실패하면 차단
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))  # 차단 후 시험 요청까지 대기 시간(초)
+
+# 응답 시간 기반 타임아웃 설정: 최근 응답 시간의 백분위수 x 배수 (호출자의 타임아웃이 상한)
+ADAPTIVE_TIMEOUT_PERCENTILE = 0.95
+ADAPTIVE_TIMEOUT_MULTIPLIER = 3.0
+ADAPTIVE_TIMEOUT_WINDOW = 100
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = 10
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_shared_session(name: str = "claude", pool_size: Optional[int] = None) -> requests.Session:
+    """
+    프로세스 전체에서 공유하는 keep-alive 연결 풀 세션을 반환합니다.
+
+    같은 name으로 호출하면 항상 같은 세션을 돌려주므로 TCP/TLS 연결이 재사용됩니다.
+    """
+    with _sessions_lock:
+        session = _sessions.get(name)
+        if session is None:
+            size = pool_size or DEFAULT_POOL_SIZE
+            adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size, max_retries=0)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[name] = session
+        return session
+
+
+class CircuitOpenError(requests.RequestException):
+    """회로 차단기가 열려 있어 요청을 보내지 않았음 (기존 네트워크 오류 처리로 대체 경로를 탐)"""
+
+
+class CircuitBreaker:
+    """
+    호스트별 회로 차단기 (closed / open / half-open)
+
+    최근 window개 요청의 실패율이 failure_rate 이상이면 열려서 open_seconds 동안 요청을 막고,
+    그 후 시험 요청 하나만 보내(half-open) 성공하면 닫고 실패하면 다시 엽니다.
+    """
+
+    def __init__(self, name: str, window: int = CIRCUIT_WINDOW, min_requests: int = CIRCUIT_MIN_REQUESTS,
+                 failure_rate: float = CIRCUIT_FAILURE_RATE, open_seconds: float = CIRCUIT_OPEN_SECONDS):
+        self.name = name
+        self.min_requests = min_requests
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self._results = deque(maxlen=window)  # True = 실패
+        self._state = CIRCUIT_CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == CIRCUIT_OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                return CIRCUIT_HALF_OPEN
+            return self._state
+
+    def is_open(self) -> bool:
+        """요청을 보내도 바로 거절될 상태인지 확인합니다 (시험 요청 기회는 소비하지 않음)."""
+        return self.state == CIRCUIT_OPEN
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 확인합니다. half-open 상태에서는 시험 요청 하나만 허용합니다."""
+        with self._lock:
+            if self._state == CIRCUIT_OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    return False
+                self._transition(CIRCUIT_HALF_OPEN)
+            if self._state == CIRCUIT_HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def release(self) -> None:
+        """allow() 후 요청을 보내지 않았을 때 시험 요청 기회를 돌려놓습니다."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == CIRCUIT_HALF_OPEN:
+                self._results.clear()
+                self._transition(CIRCUIT_CLOSED)
+            self._results.append(False)
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+            if self._state == CIRCUIT_HALF_OPEN:
+                self._open()
+                return
+            self._results.append(True)
+            if len(self._results) >= self.min_requests and sum(self._results) / len(self._results) >= self.failure_rate:
+                self._open()
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._transition(CIRCUIT_OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state != self._state:
+            logger.warning("회로 차단기 %s: %s -> %s", self.name, self._state, state)
+            CIRCUIT_TRANSITIONS.inc(host=self.name, state=state)
+            self._state = state
+
+
+class AdaptiveTimeout:
+    """최근 응답 시간의 백분위수로 읽기 타임아웃을 정하는 호스트별 타임아웃"""
+
+    def __init__(self, minimum: float = 1.0, percentile: float = ADAPTIVE_TIMEOUT_PERCENTILE,
+                 multiplier: float = ADAPTIVE_TIMEOUT_MULTIPLIER, window: int = ADAPTIVE_TIMEOUT_WINDOW,
+                 min_samples: int = ADAPTIVE_TIMEOUT_MIN_SAMPLES):
+        self.minimum = minimum
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def current(self, maximum: float) -> float:
+        """
+        사용할 타임아웃(초)을 반환합니다.
+
+        Args:
+            maximum: 호출자가 지정한 타임아웃 (상한이자 표본이 부족할 때의 기본값)
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return maximum
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return min(maximum, max(self.minimum, ordered[index] * self.multiplier))
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_adaptive_timeouts: Dict[str, AdaptiveTimeout] = {}
+_upstream_lock = threading.Lock()
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    """URL의 호스트에 해당하는 프로세스 공유 회로 차단기를 반환합니다."""
+    host = host_of(url)
+    with _upstream_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+        return breaker
+
+
+def get_adaptive_timeout(url: str, kind: str = "default", minimum: float = 1.0) -> AdaptiveTimeout:
+    """URL의 호스트(와 요청 종류)에 해당하는 프로세스 공유 타임아웃을 반환합니다."""
+    key = f"{host_of(url)}:{kind}"
+    with _upstream_lock:
+        adaptive = _adaptive_timeouts.get(key)
+        if adaptive is None:
+            adaptive = _adaptive_timeouts[key] = AdaptiveTimeout(minimum=minimum)
+        return adaptive
+
+
+def adapt_timeout(timeout: Union[float, Tuple[float, float]], adaptive: Optional[AdaptiveTimeout]) -> Union[float, Tuple[float, float]]:
+    """(연결, 읽기) 또는 단일 타임아웃 중 읽기 타임아웃을 관측된 응답 시간에 맞게 줄입니다."""
+    if adaptive is None:
+        return timeout
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return connect, adaptive.current(read)
+    return adaptive.current(timeout)
+
+
+def is_upstream_failure(response: Optional[requests.Response] = None, error: Optional[Exception] = None) -> bool:
+    """연결 실패 / 타임아웃 / 5xx를 호스트 장애로 봅니다 (429 같은 4xx는 제외)."""
+    if error is not None:
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+    return response is not None and response.status_code >= 500
+
+
+def _retry_after_seconds(response: Optional[requests.Response]) -> Optional[float]:
+    """retry-after 헤더(초 또는 HTTP 날짜)를 초 단위로 변환합니다."""
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_delay(attempt: int, response: Optional[requests.Response] = None) -> float:
+    """재시도 대기 시간: retry-after가 있으면 따르고, 없으면 지터를 준 지수 백오프"""
+    retry_after = _retry_after_seconds(response)
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def post_with_retry(session: requests.Session, url: str, max_retries: int = DEFAULT_MAX_RETRIES,
+                    adaptive: Optional[AdaptiveTimeout] = None, **kwargs) -> requests.Response:
+    """
+    429/5xx 응답과 연결 실패 시 백오프 후 재시도하는 POST 요청.
+
+    읽기 타임아웃은 서버가 이미 처리 중일 수 있으므로 재시도하지 않습니다.
+    자세한 동작은 request_with_retry를 참고하세요.
+    """
+    return request_with_retry(session, "POST", url, max_retries=max_retries, adaptive=adaptive, **kwargs)
+
+
+def get_with_retry(session: requests.Session, url: str, max_retries: int = DEFAULT_MAX_RETRIES,
+                   adaptive: Optional[AdaptiveTimeout] = None, **kwargs) -> requests.Response:
+    """post_with_retry와 같은 백오프로 재시도하는 GET 요청 (멱등이므로 읽기 타임아웃도 재시도)."""
+    return request_with_retry(session, "GET", url, max_retries=max_retries, adaptive=adaptive, **kwargs)
+
+
+def request_with_retry(session: requests.Session, method: str, url: str, max_retries: int = DEFAULT_MAX_RETRIES,
+                       adaptive: Optional[AdaptiveTimeout] = None, **kwargs) -> requests.Response:
+    """
+    429/5xx 응답과 연결 실패 시 백오프 후 재시도하는 요청.
+
+    POST의 읽기 타임아웃은 서버가 이미 처리 중일 수 있으므로 재시도하지 않습니다.
+    마지막 시도의 응답을 그대로 반환하며, 연결 실패가 계속되면 예외를 다시 발생시킵니다.
+    호스트의 회로 차단기가 열려 있으면 요청 없이 CircuitOpenError를 발생시키고,
+    adaptive가 주어지면 읽기 타임아웃을 관측된 응답 시간에 맞춥니다.
+    """
+    breaker = get_breaker(url)
+    if "timeout" in kwargs:
+        kwargs["timeout"] = adapt_timeout(kwargs["timeout"], adaptive)
+    for attempt in range(max_retries + 1):
+        if not breaker.allow():
+            CIRCUIT_SHORT_CIRCUITS.inc(host=breaker.name)
+            raise CircuitOpenError(f"회로 차단기가 열려 있습니다: {breaker.name}")
+        started = time.monotonic()
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            if is_upstream_failure(error=e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            retryable = isinstance(e, requests.ConnectionError) or (method != "POST" and isinstance(e, requests.Timeout))
+            if not retryable or attempt >= max_retries:
+                raise
+            API_RETRIES.inc(reason="network")
+            time.sleep(retry_delay(attempt))
+            continue
+
+        if is_upstream_failure(response):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            if adaptive is not None and response.status_code == 200:
+                adaptive.observe(time.monotonic() - started)
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < max_retries:
+            delay = retry_delay(attempt, response)
+            logger.info("API 재시도 %d/%d: %s, %.1f초 후", attempt + 1, max_retries, response.status_code, delay)
+            API_RETRIES.inc(reason=str(response.status_code))
+            response.close()
+            time.sleep(delay)
+            continue
+        return response
+    raise requests.RetryError(f"재시도 횟수를 초과했습니다: {url}")
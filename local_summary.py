@@ -0,0 +1,197 @@
+"""
+로컬 종합 운세 생성기
+
+스크래핑한 운세를 문장 단위로 나누고 키워드 사전으로 사랑 / 직업 / 건강 / 조언 섹션에 배치한 뒤,
+날짜와 별자리로 고른 문장 틀과 별자리 특성표(ZODIAC_TRAITS)로 빈 곳을 채웁니다.
+네트워크 없이 1ms 안에 끝나므로 LLM 결과가 스트리밍되는 동안의 첫 화면이나,
+부하가 몰려 LLM 호출을 줄일 때의 기본 요약으로 사용합니다.
+"""
+
+import datetime
+import random
+import re
+import zlib
+from typing import Dict, List, Optional
+
+# 별자리별 럭키 컬러 / 럭키 아이템 / 성향(문장 틀에서 명사 앞에 쓰는 형태)
+ZODIAC_TRAITS: Dict[str, Dict[str, str]] = {
+    "물병자리": {"럭키컬러": "파란색", "럭키아이템": "독특한 액세서리", "성향": "독창적이고 혁신적인"},
+    "물고기자리": {"럭키컬러": "바다색", "럭키아이템": "물 관련 아이템", "성향": "감성적이고 직관적인"},
+    "양자리": {"럭키컬러": "빨간색", "럭키아이템": "스포츠용품", "성향": "활동적이고 리더십 있는"},
+    "황소자리": {"럭키컬러": "초록색", "럭키아이템": "자연 소재 아이템", "성향": "안정적이고 실용적인"},
+    "쌍둥이자리": {"럭키컬러": "노란색", "럭키아이템": "책이나 펜", "성향": "소통에 능하고 호기심 많은"},
+    "게자리": {"럭키컬러": "실버", "럭키아이템": "가족 사진", "성향": "가정적이고 따뜻한"},
+    "사자자리": {"럭키컬러": "금색", "럭키아이템": "반짝이는 액세서리", "성향": "당당하고 창조적인"},
+    "처녀자리": {"럭키컬러": "베이지", "럭키아이템": "정리용품", "성향": "체계적이고 세심한"},
+    "천칭자리": {"럭키컬러": "핑크", "럭키아이템": "예술 작품", "성향": "균형 감각과 미적 감각이 뛰어난"},
+    "전갈자리": {"럭키컬러": "검은색", "럭키아이템": "신비로운 소품", "성향": "집중력과 통찰력이 뛰어난"},
+    "궁수자리": {"럭키컬러": "보라색", "럭키아이템": "여행 관련 아이템", "성향": "자유롭고 모험적인"},
+    "염소자리": {"럭키컬러": "갈색", "럭키아이템": "플래너", "성향": "성실하고 목표지향적인"},
+}
+DEFAULT_TRAITS = {"럭키컬러": "하얀색", "럭키아이템": "개인적인 소품", "성향": "독특하고 매력적인"}
+
+# 섹션별 키워드 사전 (한 문장이 여러 섹션에 걸리면 키워드가 더 많이 나온 섹션으로 배치)
+SECTION_KEYWORDS: Dict[str, List[str]] = {
+    "love": ["사랑", "연애", "연인", "애정", "인연", "만남", "고백", "데이트", "썸", "배우자", "관계",
+             "친구", "가족", "동료", "대화", "소통", "사람들", "마음을", "감정 표현", "이성"],
+    "career": ["직장", "업무", "일정", "프로젝트", "성과", "승진", "능력", "역할", "계약", "사업", "회의",
+               "금전", "재물", "재정", "돈", "소비", "지출", "투자", "수입", "저축", "계획적", "공부", "시험", "배움"],
+    "health": ["건강", "휴식", "운동", "컨디션", "피로", "수면", "식습관", "식사", "스트레스",
+               "체력", "산책", "스트레칭", "생활 리듬", "감정의 기복", "몸"],
+}
+_SECTION_PATTERNS = {
+    section: re.compile("|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)))
+    for section, keywords in SECTION_KEYWORDS.items()
+}
+# 권유 / 주의 문장 (주제 키워드가 없으면 조언 섹션으로 배치)
+_ADVICE_PATTERN = re.compile(r"(세요|마세요|보세요|좋습니다|좋아요|필요합니다|필요해요|주의|잊지)[.!~]*$")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?…~])\s+|\n+")
+
+MAX_SENTENCES_PER_SECTION = 2
+
+# 섹션별 문장 틀 (날짜와 별자리로 고름)
+TEMPLATES: Dict[str, List[str]] = {
+    "overview": [
+        "오늘은 {zodiac}의 {nature} 면이 자연스럽게 드러나는 하루입니다.",
+        "{weekday}의 흐름은 {zodiac}에게 차분하지만 의미 있는 변화를 가져다줍니다.",
+        "작은 선택이 큰 흐름을 만드는 날이니 {nature} {zodiac}다운 판단을 믿어보세요.",
+        "{zodiac}에게 오늘은 그동안 쌓아온 것들이 조금씩 빛을 보는 날입니다.",
+        "서두르기보다 주변을 살피면 {zodiac}에게 필요한 기회가 눈에 들어옵니다.",
+    ],
+    "love": [
+        "가까운 사람에게 먼저 안부를 건네면 관계가 한층 따뜻해집니다.",
+        "진솔한 대화 한 번이 오해를 풀고 마음의 거리를 좁혀줄 거예요.",
+        "{zodiac}의 {nature} 매력이 사람들의 눈길을 끄는 날입니다.",
+        "상대의 이야기에 귀를 기울이면 생각보다 깊은 유대감을 느낄 수 있어요.",
+        "오래 연락하지 못한 사람에게서 반가운 소식이 올 수 있습니다.",
+    ],
+    "career": [
+        "우선순위를 정리하고 하나씩 끝내 나가면 성과가 눈에 보입니다.",
+        "{nature} {zodiac}의 장점을 살려 맡은 일에 집중해보세요.",
+        "계획에 없던 지출은 한 번 더 생각해보는 것이 좋겠습니다.",
+        "{weekday}에는 새로운 아이디어를 메모해두면 뒤에 큰 도움이 됩니다.",
+        "협업에서 먼저 손을 내밀면 일의 흐름이 한결 매끄러워집니다.",
+    ],
+    "health": [
+        "충분한 수분 섭취와 가벼운 스트레칭으로 컨디션을 챙겨보세요.",
+        "잠들기 전 휴대폰을 내려놓으면 한결 개운한 아침을 맞을 수 있어요.",
+        "짧은 산책으로 머리를 식히면 오후의 집중력이 살아납니다.",
+        "무리한 일정보다는 몸의 신호에 귀를 기울이는 것이 좋습니다.",
+        "규칙적인 식사가 오늘 {zodiac}의 에너지를 지켜줍니다.",
+    ],
+    "advice": [
+        "작은 변화라도 긍정적으로 받아들이면 하루의 결이 달라집니다.",
+        "{zodiac}의 {nature} 면을 자신 있게 표현해보세요.",
+        "완벽함보다 꾸준함을 택하면 원하는 방향에 더 빨리 닿을 수 있어요.",
+        "오늘 고마운 사람 한 명에게 마음을 전해보세요.",
+        "결정이 망설여질 때는 처음 떠오른 생각을 믿어보세요.",
+    ],
+}
+
+_WEEKDAYS = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+
+
+def split_sentences(text: str, zodiac: Optional[str] = None) -> List[str]:
+    """운세 텍스트를 문장 목록으로 나눕니다 (섹션 앞의 별자리 이름은 제거)."""
+    text = text.strip()
+    if zodiac and text.startswith(zodiac):
+        text = text[len(zodiac):].lstrip(" :：-\n")
+    return [sentence.strip() for sentence in _SENTENCE_SPLIT.split(text) if len(sentence.strip()) >= 4]
+
+
+def classify_sentence(sentence: str) -> str:
+    """문장을 love / career / health / advice / overview 중 하나로 분류합니다."""
+    best, best_score = None, 0
+    for section, pattern in _SECTION_PATTERNS.items():
+        score = len(pattern.findall(sentence))
+        if score > best_score:
+            best, best_score = section, score
+    if best is not None:
+        return best
+    return "advice" if _ADVICE_PATTERN.search(sentence) else "overview"
+
+
+def classify(text: str, zodiac: Optional[str] = None) -> Dict[str, List[str]]:
+    """문장을 섹션별로 모읍니다 (원문 순서 유지)."""
+    sections: Dict[str, List[str]] = {section: [] for section in TEMPLATES}
+    for sentence in split_sentences(text, zodiac):
+        sections[classify_sentence(sentence)].append(sentence)
+    return sections
+
+
+def _rng(date: datetime.date, zodiac: str, section: str) -> random.Random:
+    # hash()는 프로세스마다 달라지므로 같은 날 같은 별자리는 항상 같은 결과가 나오도록 crc32 사용
+    return random.Random(zlib.crc32(f"{date.isoformat()}|{zodiac}|{section}".encode("utf-8")))
+
+
+def _overview_sentences(sentences: List[str], sections: Dict[str, List[str]]) -> List[str]:
+    """
+    전체 운세 문장과, 다른 섹션에 자리가 없어 쓰이지 않은 원문 문장 (원문 순서 유지)
+
+    섹션마다 MAX_SENTENCES_PER_SECTION개까지만 쓰므로 남는 문장을 전체 운세에 두어 원문이 빠지지 않게 합니다.
+    """
+    used: List[str] = []
+    for section, section_sentences in sections.items():
+        if section != "overview":
+            used.extend(section_sentences[:MAX_SENTENCES_PER_SECTION])
+    unused = []
+    for sentence in sentences:
+        if sentence in used:
+            used.remove(sentence)
+        else:
+            unused.append(sentence)
+    return unused
+
+
+def _section_text(section: str, sentences: List[str], date: datetime.date, zodiac: str, values: Dict[str, str],
+                  limit: Optional[int] = MAX_SENTENCES_PER_SECTION) -> str:
+    """원문 문장을 앞에 두고(limit개까지, None이면 모두), 부족하면 문장 틀로 채워 두 문장 이상으로 만듭니다."""
+    picked = sentences[:limit]
+    templates = _rng(date, zodiac, section).sample(TEMPLATES[section], 2)
+    filler = [template.format(**values) for template in templates[:max(1, 2 - len(picked))]]
+    return " ".join(picked + filler)
+
+
+def generate_summary(content: str, zodiac: str, date: datetime.date) -> str:
+    """
+    스크래핑한 운세로 종합 운세를 만듭니다 (네트워크 없음).
+
+    Args:
+        content: 마리끌레어 운세 원문 (없으면 빈 문자열)
+        zodiac: 별자리 이름
+        date: 선택된 날짜
+
+    Returns:
+        LLM 종합 운세와 같은 섹션 구성의 마크다운 텍스트
+    """
+    traits = ZODIAC_TRAITS.get(zodiac, DEFAULT_TRAITS)
+    values = {"zodiac": zodiac, "nature": traits["성향"], "weekday": _WEEKDAYS[date.weekday()]}
+    sentences = split_sentences(content or "", zodiac)
+    sections = classify(content or "", zodiac)
+    lucky_number = _rng(date, zodiac, "lucky").randint(1, 45)
+
+    summary_parts = [
+        f"# 📅 {date.strftime('%Y년 %m월 %d일')} {zodiac} 종합 운세",
+        "",
+        "## 🌟 전체 운세",
+        _section_text("overview", _overview_sentences(sentences, sections), date, zodiac, values, limit=None),
+        "",
+        "## 💕 사랑/인간관계",
+        _section_text("love", sections["love"], date, zodiac, values),
+        "",
+        "## 💼 직업/재정",
+        _section_text("career", sections["career"], date, zodiac, values),
+        "",
+        "## 🌿 건강/라이프스타일",
+        _section_text("health", sections["health"], date, zodiac, values),
+        "",
+        "## ✨ 럭키 아이템/컬러",
+        f"**럭키 컬러**: {traits['럭키컬러']}  ",
+        f"**럭키 아이템**: {traits['럭키아이템']}  ",
+        f"**럭키 넘버**: {lucky_number}  ",
+        f"{traits['럭키컬러']} 계열의 소품을 지니거나 의상에 포인트로 활용하면 긍정적인 에너지를 받을 수 있어요.",
+        "",
+        "## 💡 오늘의 조언",
+        _section_text("advice", sections["advice"], date, zodiac, values) + " ⭐",
+    ]
+    return "\n".join(summary_parts)
@@ -1,12 +1,25 @@
 import streamlit as st
 import datetime
-from scraper import HoroscopeScraper
-from claude_api import ClaudeAPI
+import logging
 import os
-from dotenv import load_dotenv
+import re
+import time
+from typing import TYPE_CHECKING
+from metrics import FALLBACKS, start_exporter
+from startup import lazy_import, load_env, measure_render, preload
 
-# 환경 변수 로드
-load_dotenv()
+if TYPE_CHECKING:
+    from service import HoroscopeService
+
+# 환경 변수 로드 (프로세스당 한 번, 설정을 읽는 모듈보다 먼저)
+load_env()
+
+# 로그 수준은 LOG_LEVEL로 지정 (기본값 WARNING: 디버그 로그는 포맷팅 비용 없이 무시)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper(),
+                    format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+# METRICS_PORT / METRICS_FILE이 설정되어 있으면 지표 노출 시작 (프로세스당 한 번)
+start_exporter()
 
 # 페이지 설정
 st.set_page_config(
@@ -69,6 +82,8 @@ ZODIAC_SIGNS = {
     "염소자리": "capricorn"
 }
 
+ALL_ZODIACS_LABEL = "전체"
+
 def main():
     st.markdown('<h1 class="main-header">⭐ 별자리 운세 종합 보기 ⭐</h1>', unsafe_allow_html=True)
     
@@ -94,11 +109,38 @@ def main():
         # 별자리 보기 버튼
         if st.button("🔮 별자리 보기", type="primary"):
             st.session_state.show_horoscope = True
+            st.session_state.show_all_signs = False
+            st.session_state.show_search = False
             st.session_state.selected_date = selected_date
             st.session_state.selected_zodiac = selected_zodiac
+        
+        # 12개 별자리 한눈에 보기 버튼 (선택한 날짜 기준)
+        if st.button("🌌 12개 별자리 한눈에 보기"):
+            st.session_state.show_all_signs = True
+            st.session_state.show_horoscope = False
+            st.session_state.show_search = False
+            st.session_state.selected_date = selected_date
+        
+        # 지난 운세 검색 (저장된 월별 운세에서 검색, 네트워크 요청 없음)
+        st.header("지난 운세 검색")
+        search_query = st.text_input("검색어", placeholder="예: 금전")
+        search_zodiac = st.selectbox(
+            "검색할 별자리",
+            [ALL_ZODIACS_LABEL] + list(ZODIAC_SIGNS.keys())
+        )
+        if st.button("🔎 검색") and search_query.strip():
+            st.session_state.show_search = True
+            st.session_state.show_horoscope = False
+            st.session_state.show_all_signs = False
+            st.session_state.search_query = search_query.strip()
+            st.session_state.search_zodiac = None if search_zodiac == ALL_ZODIACS_LABEL else search_zodiac
     
     # 메인 컨텐츠
-    if hasattr(st.session_state, 'show_horoscope') and st.session_state.show_horoscope:
+    if st.session_state.get('show_search'):
+        show_search_results()
+    elif st.session_state.get('show_all_signs'):
+        show_all_signs()
+    elif hasattr(st.session_state, 'show_horoscope') and st.session_state.show_horoscope:
         show_horoscope_results()
     else:
         st.info("왼쪽 사이드바에서 날짜와 별자리를 선택하고 '별자리 보기' 버튼을 클릭하세요.")
@@ -110,69 +152,218 @@ def main():
         2. **별자리 선택**: 12개 별자리 중 하나를 선택하세요
         3. **별자리 보기**: 버튼을 클릭하면 3개 사이트에서 운세를 가져옵니다
         4. **종합 요약**: Claude AI가 3개 사이트의 운세를 종합해서 요약해드립니다
+        5. **12개 별자리 한눈에 보기**: 선택한 날짜의 모든 별자리 운세를 비교할 수 있습니다
+        6. **지난 운세 검색**: 저장된 월별 운세에서 검색어가 들어간 달을 찾아줍니다
         
         ### 🌟 지원 사이트
         - **마리끌레어 코리아**: 상세한 월별 운세 정보
         - **Claude AI 종합 요약**: 마리끌레어 운세와 AI가 생성한 추가 운세를 종합한 완성된 운세
         """)
 
+# 세션 간 공유하는 완성된 결과 캐시 (별자리 12개 x 약 한 달)
+RESULT_CACHE_TTL = 10 * 60  # 초
+RESULT_CACHE_ENTRIES = 12 * 31
+
+# 스크래퍼 / Claude 클라이언트(requests, bs4 등)는 첫 화면을 그린 뒤에 불러옴
+SERVICE_MODULES = ["service", "scheduler"]
+
+def start_scheduler() -> None:
+    """오늘 / 내일 운세를 미리 생성하는 스케줄러 시작 (HOROSCOPE_SCHEDULER=1일 때, 프로세스당 한 번)"""
+    lazy_import("scheduler").start_default_scheduler()
+
+@st.cache_resource(show_spinner=False)
+def get_service() -> "HoroscopeService":
+    """모든 세션과 재실행이 공유하는 서비스 (스크래퍼 / Claude 클라이언트 / 연결 풀 포함)"""
+    service = lazy_import("service").get_default_service()
+    start_scheduler()
+    return service
+
+@st.cache_resource(show_spinner=False)
+def get_archive():
+    """모든 세션이 공유하는 지난 운세 검색 색인"""
+    return lazy_import("archive").get_default_archive()
+
+class _ResultNotCacheable(Exception):
+    """세션 간 캐시에 넣지 않을 결과 (없음 / 새로 고침 중 / 기본 요약)"""
+    def __init__(self, entry):
+        super().__init__("result not cacheable")
+        self.entry = entry
+
+@st.cache_data(ttl=RESULT_CACHE_TTL, max_entries=RESULT_CACHE_ENTRIES, show_spinner=False)
+def load_result(date: datetime.date, zodiac: str) -> dict:
+    """
+    (날짜, 별자리)별 완성된 결과를 모든 세션에서 공유합니다.
+    
+    새로 고침 중이거나 기본 요약으로 대신한 결과는 예외로 넘겨 캐시하지 않으므로
+    백그라운드 생성이 끝나면 다음 요청부터 바로 반영됩니다.
+    """
+    from service import SUMMARY_SOURCE_FALLBACK
+    
+    entry = get_service().lookup(date, zodiac)
+    if entry is None or entry["stale"] or entry["summary_source"] == SUMMARY_SOURCE_FALLBACK:
+        raise _ResultNotCacheable(entry)
+    return entry
+
+def render_stream(chunks) -> str:
+    """텍스트 조각을 받는 대로 화면에 이어 붙여 표시하고 전체 텍스트를 반환합니다."""
+    if hasattr(st, "write_stream"):
+        return st.write_stream(chunks)
+    
+    # st.write_stream이 없는 이전 버전의 Streamlit
+    placeholder = st.empty()
+    text = ""
+    for chunk in chunks:
+        text += chunk
+        placeholder.markdown(text)
+    return text
+
+def render_marie_claire(marie_result: str) -> None:
+    st.markdown('<div class="site-section">', unsafe_allow_html=True)
+    st.markdown('<div class="site-title">🌸 마리끌레어 코리아</div>', unsafe_allow_html=True)
+    if marie_result:
+        st.write(marie_result)
+    else:
+        st.error("운세 정보를 가져올 수 없습니다.")
+    st.markdown('</div>', unsafe_allow_html=True)
+
 def show_horoscope_results():
     date = st.session_state.selected_date
     zodiac = st.session_state.selected_zodiac
     
     st.markdown(f"### 📅 {date.strftime('%Y년 %m월 %d일')} - {zodiac} 운세")
     
-    # 로딩 상태 표시
-    with st.spinner("운세 정보를 가져오는 중입니다..."):
-        scraper = HoroscopeScraper()
-        
-        # 마리끌레어에서만 운세 가져오기
-        horoscope_data = []
-        
-        st.markdown('<div class="site-section">', unsafe_allow_html=True)
-        st.markdown('<div class="site-title">🌸 마리끌레어 코리아</div>', unsafe_allow_html=True)
-        try:
-            marie_result = scraper.get_marie_claire_horoscope(date, zodiac)
-            if marie_result:
-                st.write(marie_result)
-                horoscope_data.append(("마리끌레어 코리아", marie_result))
+    # 이미 생성된 결과는 (새로 고칠 시점이 지났더라도) 바로 표시하고 백그라운드에서 갱신
+    service = get_service()
+    from claude_api import StreamIncompleteError
+    from local_summary import generate_summary
+    from service import SUMMARY_SOURCE_FALLBACK
+    
+    try:
+        entry = load_result(date, zodiac)
+    except _ResultNotCacheable as e:
+        entry = e.entry
+    if entry is not None:
+        render_marie_claire(entry["marie_claire"])
+        st.markdown('<div class="summary-section">', unsafe_allow_html=True)
+        st.markdown('<div class="summary-title">🤖 AI 종합 요약</div>', unsafe_allow_html=True)
+        if entry["summary_source"] == SUMMARY_SOURCE_FALLBACK:
+            if service.claude_api.api_key:
+                st.info("AI 종합 운세를 준비하는 중입니다. 기본 요약을 먼저 보여드립니다.")
             else:
-                st.error("운세 정보를 가져올 수 없습니다.")
-        except Exception as e:
-            st.error(f"오류가 발생했습니다: {str(e)}")
+                st.warning("Claude API를 사용할 수 없습니다. 기본 요약을 제공합니다.")
+        st.write(entry["summary"])
         st.markdown('</div>', unsafe_allow_html=True)
+        return
+    
+    # 결과가 없을 때만 마감 시간 안에서 스크래핑과 생성을 기다림
+    with st.spinner("운세 정보를 가져오는 중입니다..."):
+        marie_result = service.get_marie_claire(date, zodiac)
+    render_marie_claire(marie_result)
     
     # Claude API를 통한 종합 요약
-    if horoscope_data:
+    if marie_result:
         st.markdown('<div class="summary-section">', unsafe_allow_html=True)
         st.markdown('<div class="summary-title">🤖 AI 종합 요약</div>', unsafe_allow_html=True)
         
-        with st.spinner("Claude AI가 마리끌레어 운세와 추가 운세를 종합하여 완성된 운세를 생성하는 중입니다..."):
-            claude_api = ClaudeAPI()
+        if service.claude_api.api_key:
+            # 로컬 요약을 먼저 그려두고, AI 종합 운세가 도착하면 같은 자리에 이어서 표시
+            notice = st.empty()
+            placeholder = st.empty()
+            local_summary = generate_summary(marie_result, zodiac, date)
+            placeholder.markdown(local_summary)
             try:
-                # 마리끌레어 데이터와 AI 추가 운세를 종합
-                summary = claude_api.get_comprehensive_summary(horoscope_data, zodiac, date)
-                if summary and "API 키가 설정되지 않았습니다" not in summary:
-                    st.write(summary)
+                # 첫 조각이 마감 안에 오지 않거나 생성 작업이 밀려 있으면 로컬 요약을 그대로 둠
+                stream = service.stream_summary(date, zodiac, marie_result)
+                if stream is not None:
+                    with placeholder.container():
+                        render_stream(stream)
                 else:
-                    # Claude API가 없을 때 대체 요약 사용
-                    st.warning("Claude API를 사용할 수 없습니다. 기본 요약을 제공합니다.")
-                    from claude_api import create_comprehensive_summary
-                    simple_summary = create_comprehensive_summary(horoscope_data, zodiac, date)
-                    st.write(simple_summary)
+                    notice.info("AI 종합 운세를 준비하는 중입니다. 기본 요약을 먼저 보여드립니다.")
+            except StreamIncompleteError:
+                # 중간에 끊긴 부분 결과 대신 기본 요약을 다시 표시
+                FALLBACKS.inc(kind="summary")
+                notice.info("AI 종합 운세 생성이 중단되어 기본 요약을 보여드립니다.")
+                placeholder.markdown(local_summary)
             except Exception as e:
-                st.error(f"요약 생성 중 오류가 발생했습니다: {str(e)}")
+                notice.error(f"요약 생성 중 오류가 발생했습니다: {str(e)}")
                 # 오류 시에도 기본 요약 제공
-                try:
-                    from claude_api import create_comprehensive_summary
-                    simple_summary = create_comprehensive_summary(horoscope_data, zodiac, date)
-                    st.write(simple_summary)
-                except Exception as e2:
-                    st.error(f"기본 요약 생성도 실패했습니다: {str(e2)}")
+                FALLBACKS.inc(kind="summary")
+                placeholder.markdown(local_summary)
+        else:
+            # Claude API가 없을 때 대체 요약 사용
+            st.warning("Claude API를 사용할 수 없습니다. 기본 요약을 제공합니다.")
+            entry = service.remember(date, zodiac, marie_result, None)
+            st.write(entry["summary"])
         
         st.markdown('</div>', unsafe_allow_html=True)
     else:
         st.error("운세 정보를 가져오지 못했습니다. 나중에 다시 시도해주세요.")
 
+ALL_SIGNS_COLUMNS = 3
+
+def show_all_signs():
+    """12개 별자리 운세를 한 화면에 표시합니다 (월별 페이지 한 번 파싱, 종합 운세는 끝나는 대로 표시)."""
+    date = st.session_state.selected_date
+    zodiacs = list(ZODIAC_SIGNS.keys())
+    
+    st.markdown(f"### 📅 {date.strftime('%Y년 %m월 %d일')} - 12개 별자리 운세")
+    
+    service = get_service()
+    from service import SUMMARY_SOURCE_FALLBACK
+    
+    with st.spinner("운세 정보를 가져오는 중입니다..."):
+        sections = service.get_marie_claire_all(date, zodiacs)
+    
+    # 마리끌레어 운세는 바로 표시하고, 종합 운세 자리는 비워둠
+    placeholders = {}
+    columns = st.columns(ALL_SIGNS_COLUMNS)
+    for index, zodiac in enumerate(zodiacs):
+        with columns[index % ALL_SIGNS_COLUMNS]:
+            st.markdown(f"#### {zodiac}")
+            st.write(sections[zodiac])
+            placeholders[zodiac] = st.empty()
+            placeholders[zodiac].caption("🤖 AI 종합 운세를 준비하는 중입니다...")
+    
+    # 종합 운세는 저장소 / 캐시에 있으면 바로, 없으면 제한된 동시 생성으로 끝나는 대로 표시
+    progress = st.progress(0.0)
+    for done, entry in enumerate(service.iter_horoscopes(date, zodiacs), start=1):
+        with placeholders[entry["zodiac"]].container():
+            with st.expander("🤖 AI 종합 운세"):
+                st.markdown(entry["summary"])
+            if entry["summary_source"] == SUMMARY_SOURCE_FALLBACK and service.claude_api.api_key:
+                st.caption("AI 종합 운세를 준비하는 중이라 기본 요약을 먼저 보여드립니다.")
+        progress.progress(done / len(zodiacs))
+    progress.empty()
+
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_{}\[\]()#+\-.!|<>~$])")
+
+def escape_markdown(text: str) -> str:
+    """사용자 입력 / 스크래핑한 텍스트를 st.markdown에 그대로 표시되도록 마크다운 기호를 이스케이프합니다."""
+    return _MARKDOWN_SPECIAL.sub(r"\\\1", text)
+
+def show_search_results():
+    """저장된 월별 운세에서 검색어가 들어간 섹션을 최신 달부터 표시합니다."""
+    query = st.session_state.search_query
+    zodiac = st.session_state.get('search_zodiac')
+    
+    st.markdown(f"### 🔎 '{escape_markdown(query)}' 검색 결과" + (f" - {zodiac}" if zodiac else ""))
+    
+    started = time.perf_counter()
+    results = get_archive().search(query, zodiac=zodiac)
+    elapsed = (time.perf_counter() - started) * 1000
+    
+    if not results:
+        st.info("검색 결과가 없습니다. 저장된 달에서만 검색하므로 `python archive.py backfill`로 지난 운세를 먼저 모아주세요.")
+        return
+    
+    st.caption(f"{len(results)}건 ({elapsed:.0f}ms)")
+    for result in results:
+        period = datetime.datetime.strptime(result["period"], "%Y-%m").strftime("%Y년 %m월")
+        st.markdown(f"**{period} · {result['zodiac']}** ({result['matches']}회)")
+        st.markdown(escape_markdown(result["snippet"]))
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    with measure_render():
+        main()
+    # 첫 버튼 클릭에서 모듈 로드를 기다리지 않도록 백그라운드에서 미리 불러옴
+    preload(SERVICE_MODULES, on_loaded=start_scheduler)
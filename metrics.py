@@ -0,0 +1,253 @@
+"""
+스크래핑 / 종합 운세 경로 계측
+
+단계별 소요 시간 히스토그램과 캐시 적중, 샘플 데이터 대체, API 오류, 토큰 사용량 카운터를
+프로세스 메모리에 모으고 Prometheus 텍스트 형식으로 내보냅니다.
+
+    METRICS_PORT=9100  -> http://localhost:9100/metrics 로 노출
+    METRICS_FILE=metrics.prom -> METRICS_FILE_INTERVAL초마다 파일로 기록
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 초 단위 히스토그램 구간 (HTML 파싱 같은 밀리초 단위부터 LLM 호출까지)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+DEFAULT_METRICS_FILE_INTERVAL = 15.0
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    escaped = [(name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for name, value in items]
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Counter:
+    """레이블별 누적 카운터"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def total(self, **labels) -> float:
+        """주어진 레이블을 모두 포함하는 값의 합계 (레이블이 없으면 전체 합계)"""
+        wanted = set(_label_key(labels))
+        with self._lock:
+            return sum(value for key, value in self._values.items() if wanted.issubset(key))
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(key)} {value:g}"
+
+
+class Histogram:
+    """레이블별 누적 구간 히스토그램"""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelKey, list] = {}  # key -> [구간별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록의 소요 시간을 기록합니다 (예외가 나도 기록)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(_label_key(labels))
+            return state[-1] if state else 0
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in items:
+            for bound, bucket_count in zip(self.buckets, state):
+                yield f"{self.name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {bucket_count}"
+            yield f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {state[-1]}"
+            yield f"{self.name}_sum{_format_labels(key)} {state[-2]:g}"
+            yield f"{self.name}_count{_format_labels(key)} {state[-1]}"
+
+
+class MetricsRegistry:
+    """이름으로 지표를 등록하고 한 번에 내보내는 저장소"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name: str, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(name, lambda: Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(name, lambda: Histogram(name, help_text, buckets))
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식(0.0.4)으로 모든 지표를 반환합니다."""
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# 단계: fetch, parse, segment, clean_text, prompt_build, llm_call, fallback_summary
+STAGE_SECONDS = REGISTRY.histogram("horoscope_stage_seconds", "단계별 소요 시간(초)")
+CACHE_HITS = REGISTRY.counter("horoscope_cache_hits_total", "캐시 적중 수 (cache=page|page_revalidated|page_stale|http_not_modified|store|summary|summary_store|result)")
+CACHE_MISSES = REGISTRY.counter("horoscope_cache_misses_total", "캐시 미스 수")
+FALLBACKS = REGISTRY.counter("horoscope_fallbacks_total", "샘플 데이터 / 기본 요약 대체 수 (kind=sample|summary|deadline|shed)")
+API_ERRORS = REGISTRY.counter("claude_api_errors_total", "Claude API 오류 수 (reason=상태 코드|network|format|stream)")
+API_RETRIES = REGISTRY.counter("claude_api_retries_total", "429/5xx 응답 / 연결 실패로 재시도한 수 (reason=상태 코드|network)")
+CIRCUIT_TRANSITIONS = REGISTRY.counter("upstream_circuit_transitions_total", "호스트별 회로 차단기 상태 전환 수 (state=open|half_open|closed)")
+CIRCUIT_SHORT_CIRCUITS = REGISTRY.counter("upstream_short_circuits_total", "회로 차단기가 열려 보내지 않은 요청 수")
+PATTERN_MATCHES = REGISTRY.counter("horoscope_segment_pattern_total", "섹션 분할에서 채택된 패턴 수 (pattern=pattern1|pattern2|pattern3|none)")
+TOKENS = REGISTRY.counter("claude_tokens_total", "Claude API 토큰 사용량 (type=input|output|cache_creation_input|cache_read_input)")
+PREWARMS = REGISTRY.counter("horoscope_prewarm_total", "스케줄러가 미리 생성을 예약한 별자리 수")
+MONTH_PROBES = REGISTRY.counter("horoscope_month_probes_total", "월별 페이지 게시 확인 수 (result=found|missing)")
+
+
+def timer(stage: str, **labels):
+    """단계별 소요 시간을 horoscope_stage_seconds에 기록하는 컨텍스트 매니저"""
+    return STAGE_SECONDS.time(stage=stage, **labels)
+
+
+def render_prometheus() -> str:
+    return REGISTRY.render()
+
+
+def write_metrics_file(path: Optional[str] = None) -> Optional[str]:
+    """지표를 파일로 기록합니다 (node_exporter textfile 수집기 형식). 경로가 없으면 기록하지 않습니다."""
+    path = path or os.getenv("METRICS_FILE")
+    if not path:
+        return None
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp_path, path)  # 수집기가 쓰는 도중의 파일을 읽지 않도록 교체
+    return path
+
+
+def _serve_metrics(port: int) -> None:
+    # http.server는 불러오는 비용이 커서 엔드포인트를 열 때만 불러옴
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            logger.debug("metrics " + format, *args)
+
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+
+
+_exporter_lock = threading.Lock()
+_exporter_started = False
+
+
+def start_exporter(port: Optional[int] = None, path: Optional[str] = None) -> None:
+    """
+    METRICS_PORT / METRICS_FILE 설정에 따라 지표 노출을 시작합니다 (프로세스당 한 번).
+
+    Args:
+        port: /metrics HTTP 엔드포인트 포트. None이면 METRICS_PORT 환경 변수
+        path: 주기적으로 기록할 파일 경로. None이면 METRICS_FILE 환경 변수
+    """
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+
+    port = port if port is not None else int(os.getenv("METRICS_PORT", "0") or 0)
+    if port:
+        try:
+            _serve_metrics(port)
+            logger.info("지표 엔드포인트 시작: http://localhost:%d/metrics", port)
+        except OSError as e:
+            logger.warning("지표 엔드포인트를 시작할 수 없습니다 (포트 %d): %s", port, e)
+
+    path = path or os.getenv("METRICS_FILE")
+    if path:
+        interval = float(os.getenv("METRICS_FILE_INTERVAL", DEFAULT_METRICS_FILE_INTERVAL))
+
+        def write_periodically():
+            while True:
+                try:
+                    write_metrics_file(path)
+                except OSError as e:
+                    logger.warning("지표 파일 기록 실패: %s", e)
+                time.sleep(interval)
+        threading.Thread(target=write_periodically, name="metrics-file", daemon=True).start()
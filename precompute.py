@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+별자리 운세 일괄 사전 생성 스크립트
+
+지정한 기간의 모든 별자리 운세를 미리 스크래핑하고 Claude AI 종합 운세를 생성하여
+디스크 저장소에 기록합니다. 이미 저장된 항목은 건너뛰므로 중단 후 다시 실행하면
+이어서 진행됩니다.
+
+사용 예:
+    python precompute.py --start 2025-07-01 --days 7 --workers 4
+    python precompute.py --start 2025-07-01 --days 30 --batch
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+import os
+import sys
+import time
+from typing import Dict, List
+
+from startup import load_env
+
+# 환경 변수 로드 (설정을 읽는 모듈보다 먼저, import 시점에 한 번)
+load_env()
+
+from scraper import HoroscopeScraper  # noqa: E402
+from claude_api import ClaudeAPI  # noqa: E402
+from claude_async import AsyncClaudeAPI  # noqa: E402
+from metrics import write_metrics_file  # noqa: E402
+from store import HoroscopeStore, get_default_store, day_key, month_key  # noqa: E402
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="별자리 운세 일괄 사전 생성")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        help="시작 날짜 (YYYY-MM-DD, 기본값: 오늘)")
+    parser.add_argument("--days", type=int, default=2, help="생성할 일수 (기본값: 2)")
+    parser.add_argument("--signs", nargs="*", help="생성할 별자리 (기본값: 12개 전체)")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 실행할 Claude API 호출 수 (기본값: 4)")
+    parser.add_argument("--batch", action="store_true", help="Message Batches API로 일괄 제출 (결과까지 수 분~수 시간 소요될 수 있음)")
+    parser.add_argument("--db", help="저장소 경로 (기본값: HOROSCOPE_DB_PATH 또는 horoscope_cache.db)")
+    return parser.parse_args(argv)
+
+
+def load_month_sections(scraper: HoroscopeScraper, dates: List[datetime.date]) -> Dict[str, Dict[str, str]]:
+    """기간에 포함된 월별 페이지를 한 번씩만 가져와 파싱합니다."""
+    month_sections = {}
+    for date in dates:
+        key = month_key(date)
+        if key in month_sections:
+            continue
+        try:
+            month_sections[key] = scraper.get_marie_claire_sections(date)
+            print(f"📖 {key} 마리끌레어 페이지: {len(month_sections[key])}개 별자리 파싱")
+        except Exception as e:
+            print(f"⚠️  {key} 마리끌레어 페이지를 가져오지 못했습니다: {e}")
+            month_sections[key] = {}
+    return month_sections
+
+
+def precompute(start: datetime.date, days: int, signs: List[str], workers: int, store: HoroscopeStore, use_batch: bool = False) -> bool:
+    """
+    기간 내 모든 (날짜, 별자리) 조합의 종합 운세를 생성해 저장소에 기록합니다.
+
+    월별 페이지에서 운세를 파싱하지 못한 (날짜, 별자리)는 샘플 운세로 생성하지 않고
+    보류로 남겨, 페이지가 올라온 뒤 다시 실행하면 생성됩니다.
+
+    Returns:
+        모든 항목이 저장되었으면 True (보류나 실패가 있으면 False)
+    """
+    scraper = HoroscopeScraper(store=store)
+    claude_api = ClaudeAPI(store=store)
+
+    if not claude_api.api_key:
+        print("❌ Claude API 키가 설정되지 않았습니다. .env 파일을 확인해주세요.")
+        return False
+
+    dates = [start + datetime.timedelta(days=i) for i in range(days)]
+    month_sections = load_month_sections(scraper, dates)
+
+    def marie_claire_data(date: datetime.date, zodiac: str):
+        return [("마리끌레어 코리아", month_sections[month_key(date)][zodiac])]
+
+    def is_stored(date: datetime.date, zodiac: str) -> bool:
+        # 같은 마리끌레어 운세로 생성한 종합 운세만 저장된 것으로 봄
+        key = claude_api.summary_key(marie_claire_data(date, zodiac), zodiac, date)
+        return store.get_summary("claude", day_key(date), zodiac, key) is not None
+
+    # 월별 페이지에서 파싱하지 못한 항목은 보류, 이미 저장된 항목은 건너뜀 (중단 후 재실행 시 이어서 진행)
+    waiting = {(date, zodiac) for date in dates for zodiac in signs if not month_sections[month_key(date)].get(zodiac)}
+    pending = [
+        (date, zodiac)
+        for date in dates
+        for zodiac in signs
+        if (date, zodiac) not in waiting and not is_stored(date, zodiac)
+    ]
+    total = len(dates) * len(signs)
+    print(f"🔮 전체 {total}개 중 {total - len(pending) - len(waiting)}개는 이미 생성됨, {len(pending)}개 생성 시작")
+    if waiting:
+        print(f"⏸️  {len(waiting)}개는 마리끌레어 운세가 아직 없어 보류합니다 (페이지가 올라온 뒤 다시 실행하세요)")
+
+    started = time.monotonic()
+    failed = 0
+
+    if use_batch:
+        # Message Batches API로 한 번에 제출 (사용할 수 없으면 동시 호출로 대체)
+        summary_requests = [(marie_claire_data(date, zodiac), zodiac, date) for date, zodiac in pending]
+        results = claude_api.get_comprehensive_summaries(summary_requests, max_workers=workers)
+        for done, result in enumerate(results, 1):
+            ok = result["summary"] is not None
+            if not ok:
+                failed += 1
+                print(f"   오류: {result['error']}")
+            print(f"[{done}/{len(pending)}] {result['date']} {result['zodiac']} {'✅' if ok else '❌'}")
+        print(f"⏱️  {time.monotonic() - started:.1f}초 소요")
+        print(f"✨ 완료: 성공 {len(pending) - failed}개, 실패 {failed}개, 보류 {len(waiting)}개")
+        return failed == 0 and not waiting
+
+    async def generate_all() -> int:
+        # 비동기 클라이언트로 동시 호출 수(workers)와 분당 요청 / 토큰 제한을 지키며 생성.
+        # 사전 생성은 사용자를 기다리게 하지 않으므로 요청 제한 대기열에서 마감 없이 기다림
+        errors = 0
+        async with AsyncClaudeAPI(store=store, max_concurrency=workers) as async_api:
+            async def generate(date: datetime.date, zodiac: str):
+                await async_api.get_comprehensive_summary(marie_claire_data(date, zodiac), zodiac, date, timeout=float("inf"))
+                # 성공한 결과만 저장소에 기록되므로 저장 여부로 성공을 판단
+                return date, zodiac, is_stored(date, zodiac)
+
+            tasks = [generate(date, zodiac) for date, zodiac in pending]
+            for done, task in enumerate(asyncio.as_completed(tasks), 1):
+                date, zodiac, ok = await task
+                if not ok:
+                    errors += 1
+                elapsed = time.monotonic() - started
+                print(f"[{done}/{len(pending)}] {date} {zodiac} {'✅' if ok else '❌'} ({elapsed:.1f}초 경과)")
+        return errors
+
+    if pending:
+        failed = asyncio.run(generate_all())
+
+    print(f"✨ 완료: 성공 {len(pending) - failed}개, 실패 {failed}개, 보류 {len(waiting)}개")
+    return failed == 0 and not waiting
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    all_signs = list(HoroscopeScraper().zodiac_mapping.keys())
+    signs = args.signs or all_signs
+    unknown = [sign for sign in signs if sign not in all_signs]
+    if unknown:
+        print(f"❌ 알 수 없는 별자리입니다: {', '.join(unknown)}")
+        sys.exit(2)
+    store = HoroscopeStore(args.db) if args.db else get_default_store()
+
+    print("🌟 별자리 운세 사전 생성 🌟")
+    print("=" * 50)
+    ok = precompute(args.start, args.days, signs, max(1, args.workers), store, use_batch=args.batch)
+    metrics_path = write_metrics_file()
+    if metrics_path:
+        print(f"📈 지표 기록: {metrics_path}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
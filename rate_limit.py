@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """호스트별 최소 요청 간격을 보장하는 스레드 안전 레이트 리미터"""
+
+    def __init__(self, min_interval: float = 0.5, per_host: Optional[Dict[str, float]] = None):
+        self.min_interval = min_interval
+        self.per_host = per_host or {}
+        self._next_slot = {}  # host -> 다음 요청 가능 시각 (monotonic)
+        self._lock = threading.Lock()
+
+    def _interval(self, host: str) -> float:
+        return self.per_host.get(host, self.min_interval)
+
+    def acquire(self, url: str, deadline: Optional[float] = None) -> bool:
+        """
+        해당 호스트에 요청을 보낼 차례가 될 때까지 기다립니다.
+
+        Args:
+            url: 요청할 URL
+            deadline: time.monotonic() 기준 마감 시각
+
+        Returns:
+            마감 전에 요청 슬롯을 얻었으면 True, 마감을 넘기게 되면 False
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            if deadline is not None and slot >= deadline:
+                return False
+            self._next_slot[host] = slot + self._interval(host)
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+
+class TokenBucket:
+    """
+    분당 허용량을 기준으로 채워지는 스레드 안전 토큰 버킷
+
+    reserve()는 토큰을 미리 예약하고 기다려야 할 시간을 돌려주므로,
+    호출자는 마감 시간을 넘길 요청을 큐에 넣기 전에 거절할 수 있습니다.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0  # 초당 충전량
+        self.capacity = capacity if capacity is not None else per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float = 1, deadline: Optional[float] = None) -> Optional[float]:
+        """
+        토큰을 예약하고 사용 가능해질 때까지 기다려야 할 시간(초)을 반환합니다.
+
+        Args:
+            amount: 필요한 토큰 수 (버킷 용량보다 크면 용량으로 제한)
+            deadline: time.monotonic() 기준 마감 시각
+
+        Returns:
+            대기 시간(초). 마감 시각까지 토큰을 얻을 수 없으면 예약하지 않고 None
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            amount = min(amount, self.capacity)
+            delay = max(0.0, (amount - self._tokens) / self.rate) if self.rate > 0 else 0.0
+            if deadline is not None and now + delay > deadline:
+                return None
+            self._tokens -= amount
+            return delay
+
+    def refund(self, amount: float) -> None:
+        """사용하지 않은 예약 토큰을 돌려놓습니다."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + min(amount, self.capacity))
@@ -5,22 +5,22 @@
 
 import os
 import sys
-import subprocess
+import time
+from importlib.util import find_spec
+
+# 확인할 패키지의 import 이름
+REQUIRED_PACKAGES = ["streamlit", "requests", "bs4", "dotenv"]
 
 def check_requirements():
-    """필요 패키지가 설치되어 있는지 확인"""
-    try:
-        import streamlit
-        import requests
-        import bs4
-        import dotenv
+    """필요 패키지가 설치되어 있는지 확인 (모듈을 실행하지 않고 설치 여부만 확인)"""
+    missing = [name for name in REQUIRED_PACKAGES if find_spec(name) is None]
+    if not missing:
         print("✅ 모든 필요 패키지가 설치되어 있습니다.")
         return True
-    except ImportError as e:
-        print(f"❌ 필요 패키지가 설치되지 않았습니다: {e}")
-        print("다음 명령어를 실행하여 패키지를 설치하세요:")
-        print("pip install -r requirements.txt")
-        return False
+    print(f"❌ 필요 패키지가 설치되지 않았습니다: {', '.join(missing)}")
+    print("다음 명령어를 실행하여 패키지를 설치하세요:")
+    print("pip install -r requirements.txt")
+    return False
 
 def check_env_file():
     """환경 변수 파일 확인"""
@@ -48,9 +48,13 @@ def main():
     print("종료하려면 Ctrl+C를 누르세요.")
     print("=" * 50)
     
-    # Streamlit 앱 실행
+    # Streamlit 앱 실행 (인터프리터를 새로 띄우지 않고 현재 프로세스에서 실행)
+    started = time.perf_counter()
     try:
-        subprocess.run(["python3", "-m", "streamlit", "run", "main.py"])
+        from streamlit.web import cli as streamlit_cli
+        print(f"⏱️  Streamlit 로드: {(time.perf_counter() - started) * 1000:.0f}ms")
+        sys.argv = ["streamlit", "run", os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")]
+        streamlit_cli.main()
     except KeyboardInterrupt:
         print("\n\n👋 앱이 종료되었습니다.")
     except Exception as e:
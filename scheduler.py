@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+백그라운드 새로 고침 스케줄러
+
+자정이나 월이 바뀐 뒤 첫 사용자가 스크래핑과 종합 운세 생성을 기다리지 않도록
+오늘 / 내일의 12개 별자리 결과를 미리 만들어 둡니다. 마리끌레어의 월별 페이지는 월초 언제
+올라올지 알 수 없으므로, 월말이 가까워지면 다음 달 페이지를 백오프 간격으로 확인하고
+페이지가 올라오면 바로 파싱해 저장합니다.
+
+Claude API를 호출하므로 기본값은 꺼져 있으며, 앱 / API 서버 프로세스 안에서 실행하거나
+(HOROSCOPE_SCHEDULER=1), 같은 저장소를 쓰는 별도 프로세스로 실행할 수 있습니다.
+
+사용 예:
+    python scheduler.py              # 계속 실행
+    python scheduler.py --once       # 한 번만 실행 (cron 등)
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from startup import load_env
+
+# 환경 변수 로드 (설정을 읽는 모듈보다 먼저, import 시점에 한 번)
+load_env()
+
+from metrics import MONTH_PROBES, PREWARMS, write_metrics_file  # noqa: E402
+from segmenter import ZODIAC_ENGLISH  # noqa: E402
+from store import KIND_RAW, month_key  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# 스케줄러 설정 (환경 변수로 변경 가능)
+SCHEDULER_INTERVAL = float(os.getenv("HOROSCOPE_SCHEDULER_INTERVAL", "300"))  # 미리 생성 확인 간격(초)
+PREWARM_DAYS = int(os.getenv("HOROSCOPE_PREWARM_DAYS", "2"))  # 오늘부터 미리 생성할 일수
+BOUNDARY_DAYS = int(os.getenv("HOROSCOPE_BOUNDARY_DAYS", "2"))  # 월말 며칠 전부터 다음 달 페이지를 확인할지
+PROBE_MIN_INTERVAL = float(os.getenv("HOROSCOPE_PROBE_MIN_INTERVAL", "60"))  # 페이지가 없을 때 첫 재확인 간격(초)
+PROBE_MAX_INTERVAL = float(os.getenv("HOROSCOPE_PROBE_MAX_INTERVAL", "1800"))  # 재확인 간격 상한(초)
+
+
+def first_of_next_month(date: datetime.date) -> datetime.date:
+    return (date.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+class RefreshScheduler:
+    """
+    오늘 / 내일 운세를 미리 생성하고 다음 달 페이지 게시를 확인하는 스케줄러
+
+    run_once()가 한 번의 확인이며, start()는 이를 데몬 스레드에서 반복합니다.
+    생성은 서비스의 작업자 풀(동시 실행 수 제한, 같은 항목 중복 제거)에 예약되고
+    결과는 서비스 캐시와 저장소에 기록되므로, 다른 프로세스도 저장소에서 바로 읽습니다.
+    """
+
+    def __init__(self, service, zodiacs: Optional[List[str]] = None,
+                 interval: float = SCHEDULER_INTERVAL,
+                 prewarm_days: int = PREWARM_DAYS,
+                 boundary_days: int = BOUNDARY_DAYS,
+                 clock: Callable[[], datetime.date] = datetime.date.today):
+        self.service = service
+        self.zodiacs = zodiacs or list(ZODIAC_ENGLISH.keys())
+        self.interval = interval
+        self.prewarm_days = prewarm_days
+        self.boundary_days = boundary_days
+        self.clock = clock
+
+        self._available = set()  # 파싱된 섹션을 확인한 기간 키
+        self._probes: Dict[str, List[float]] = {}  # 기간 키 -> [다음 확인 시각(monotonic), 다음 대기 시간]
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self) -> Dict[str, object]:
+        """
+        월별 페이지를 확인하고 오늘부터 prewarm_days일의 결과를 미리 생성합니다.
+
+        Returns:
+            {'months': {기간 키: 페이지 확인 여부}, 'prewarmed': 예약한 별자리 수}
+        """
+        today = self.clock()
+        dates = [today + datetime.timedelta(days=offset) for offset in range(self.prewarm_days)]
+        months = [date.replace(day=1) for date in dates]
+        next_month = first_of_next_month(today)
+        if (next_month - today).days <= self.boundary_days:
+            months.append(next_month)
+
+        available = {}
+        for month in months:
+            key = month_key(month)
+            if key not in available:
+                available[key] = self._ensure_month(month)
+
+        # 월별 페이지가 아직 없는 날짜는 샘플 운세로 생성하지 않도록 건너뜀
+        prewarmed = 0
+        for date in dates:
+            if available[month_key(date)]:
+                prewarmed += self.service.prewarm(date, self.zodiacs)
+        if prewarmed:
+            PREWARMS.inc(prewarmed)
+            logger.info("운세 미리 생성 예약: %d개", prewarmed)
+        return {"months": available, "prewarmed": prewarmed}
+
+    def _ensure_month(self, month: datetime.date) -> bool:
+        """월별 페이지가 저장되어 있거나 지금 확인해 가져왔으면 True (없으면 백오프 후 다시 확인)."""
+        key = month_key(month)
+        if key in self._available:
+            return True
+        store = self.service.store
+        if store is not None and store.get_period(KIND_RAW, "marie_claire", key):
+            self._available.add(key)
+            return True
+
+        probe = self._probes.get(key)
+        now = time.monotonic()
+        if probe is not None and now < probe[0]:
+            return False
+
+        try:
+            sections = self.service.scraper.get_marie_claire_sections(month)
+        except requests.RequestException as e:
+            logger.debug("%s 월별 페이지 확인 실패: %s", key, e)
+            sections = {}
+        if sections:
+            MONTH_PROBES.inc(result="found")
+            logger.info("%s 월별 페이지 확인: %d개 별자리", key, len(sections))
+            self._available.add(key)
+            self._probes.pop(key, None)
+            return True
+
+        MONTH_PROBES.inc(result="missing")
+        delay = probe[1] if probe is not None else PROBE_MIN_INTERVAL
+        self._probes[key] = [now + delay, min(PROBE_MAX_INTERVAL, delay * 2)]
+        logger.info("%s 월별 페이지가 아직 없습니다. %.0f초 후 다시 확인합니다.", key, delay)
+        return False
+
+    def _next_wait(self) -> float:
+        """다음 실행까지 기다릴 시간 (확인 예정인 페이지가 있으면 그 시각에 맞춤)"""
+        now = time.monotonic()
+        waits = [self.interval] + [max(1.0, probe[0] - now) for probe in self._probes.values()]
+        return min(waits)
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.exception("스케줄러 오류: %s", e)
+            self._stop.wait(self._next_wait())
+
+    def start(self) -> "RefreshScheduler":
+        """데몬 스레드에서 스케줄러를 시작합니다 (이미 실행 중이면 무시)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name="horoscope-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def start_default_scheduler() -> Optional[RefreshScheduler]:
+    """
+    HOROSCOPE_SCHEDULER=1이면 기본 서비스로 스케줄러를 시작합니다 (프로세스당 한 번).
+
+    설정은 호출할 때 읽으므로 .env를 모듈 import 뒤에 불러와도 반영됩니다.
+
+    Returns:
+        실행 중인 스케줄러, 꺼져 있으면 None
+    """
+    global _default_scheduler
+    if os.getenv("HOROSCOPE_SCHEDULER", "0") != "1":
+        return None
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            from service import get_default_service
+            _default_scheduler = RefreshScheduler(get_default_service()).start()
+        return _default_scheduler
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="운세 미리 생성 스케줄러")
+    parser.add_argument("--once", action="store_true", help="한 번만 확인하고 생성이 끝나면 종료")
+    parser.add_argument("--interval", type=float, default=SCHEDULER_INTERVAL, help=f"확인 간격(초, 기본값: {SCHEDULER_INTERVAL:g})")
+    parser.add_argument("--days", type=int, default=PREWARM_DAYS, help=f"오늘부터 미리 생성할 일수 (기본값: {PREWARM_DAYS})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    from service import get_default_service
+
+    service = get_default_service()
+    scheduler = RefreshScheduler(service, interval=args.interval, prewarm_days=args.days)
+    if args.once:
+        result = scheduler.run_once()
+        service.shutdown(wait=True)
+        write_metrics_file()
+        print(f"✨ 완료: {result}")
+        return
+
+    logger.info("운세 미리 생성 스케줄러 시작 (간격 %.0f초)", args.interval)
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
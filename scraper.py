@@ -1,34 +1,79 @@
+import os
 import requests
-from bs4 import BeautifulSoup
 import datetime
-import re
+import logging
 import time
-import random
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed, wait
+from typing import Dict, List, Optional, Tuple
+from cache import SingleFlight, TTLCache
+from html_parsing import candidate_texts
+from http_client import ACCEPT_ENCODING, CircuitOpenError, adapt_timeout, get_adaptive_timeout, get_breaker, is_upstream_failure
+from metrics import CACHE_HITS, CACHE_MISSES, CIRCUIT_SHORT_CIRCUITS, FALLBACKS, PATTERN_MATCHES, timer
+from rate_limit import HostRateLimiter
+from segmenter import ZODIAC_ENGLISH, clean_text, default_segmenter
+from store import HoroscopeStore, month_key
+
+logger = logging.getLogger(__name__)
+
+# 마리끌레어 월별 페이지 캐시 설정
+MONTH_PAGE_CACHE_TTL = 6 * 60 * 60  # 6시간마다 재검증
+MONTH_PAGE_CACHE_SIZE = 24  # 최근 24개월분 보관
+
+# 프로세스 전체에서 공유하는 월별 페이지 파싱 결과 캐시 ({url: {sections}})
+_month_page_cache = TTLCache(maxsize=MONTH_PAGE_CACHE_SIZE, ttl=MONTH_PAGE_CACHE_TTL)
+
+# 요청에 실패했거나(오류 / 404 등) 별자리를 하나도 파싱하지 못한 월별 페이지는 잠시 다시 요청하지 않음
+# ({url: {'error': 오류 메시지, 파싱 결과가 비어 있었으면 None}})
+MONTH_PAGE_FAILURE_TTL = 60
+_month_page_failures = TTLCache(maxsize=MONTH_PAGE_CACHE_SIZE, ttl=MONTH_PAGE_FAILURE_TTL)
+
+# 조건부 요청용 URL별 검증자 / 본문 캐시 ({url: {etag, last_modified, body}}, 디스크 저장소 앞단)
+HTTP_CACHE_SIZE = 64
+_http_cache = TTLCache(maxsize=HTTP_CACHE_SIZE, ttl=float("inf"))
+
+# 같은 월별 페이지에 대한 동시 요청을 한 번의 요청 / 파싱으로 합침
+_month_page_flight = SingleFlight()
+
+# 병렬 요청 설정
+FETCH_DEADLINE = 20  # get_all_horoscopes 전체 마감 시간(초)
+HOST_MIN_INTERVAL = 0.5  # 같은 호스트에 대한 최소 요청 간격(초)
+
+# 프로세스 전체에서 공유하는 호스트별 레이트 리미터와 작업 풀
+_host_rate_limiter = HostRateLimiter(min_interval=HOST_MIN_INTERVAL)
+_source_executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix="horoscope-source")
+_mirror_executor = ThreadPoolExecutor(max_workers=12, thread_name_prefix="horoscope-mirror")
 
 class HoroscopeScraper:
-    def __init__(self):
+    def __init__(self, page_cache: Optional[TTLCache] = None, store: Optional[HoroscopeStore] = None, http_cache: Optional[TTLCache] = None,
+                 failure_cache: Optional[TTLCache] = None):
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': ACCEPT_ENCODING
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        self.page_cache = page_cache if page_cache is not None else _month_page_cache
+        self.http_cache = http_cache if http_cache is not None else _http_cache
+        self.failure_cache = failure_cache if failure_cache is not None else _month_page_failures
+        self.rate_limiter = _host_rate_limiter
+        self.store = store
+        self.segmenter = default_segmenter
+        
+        # 사이트 주소 (마리끌레어는 MARIE_CLAIRE_BASE_URL 환경 변수로 변경 가능)
+        self.marie_claire_base_url = os.getenv("MARIE_CLAIRE_BASE_URL", "https://www.marieclairekorea.com").rstrip("/")
+        self.elle_urls = [
+            "https://www.elle.co.kr/horoscope/",
+            "https://www.elle.co.kr/starsigns/",
+            "https://m.elle.co.kr/horoscope/"
+        ]
+        self.singles_urls = [
+            "https://www.singles.co.kr/horoscope/",
+            "https://m.singles.co.kr/horoscope/",
+            "https://singles.co.kr/fortune/"
+        ]
         
         # 별자리 영어 이름 매핑
-        self.zodiac_mapping = {
-            "물병자리": "aquarius",
-            "물고기자리": "pisces",
-            "양자리": "aries",
-            "황소자리": "taurus",
-            "쌍둥이자리": "gemini",
-            "게자리": "cancer",
-            "사자자리": "leo",
-            "처녀자리": "virgo",
-            "천칭자리": "libra",
-            "전갈자리": "scorpio",
-            "궁수자리": "sagittarius",
-            "염소자리": "capricorn"
-        }
+        self.zodiac_mapping = dict(ZODIAC_ENGLISH)
         
         # 샘플 운세 데이터 (웹 스크래핑 실패 시 대체용)
         self.sample_horoscopes = {
@@ -94,233 +139,337 @@ class HoroscopeScraper:
             }
         }
     
+    def _marie_claire_url(self, date: datetime.date) -> str:
+        """마리끌레어 월별 운세 페이지 URL을 생성합니다."""
+        # 정확한 URL 패턴: https://www.marieclairekorea.com/horoscope/2025/07/horoscope2507
+        year = date.year
+        month = date.month
+        
+        # URL 생성 - 마지막 부분은 년도 뒤 2자리 + 월 2자리
+        year_short = year % 100  # 2025 -> 25
+        url_suffix = f"{year_short:02d}{month:02d}"  # 2507
+        return f"{self.marie_claire_base_url}/horoscope/{year}/{month:02d}/horoscope{url_suffix}"
+    
+    def get_marie_claire_sections(self, date: datetime.date) -> Dict[str, str]:
+        """
+        마리끌레어 월별 페이지를 한 번만 가져와 12개 별자리 운세를 모두 파싱합니다.
+        
+        파싱 결과는 월별 페이지 캐시에 저장되며, TTL이 지나면
+        ETag/Last-Modified 조건부 요청으로 재검증합니다. 요청에 실패한 페이지는
+        MONTH_PAGE_FAILURE_TTL 동안 다시 요청하지 않고 만료된 파싱 결과를 반환하거나
+        (없으면) 같은 오류를 냅니다. 별자리를 하나도 파싱하지 못한 페이지는 캐시하지 않고
+        같은 기간 동안 빈 딕셔너리를 반환합니다.
+        
+        Args:
+            date: 선택된 날짜
+            
+        Returns:
+            {별자리: 운세내용} 딕셔너리 (파싱에 실패한 별자리는 빠짐)
+        """
+        url = self._marie_claire_url(date)
+        
+        cached = self.page_cache.get(url)
+        if cached is not None:
+            CACHE_HITS.inc(cache="page")
+            return cached['sections']
+        
+        failure = self.failure_cache.get(url)
+        if failure is not None:
+            CACHE_HITS.inc(cache="page_failure")
+            stale = self.page_cache.get_stale(url)
+            if stale is not None:
+                return stale['sections']
+            if failure['error'] is None:
+                return {}
+            raise requests.RequestException(f"최근 요청에 실패한 페이지입니다: {failure['error']}")
+        
+        return _month_page_flight.do(url, lambda: self._load_marie_claire_sections(date, url))
+    
+    def _load_marie_claire_sections(self, date: datetime.date, url: str) -> Dict[str, str]:
+        """월별 페이지를 요청(또는 재검증)하고 파싱해 캐시에 기록합니다."""
+        # 기다리는 동안 다른 요청이 캐시를 채웠을 수 있음
+        cached = self.page_cache.get(url)
+        if cached is not None:
+            CACHE_HITS.inc(cache="page")
+            return cached['sections']
+        
+        stale = self.page_cache.get_stale(url)
+        logger.debug("마리끌레어 URL: %s", url)
+        
+        try:
+            body, not_modified = self._fetch_page(url, timeout=15)
+        except requests.RequestException as e:
+            self.failure_cache.set(url, {'error': str(e)})
+            # 재검증 실패 시 만료된 데이터라도 제공
+            if stale is not None:
+                CACHE_HITS.inc(cache="page_stale")
+                return stale['sections']
+            raise
+        
+        if not_modified and stale is not None:
+            # 변경 없음 (304): 파싱 결과를 그대로 재사용
+            logger.debug("마리끌레어 페이지 변경 없음 (304): %s", url)
+            CACHE_HITS.inc(cache="page_revalidated")
+            self.page_cache.touch(url)
+            return stale['sections']
+        CACHE_MISSES.inc(cache="page")
+        
+        # 본문 영역 텍스트에서 12개 별자리 섹션을 한 번에 분할
+        sections = self._parse_sections(body, "marie_claire")
+        if not sections:
+            # 빈 파싱 결과는 캐시하지 않고, 검증자도 지워 다음 요청은 조건 없이 본문을 다시 받음
+            # (304로 같은 본문을 재사용하면 파서 / 페이지가 고쳐져도 계속 비어 있게 됨)
+            logger.warning("마리끌레어 페이지에서 별자리를 하나도 파싱하지 못했습니다: %s", url)
+            self.http_cache.delete(url)
+            if self.store is not None:
+                self.store.delete_http_cache(url)
+            self.failure_cache.set(url, {'error': None})
+            return sections
+        
+        # 파싱에 성공한 별자리는 디스크 저장소에도 기록
+        if self.store is not None:
+            self.store.put_raw_sections("marie_claire", month_key(date), sections)
+        
+        self.page_cache.set(url, {'sections': sections})
+        return sections
+    
+    def is_sample(self, zodiac: str, content: Optional[str], source: str = "marie_claire") -> bool:
+        """content가 스크래핑에 실패했을 때 대신 반환하는 샘플 운세인지 확인합니다."""
+        return bool(content) and content == self.sample_horoscopes.get(zodiac, {}).get(source)
+    
     def get_marie_claire_horoscope(self, date: datetime.date, zodiac: str) -> Optional[str]:
         """마리끌레어 코리아에서 운세를 가져옵니다."""
         try:
-            # 정확한 URL 패턴: https://www.marieclairekorea.com/horoscope/2025/07/horoscope2507
-            year = date.year
-            month = date.month
-            
-            # URL 생성 - 마지막 부분은 년도 뒤 2자리 + 월 2자리
-            year_short = year % 100  # 2025 -> 25
-            url_suffix = f"{year_short:02d}{month:02d}"  # 2507
-            url = f"https://www.marieclairekorea.com/horoscope/{year}/{month:02d}/horoscope{url_suffix}"
-            
-            print(f"마리끌레어 URL: {url}")  # 디버깅용
-            
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 전체 텍스트 가져오기
-            all_text = soup.get_text()
-            print(f"페이지 텍스트 길이: {len(all_text)}")  # 디버깅용
-            
-            # 별자리 영어 이름 매핑
-            zodiac_english_map = {
-                "물병자리": "aquarius",
-                "물고기자리": "pisces", 
-                "양자리": "aries",
-                "황소자리": "taurus",
-                "쌍둥이자리": "gemini",
-                "게자리": "cancer",
-                "사자자리": "leo",
-                "처녀자리": "virgo",
-                "천칭자리": "libra",
-                "전갈자리": "scorpio",
-                "궁수자리": "sagittarius",
-                "염소자리": "capricorn"
-            }
-            
-            zodiac_eng = zodiac_english_map.get(zodiac, "")
-            
-            # 패턴 1: 영어 별자리명으로 시작하는 패턴
-            if zodiac_eng:
-                pattern1 = rf'{zodiac_eng}\s+{zodiac}.*?(?=aquarius|pisces|aries|taurus|gemini|cancer|leo|virgo|libra|scorpio|sagittarius|capricorn|\n\n)'
-                match1 = re.search(pattern1, all_text, re.DOTALL | re.IGNORECASE)
-                
-                if match1:
-                    content = match1.group().strip()
-                    # DAY&COLOR 부분 제거
-                    content = re.sub(r'DAY&COLOR.*?$', '', content, flags=re.MULTILINE)
-                    # ✓ 기호 제거
-                    content = re.sub(r'✓', '', content)
-                    # 영어 별자리명 제거
-                    content = re.sub(rf'^{zodiac_eng}\s*', '', content, flags=re.IGNORECASE)
-                    # 날짜 범위 제거 (4/20~5/20 같은 형태)
-                    content = re.sub(r'\d{1,2}/\d{1,2}~\d{1,2}/\d{1,2}', '', content)
-                    
-                    content = self.clean_text(content)
-                    if len(content.strip()) > 30:
-                        print(f"패턴1 매칭 성공: {content[:100]}...")  # 디버깅용
-                        return content
-            
-            # 패턴 2: 한글 별자리명으로 시작하는 패턴  
-            pattern2 = rf'{zodiac}.*?(?=물병자리|물고기자리|양자리|황소자리|쌍둥이자리|게자리|사자자리|처녀자리|천칭자리|전갈자리|궁수자리|염소자리|\n\n)'
-            match2 = re.search(pattern2, all_text, re.DOTALL | re.IGNORECASE)
-            
-            if match2:
-                content = match2.group().strip()
-                # DAY&COLOR 부분 제거
-                content = re.sub(r'DAY&COLOR.*?$', '', content, flags=re.MULTILINE)
-                # ✓ 기호 제거
-                content = re.sub(r'✓', '', content)
-                # 날짜 범위 제거
-                content = re.sub(r'\d{1,2}/\d{1,2}~\d{1,2}/\d{1,2}', '', content)
-                
-                content = self.clean_text(content)
-                if len(content.strip()) > 30:
-                    print(f"패턴2 매칭 성공: {content[:100]}...")  # 디버깅용
-                    return content
-            
-            # 패턴 3: 더 관대한 패턴
-            pattern3 = rf'{zodiac}[^가-힣]*([가-힣\s.,!?~]+)'
-            matches3 = re.findall(pattern3, all_text, re.DOTALL | re.IGNORECASE)
+            # 디스크 저장소에 있으면 네트워크 요청 없이 반환
+            if self.store is not None:
+                stored = self.store.get_raw("marie_claire", month_key(date), zodiac)
+                if stored:
+                    CACHE_HITS.inc(cache="store")
+                    return stored
+                CACHE_MISSES.inc(cache="store")
             
-            for match in matches3:
-                content = match.strip()
-                if len(content) > 50 and any(keyword in content for keyword in ['운세', '오늘', '하루', '시기', '좋은', '나쁜', '기회', '주의', '관계', '생활', '감정']):
-                    content = self.clean_text(content)
-                    print(f"패턴3 매칭 성공: {content[:100]}...")  # 디버깅용
-                    return content
+            sections = self.get_marie_claire_sections(date)
+            content = sections.get(zodiac)
+            if content:
+                logger.debug("마리끌레어 운세 추출 성공: %s (%d자)", zodiac, len(content))
+                return content
             
-            print("매칭된 패턴이 없음")  # 디버깅용
+            logger.info("마리끌레어 페이지에서 %s 운세를 찾지 못해 샘플 데이터를 사용합니다.", zodiac)
             # 웹 스크래핑 실패 시 샘플 데이터 사용
+            FALLBACKS.inc(kind="sample", source="marie_claire")
             return self.sample_horoscopes.get(zodiac, {}).get("marie_claire", f"{zodiac} 운세 정보를 가져오는 중 오류가 발생했습니다.")
             
         except requests.RequestException as e:
-            print(f"마리끌레어 요청 오류: {e}")
+            logger.warning("마리끌레어 요청 오류: %s", e)
+            FALLBACKS.inc(kind="sample", source="marie_claire")
             return self.sample_horoscopes.get(zodiac, {}).get("marie_claire", f"네트워크 오류로 {zodiac} 운세를 가져올 수 없습니다.")
         except Exception as e:
-            print(f"마리끌레어 파싱 오류: {e}")
+            logger.exception("마리끌레어 파싱 오류: %s", e)
+            FALLBACKS.inc(kind="sample", source="marie_claire")
             return self.sample_horoscopes.get(zodiac, {}).get("marie_claire", f"{zodiac} 운세 정보를 처리하는 중 오류가 발생했습니다.")
     
-    def get_elle_horoscope(self, date: datetime.date, zodiac: str) -> Optional[str]:
-        """엘르 코리아에서 운세를 가져옵니다."""
+    def _fetch(self, url: str, timeout: float = 10, deadline: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        호스트별 회로 차단기와 레이트 리미터를 거쳐 GET 요청을 보냅니다.
+        
+        차단기가 열린 호스트는 요청 없이 CircuitOpenError(requests.RequestException)를 발생시키므로
+        호출자의 기존 오류 처리에 따라 바로 샘플 데이터로 대체됩니다.
+        타임아웃은 호스트의 최근 응답 시간에 맞춰 줄어듭니다 (timeout이 상한).
+        """
+        breaker = get_breaker(url)
+        if not breaker.allow():
+            CIRCUIT_SHORT_CIRCUITS.inc(host=breaker.name)
+            raise CircuitOpenError(f"회로 차단기가 열려 있습니다: {breaker.name}")
+        if not self.rate_limiter.acquire(url, deadline):
+            breaker.release()  # 요청을 보내지 않았으므로 시험 요청 기회를 돌려놓음
+            raise requests.Timeout(f"마감 시간 내에 요청 슬롯을 얻지 못했습니다: {url}")
+        
+        adaptive = get_adaptive_timeout(url)
+        timeout = adapt_timeout(timeout, adaptive)
+        if deadline is not None:
+            timeout = max(0.1, min(timeout, deadline - time.monotonic()))
+        
+        started = time.monotonic()
         try:
-            # 실제 웹 스크래핑 시도
-            urls = [
-                "https://www.elle.co.kr/horoscope/",
-                "https://www.elle.co.kr/starsigns/",
-                "https://m.elle.co.kr/horoscope/"
-            ]
-            
-            for url in urls:
+            with timer("fetch"):
+                response = self.session.get(url, timeout=timeout, **kwargs)
+        except requests.RequestException as e:
+            if is_upstream_failure(error=e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        if is_upstream_failure(response):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            adaptive.observe(time.monotonic() - started)
+        return response
+    
+    def _fetch_page(self, url: str, timeout: float = 10, deadline: Optional[float] = None) -> Tuple[bytes, bool]:
+        """
+        저장된 검증자(ETag / Last-Modified)로 조건부 GET을 보내고 (본문, 변경 없음 여부)를 반환합니다.
+        
+        304 응답이면 저장해둔 본문을 반환하고, 새 본문은 검증자와 함께 메모리 / 디스크에 기록합니다.
+        200 / 304가 아닌 응답은 requests.HTTPError로 처리합니다.
+        """
+        cached = self.http_cache.get(url)
+        if cached is None and self.store is not None:
+            cached = self.store.get_http_cache(url)
+            if cached is not None:
+                self.http_cache.set(url, cached)
+        
+        request_headers = {}
+        if cached is not None:
+            if cached.get('etag'):
+                request_headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                request_headers['If-Modified-Since'] = cached['last_modified']
+        
+        response = self._fetch(url, timeout, deadline, headers=request_headers)
+        if response.status_code == 304 and cached is not None:
+            CACHE_HITS.inc(cache="http_not_modified")
+            if self.store is not None:
+                self.store.touch_http_cache(url)
+            return cached['body'], True
+        if response.status_code != 200:
+            raise requests.HTTPError(f"{response.status_code} 응답: {url}", response=response)
+        
+        body = response.content
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self.http_cache.set(url, {'etag': etag, 'last_modified': last_modified, 'body': body})
+            if self.store is not None:
+                self.store.put_http_cache(url, etag, last_modified, body)
+        return body, False
+    
+    def _fetch_first_success(self, urls: List[str], timeout: float = 10, deadline: Optional[float] = None) -> Optional[bytes]:
+        """
+        미러 URL들을 병렬로 (조건부) 요청하고 가장 먼저 성공한 본문을 반환합니다.
+        
+        첫 성공 응답을 받으면 아직 시작하지 않은 요청은 취소합니다.
+        """
+        futures = [_mirror_executor.submit(self._fetch_page, url, timeout, deadline) for url in urls]
+        wait_timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            for future in as_completed(futures, timeout=wait_timeout):
                 try:
-                    response = self.session.get(url, timeout=10)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        all_text = soup.get_text()
-                        
-                        # 별자리 운세 텍스트 추출
-                        patterns = [
-                            rf'{zodiac}.*?(?=물병자리|물고기자리|양자리|황소자리|쌍둥이자리|게자리|사자자리|처녀자리|천칭자리|전갈자리|궁수자리|염소자리|\n\n)',
-                            rf'{zodiac}[^가-힣]*([가-힣\s.,!?]+)'
-                        ]
-                        
-                        for pattern in patterns:
-                            matches = re.findall(pattern, all_text, re.DOTALL | re.IGNORECASE)
-                            for match in matches:
-                                if isinstance(match, tuple):
-                                    content = match[0]
-                                else:
-                                    content = match
-                                
-                                if len(content.strip()) > 30:
-                                    return self.clean_text(content[:500])
-                        
-                        break
+                    body, _ = future.result()
                 except requests.RequestException:
                     continue
-            
-            # 웹 스크래핑 실패 시 샘플 데이터 사용
-            return self.sample_horoscopes.get(zodiac, {}).get("elle", f"{zodiac} 운세 정보를 가져오는 중 오류가 발생했습니다.")
+                return body
+        except FuturesTimeoutError:
+            logger.info("미러 요청 마감 시간 초과: %s", urls)
+        finally:
+            for future in futures:
+                future.cancel()
+        return None
+    
+    def _parse_sections(self, content: bytes, source: str) -> Dict[str, str]:
+        """
+        페이지를 파싱해 {별자리: 운세내용}을 반환합니다.
+        
+        사이트별 선택자로 운세 본문 영역만 먼저 파싱하고,
+        거기서 별자리를 찾지 못하면 페이지 전체 텍스트로 다시 시도합니다.
+        """
+        texts = candidate_texts(content, source)
+        while True:
+            with timer("parse", source=source):
+                text = next(texts, None)
+            if text is None:
+                break
+            logger.debug("페이지 텍스트 길이: %d", len(text))
+            with timer("segment", source=source):
+                detailed = self.segmenter.segment_detailed(text)
+            if detailed:
+                # 별자리별로 어떤 패턴이 채택되었는지 기록
+                for _, pattern in detailed.values():
+                    PATTERN_MATCHES.inc(pattern=f"pattern{pattern}", source=source)
+                return {zodiac: section for zodiac, (section, _) in detailed.items()}
+        PATTERN_MATCHES.inc(pattern="none", source=source)
+        return {}
+    
+    def _get_mirrored_horoscope(self, urls: List[str], zodiac: str, source: str, deadline: Optional[float] = None) -> Optional[str]:
+        """미러 URL 중 먼저 응답한 페이지에서 별자리 운세를 추출합니다."""
+        body = self._fetch_first_success(urls, timeout=10, deadline=deadline)
+        if body is not None:
+            # 별자리 운세 텍스트 추출
+            content = self._parse_sections(body, source).get(zodiac)
+            if content:
+                return content[:500]
+        
+        # 웹 스크래핑 실패 시 샘플 데이터 사용
+        FALLBACKS.inc(kind="sample", source=source)
+        return self.sample_horoscopes.get(zodiac, {}).get(source, f"{zodiac} 운세 정보를 가져오는 중 오류가 발생했습니다.")
+    
+    def get_elle_horoscope(self, date: datetime.date, zodiac: str, deadline: Optional[float] = None) -> Optional[str]:
+        """엘르 코리아에서 운세를 가져옵니다."""
+        try:
+            # 실제 웹 스크래핑 시도 (미러 URL 병렬 요청)
+            return self._get_mirrored_horoscope(self.elle_urls, zodiac, "elle", deadline)
             
         except Exception as e:
-            print(f"엘르 파싱 오류: {e}")
+            logger.exception("엘르 파싱 오류: %s", e)
+            FALLBACKS.inc(kind="sample", source="elle")
             return self.sample_horoscopes.get(zodiac, {}).get("elle", f"{zodiac} 운세 정보를 처리하는 중 오류가 발생했습니다.")
     
-    def get_singles_horoscope(self, date: datetime.date, zodiac: str) -> Optional[str]:
+    def get_singles_horoscope(self, date: datetime.date, zodiac: str, deadline: Optional[float] = None) -> Optional[str]:
         """싱글즈 코리아에서 운세를 가져옵니다."""
         try:
-            # 실제 웹 스크래핑 시도
-            urls = [
-                "https://www.singles.co.kr/horoscope/",
-                "https://m.singles.co.kr/horoscope/",
-                "https://singles.co.kr/fortune/"
-            ]
-            
-            for url in urls:
-                try:
-                    response = self.session.get(url, timeout=10)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        all_text = soup.get_text()
-                        
-                        # 별자리 운세 텍스트 추출
-                        patterns = [
-                            rf'{zodiac}.*?(?=물병자리|물고기자리|양자리|황소자리|쌍둥이자리|게자리|사자자리|처녀자리|천칭자리|전갈자리|궁수자리|염소자리|\n\n)',
-                            rf'{zodiac}[^가-힣]*([가-힣\s.,!?]+)'
-                        ]
-                        
-                        for pattern in patterns:
-                            matches = re.findall(pattern, all_text, re.DOTALL | re.IGNORECASE)
-                            for match in matches:
-                                if isinstance(match, tuple):
-                                    content = match[0]
-                                else:
-                                    content = match
-                                
-                                if len(content.strip()) > 30:
-                                    return self.clean_text(content[:500])
-                        
-                        break
-                except requests.RequestException:
-                    continue
-            
-            # 웹 스크래핑 실패 시 샘플 데이터 사용
-            return self.sample_horoscopes.get(zodiac, {}).get("singles", f"{zodiac} 운세 정보를 가져오는 중 오류가 발생했습니다.")
+            # 실제 웹 스크래핑 시도 (미러 URL 병렬 요청)
+            return self._get_mirrored_horoscope(self.singles_urls, zodiac, "singles", deadline)
             
         except Exception as e:
-            print(f"싱글즈 파싱 오류: {e}")
+            logger.exception("싱글즈 파싱 오류: %s", e)
+            FALLBACKS.inc(kind="sample", source="singles")
             return self.sample_horoscopes.get(zodiac, {}).get("singles", f"{zodiac} 운세 정보를 처리하는 중 오류가 발생했습니다.")
     
-    def get_all_horoscopes(self, date: datetime.date, zodiac: str) -> dict:
-        """모든 사이트에서 운세를 가져옵니다."""
-        results = {}
+    def get_all_horoscopes(self, date: datetime.date, zodiac: str, concurrent: bool = True, timeout: float = FETCH_DEADLINE) -> dict:
+        """
+        모든 사이트에서 운세를 가져옵니다.
         
-        # 각 사이트에서 순차적으로 운세 가져오기
-        results['marie_claire'] = self.get_marie_claire_horoscope(date, zodiac)
-        time.sleep(random.uniform(0.5, 1))
+        Args:
+            date: 선택된 날짜
+            zodiac: 별자리 이름
+            concurrent: True면 모든 사이트를 병렬로 요청
+            timeout: 전체 마감 시간(초). 마감까지 응답하지 않은 사이트는 샘플 데이터로 대체
+            
+        Returns:
+            {사이트키: 운세내용} 딕셔너리
+        """
+        deadline = time.monotonic() + timeout
         
-        results['elle'] = self.get_elle_horoscope(date, zodiac)
-        time.sleep(random.uniform(0.5, 1))
+        if not concurrent:
+            # 각 사이트에서 순차적으로 운세 가져오기 (간격은 레이트 리미터가 보장)
+            return {
+                'marie_claire': self.get_marie_claire_horoscope(date, zodiac),
+                'elle': self.get_elle_horoscope(date, zodiac, deadline),
+                'singles': self.get_singles_horoscope(date, zodiac, deadline),
+            }
         
-        results['singles'] = self.get_singles_horoscope(date, zodiac)
+        futures = {
+            'marie_claire': _source_executor.submit(self.get_marie_claire_horoscope, date, zodiac),
+            'elle': _source_executor.submit(self.get_elle_horoscope, date, zodiac, deadline),
+            'singles': _source_executor.submit(self.get_singles_horoscope, date, zodiac, deadline),
+        }
+        wait(list(futures.values()), timeout=max(0.0, deadline - time.monotonic()))
+        
+        results = {}
+        for source, future in futures.items():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                results[source] = future.result()
+            else:
+                logger.info("%s 마감 시간 초과, 샘플 데이터 사용", source)
+                FALLBACKS.inc(kind="sample", source=source)
+                future.cancel()
+                results[source] = self.sample_horoscopes.get(zodiac, {}).get(source, f"{zodiac} 운세 정보를 가져오는 중 오류가 발생했습니다.")
         
         return results
     
     def clean_text(self, text: str) -> str:
         """텍스트 정리 함수"""
-        if not text:
-            return ""
-        
-        # 불필요한 공백 제거
-        text = re.sub(r'\s+', ' ', text)
-        
-        # HTML 태그 제거
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # 특수 문자 정리
-        text = text.replace('\xa0', ' ')
-        text = text.replace('\u2022', '•')
-        
-        # 영어 날짜나 별자리 이름 제거
-        text = re.sub(r'aries|taurus|gemini|cancer|leo|virgo|libra|scorpio|sagittarius|capricorn|aquarius|pisces', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'\d{1,2}/\d{1,2}[~-]\d{1,2}/\d{1,2}', '', text)
-        
-        return text.strip()
+        return clean_text(text)
 
 # 테스트 함수
 def test_scraper():
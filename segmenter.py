@@ -0,0 +1,185 @@
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from metrics import STAGE_SECONDS
+
+# 별자리 한글 이름 -> 영어 이름
+ZODIAC_ENGLISH = {
+    "물병자리": "aquarius",
+    "물고기자리": "pisces",
+    "양자리": "aries",
+    "황소자리": "taurus",
+    "쌍둥이자리": "gemini",
+    "게자리": "cancer",
+    "사자자리": "leo",
+    "처녀자리": "virgo",
+    "천칭자리": "libra",
+    "전갈자리": "scorpio",
+    "궁수자리": "sagittarius",
+    "염소자리": "capricorn"
+}
+ENGLISH_ZODIAC = {eng: kor for kor, eng in ZODIAC_ENGLISH.items()}
+
+_ENGLISH_ALT = "|".join(ZODIAC_ENGLISH.values())
+_KOREAN_ALT = "|".join(ZODIAC_ENGLISH.keys())
+
+# 페이지 전체를 한 번 훑으며 별자리 표식(영어명/한글명)과 빈 줄을 찾는 패턴
+_MARKER_RE = re.compile(rf"(?P<eng>{_ENGLISH_ALT})|(?P<kor>{_KOREAN_ALT})|(?P<blank>\n\n)", re.IGNORECASE)
+
+# 섹션 정리용 패턴
+_WHITESPACE_RE = re.compile(r"\s+")
+_ONLY_WHITESPACE_RE = re.compile(r"\s*")
+_DAY_COLOR_RE = re.compile(r"DAY&COLOR.*?$", re.MULTILINE)
+_DATE_RANGE_RE = re.compile(r"\d{1,2}/\d{1,2}~\d{1,2}/\d{1,2}")
+_LEADING_ENGLISH_RE = re.compile(rf"^(?:{_ENGLISH_ALT})\s*", re.IGNORECASE)
+_LOOSE_BODY_RE = re.compile(r"[^가-힣]*([가-힣\s.,!?~]+)")
+
+# clean_text용 패턴: HTML 태그, 영어 별자리명, 날짜 범위를 한 번에 제거
+_CLEAN_REMOVE_RE = re.compile(rf"<[^>]+>|{_ENGLISH_ALT}|\d{{1,2}}/\d{{1,2}}[~-]\d{{1,2}}/\d{{1,2}}", re.IGNORECASE)
+
+# 느슨한 매칭(패턴 3)에서 운세 문장으로 인정하는 키워드
+_LOOSE_KEYWORDS = ['운세', '오늘', '하루', '시기', '좋은', '나쁜', '기회', '주의', '관계', '생활', '감정']
+
+# 매칭 방식 번호
+PATTERN_PAIR = 1   # "taurus 황소자리 ..." 처럼 영어명+한글명으로 시작
+PATTERN_KOREAN = 2  # 한글명으로 시작
+PATTERN_LOOSE = 3   # 한글명 뒤의 한글 문장
+
+
+def clean_text(text: str) -> str:
+    """텍스트 정리 함수"""
+    if not text:
+        return ""
+
+    started = time.perf_counter()
+
+    # 불필요한 공백 제거
+    text = _WHITESPACE_RE.sub(' ', text)
+
+    # 특수 문자 정리
+    text = text.replace('\xa0', ' ')
+    text = text.replace('\u2022', '•')
+
+    # HTML 태그, 영어 별자리 이름, 날짜 제거
+    text = _CLEAN_REMOVE_RE.sub('', text)
+
+    STAGE_SECONDS.observe(time.perf_counter() - started, stage="clean_text")
+    return text.strip()
+
+
+class ZodiacSegmenter:
+    """
+    페이지 텍스트를 한 번 훑어 12개 별자리 운세 섹션을 모두 나누는 분할기
+
+    별자리 표식을 한 번의 정규식 스캔으로 모은 뒤, 각 표식에서 다음 표식까지를
+    섹션으로 잘라내므로 별자리 수와 관계없이 페이지 길이에 비례하는 비용으로 동작합니다.
+    """
+
+    def __init__(self, min_length: int = 30, loose_min_length: int = 50):
+        self.min_length = min_length
+        self.loose_min_length = loose_min_length
+
+    def segment(self, text: str) -> Dict[str, str]:
+        """{별자리: 운세내용} 딕셔너리를 반환합니다 (찾지 못한 별자리는 빠짐)."""
+        return {zodiac: content for zodiac, (content, _) in self.segment_detailed(text).items()}
+
+    def segment_detailed(self, text: str) -> Dict[str, Tuple[str, int]]:
+        """{별자리: (운세내용, 매칭 방식 번호)} 딕셔너리를 반환합니다."""
+        markers = self._scan(text)
+        next_eng_or_blank, next_kor_or_blank = self._next_boundaries(markers, len(text))
+
+        pair_first = {}    # 별자리 -> 첫 "영어명 한글명" 표식 인덱스
+        korean_first = {}  # 별자리 -> 첫 한글명 표식 인덱스
+        korean_all = {}    # 별자리 -> 모든 한글명 표식 인덱스
+        for i, (kind, name, start, end) in enumerate(markers):
+            if kind == "kor":
+                korean_first.setdefault(name, i)
+                korean_all.setdefault(name, []).append(i)
+            elif kind == "eng" and i + 1 < len(markers):
+                next_kind, next_name, next_start, _ = markers[i + 1]
+                if (next_kind == "kor" and ZODIAC_ENGLISH[next_name] == name
+                        and next_start > end and _ONLY_WHITESPACE_RE.fullmatch(text, end, next_start)):
+                    pair_first.setdefault(next_name, i)
+
+        sections = {}
+        for zodiac in ZODIAC_ENGLISH:
+            # 패턴 1: 영어 별자리명 + 한글 별자리명으로 시작, 다음 영어명 또는 빈 줄까지
+            if zodiac in pair_first:
+                i = pair_first[zodiac]
+                content = self._clean_section(text[markers[i][2]:next_eng_or_blank[i + 1]], strip_english=True)
+                if len(content) > self.min_length:
+                    sections[zodiac] = (content, PATTERN_PAIR)
+                    continue
+
+            # 패턴 2: 한글 별자리명으로 시작, 다음 한글명 또는 빈 줄까지
+            if zodiac in korean_first:
+                i = korean_first[zodiac]
+                content = self._clean_section(text[markers[i][2]:next_kor_or_blank[i]])
+                if len(content) > self.min_length:
+                    sections[zodiac] = (content, PATTERN_KOREAN)
+                    continue
+
+            # 패턴 3: 한글 별자리명 뒤에 이어지는 한글 문장
+            for i in korean_all.get(zodiac, []):
+                content = self._loose_section(text, markers[i][3])
+                if content:
+                    sections[zodiac] = (content, PATTERN_LOOSE)
+                    break
+
+        return sections
+
+    def _scan(self, text: str) -> List[Tuple[str, str, int, int]]:
+        """별자리 표식과 빈 줄을 (종류, 이름, 시작, 끝) 목록으로 한 번에 수집합니다."""
+        markers = []
+        for match in _MARKER_RE.finditer(text):
+            kind = match.lastgroup
+            markers.append((kind, match.group().lower() if kind == "eng" else match.group(), match.start(), match.end()))
+        return markers
+
+    def _next_boundaries(self, markers: List[Tuple[str, str, int, int]], text_length: int) -> Tuple[List[int], List[int]]:
+        """
+        각 표식 인덱스 i에 대해 i 이후 첫 번째 경계의 시작 위치를 뒤에서부터 한 번에 계산합니다.
+
+        Returns:
+            (다음 영어명/빈 줄 위치 목록, 다음 한글명/빈 줄 위치 목록). 길이는 len(markers) + 1
+        """
+        next_eng_or_blank = [text_length] * (len(markers) + 1)
+        next_kor_or_blank = [text_length] * (len(markers) + 1)
+        eng_or_blank = kor_or_blank = text_length
+        for i in range(len(markers) - 1, -1, -1):
+            # 인덱스 i에는 i 자신을 제외한 이후의 경계를 기록
+            next_eng_or_blank[i] = eng_or_blank
+            next_kor_or_blank[i] = kor_or_blank
+            kind, _, start, _ = markers[i]
+            if kind in ("eng", "blank"):
+                eng_or_blank = start
+            if kind in ("kor", "blank"):
+                kor_or_blank = start
+        return next_eng_or_blank, next_kor_or_blank
+
+    def _clean_section(self, content: str, strip_english: bool = False) -> str:
+        content = content.strip()
+        # DAY&COLOR 부분 제거
+        content = _DAY_COLOR_RE.sub('', content)
+        # ✓ 기호 제거
+        content = content.replace('✓', '')
+        # 영어 별자리명 제거
+        if strip_english:
+            content = _LEADING_ENGLISH_RE.sub('', content)
+        # 날짜 범위 제거 (4/20~5/20 같은 형태)
+        content = _DATE_RANGE_RE.sub('', content)
+        return clean_text(content)
+
+    def _loose_section(self, text: str, pos: int) -> Optional[str]:
+        match = _LOOSE_BODY_RE.match(text, pos)
+        if not match:
+            return None
+        content = match.group(1).strip()
+        if len(content) > self.loose_min_length and any(keyword in content for keyword in _LOOSE_KEYWORDS):
+            return clean_text(content)
+        return None
+
+
+# 모든 스크래퍼가 공유하는 기본 분할기
+default_segmenter = ZodiacSegmenter()
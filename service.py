@@ -0,0 +1,515 @@
+import datetime
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cache import TTLCache
+from claude_api import ClaudeAPI, StreamIncompleteError, create_comprehensive_summary
+from metrics import CACHE_HITS, CACHE_MISSES, FALLBACKS
+from scraper import HoroscopeScraper
+from store import KIND_RAW, HoroscopeStore, day_key, get_default_store, month_key
+
+logger = logging.getLogger(__name__)
+
+MARIE_CLAIRE_SITE = "마리끌레어 코리아"
+
+# stale-while-revalidate 설정 (환경 변수로 변경 가능)
+# 이 기간이 지나면 마리끌레어 월별 페이지를 다시 확인하고, 운세가 바뀌었을 때만 종합 운세를 다시 생성(초)
+RESULT_FRESH_TTL = float(os.getenv("HOROSCOPE_FRESH_TTL", str(6 * 60 * 60)))
+# 기본 요약으로 대신한 결과는 이 간격 뒤에 다시 생성하고, 연속으로 실패할 때마다 간격을 두 배로 늘림(초)
+FALLBACK_RETRY_INTERVAL = float(os.getenv("HOROSCOPE_FALLBACK_RETRY", "60"))
+FALLBACK_RETRY_MAX = 30 * 60
+RESULT_CACHE_SIZE = 1024
+COLD_DEADLINE = float(os.getenv("HOROSCOPE_COLD_DEADLINE", "8"))  # 캐시가 없을 때 기다릴 최대 시간(초)
+REFRESH_WORKERS = int(os.getenv("HOROSCOPE_REFRESH_WORKERS", "4"))  # 사용자 요청(결과가 없을 때) 작업자 수
+# 진행 / 대기 중인 생성 작업이 이만큼 쌓이면 새 생성을 받지 않고 로컬 요약으로 대신 (부하 차단)
+MAX_PENDING_REFRESH = int(os.getenv("HOROSCOPE_MAX_PENDING_REFRESH", "32"))
+# 백그라운드 새로 고침(오래된 결과 재확인, 스케줄러 미리 생성)은 별도 작업자 풀에서 실행해
+# 사용자 요청 작업자를 차지하지 않도록 함. 대기 중인 작업이 상한에 이르면 새 예약은 건너뜀
+BACKGROUND_WORKERS = int(os.getenv("HOROSCOPE_BACKGROUND_WORKERS", "2"))
+MAX_PENDING_BACKGROUND = int(os.getenv("HOROSCOPE_MAX_PENDING_BACKGROUND", "64"))
+
+SUMMARY_SOURCE_CLAUDE = "claude"
+SUMMARY_SOURCE_FALLBACK = "fallback"
+
+# 스트림 종료 / 중단 표식
+_STREAM_END = object()
+_STREAM_FAILED = object()
+
+
+class _SummaryStream:
+    """
+    진행 중인 종합 운세 스트림 하나를 여러 사용자가 함께 구독하도록 하는 버퍼
+
+    받은 조각을 모두 보관하므로 늦게 구독한 사용자도 처음 조각부터 받습니다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._chunks: List[str] = []
+        self._end = None  # 진행 중이면 None, 끝나면 _STREAM_END / _STREAM_FAILED
+
+    def put(self, chunk: str) -> None:
+        with self._cond:
+            self._chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, end) -> None:
+        with self._cond:
+            self._end = end
+            self._cond.notify_all()
+
+    def wait_first(self, timeout: float) -> bool:
+        """첫 조각이 timeout 안에 왔으면 True (그 전에 실패하거나 마감을 넘기면 False)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._chunks or self._end is not None, timeout)
+            return bool(self._chunks)
+
+    def subscribe(self) -> Iterator[str]:
+        index = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: index < len(self._chunks) or self._end is not None)
+                pending, end = self._chunks[index:], self._end
+            index += len(pending)
+            yield from pending
+            if end is _STREAM_FAILED:
+                raise StreamIncompleteError("종합 운세 스트림이 중간에 끊겼습니다.")
+            if end is not None:
+                return
+
+
+class HoroscopeService:
+    """
+    show_horoscope_results가 사용하는 운세 제공 서비스 (stale-while-revalidate)
+
+    (날짜, 별자리)별 결과를 메모리에 두고, 새로 고칠 시점이 지난 결과도 바로 반환한 뒤
+    작업자 풀에서 백그라운드로 다시 생성합니다. 결과가 전혀 없을 때만 마감 시간까지 기다리고,
+    마감을 넘기면 create_comprehensive_summary의 기본 요약으로 대신합니다.
+    생성 작업이 max_pending 이상 쌓여 있으면 기다리지 않고 바로 기본 요약을 반환합니다.
+    사용자 요청 작업과 백그라운드 새로 고침은 서로 다른 작업자 풀에서 실행됩니다.
+    """
+
+    def __init__(self, store: Optional[HoroscopeStore] = None,
+                 fresh_ttl: float = RESULT_FRESH_TTL,
+                 cold_deadline: float = COLD_DEADLINE,
+                 workers: int = REFRESH_WORKERS,
+                 max_pending: int = MAX_PENDING_REFRESH,
+                 background_workers: int = BACKGROUND_WORKERS,
+                 max_pending_background: int = MAX_PENDING_BACKGROUND):
+        self.store = store
+        self.scraper = HoroscopeScraper(store=store)
+        self.claude_api = ClaudeAPI(store=store)
+        self.fresh_ttl = fresh_ttl
+        self.cold_deadline = cold_deadline
+        self.max_pending = max_pending
+        self.max_pending_background = max_pending_background
+
+        # 오래된 결과도 새 결과로 바뀔 때까지 반환해야 하므로 만료 없이 LRU로만 정리
+        self.results = TTLCache(maxsize=RESULT_CACHE_SIZE, ttl=float("inf"))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="horoscope-foreground")
+        self._background_executor = ThreadPoolExecutor(max_workers=max(1, background_workers), thread_name_prefix="horoscope-refresh")
+        self._refreshing = {}  # (날짜, 별자리) -> 진행 중인 Future
+        self._background = set()  # _refreshing 중 백그라운드 작업자 풀에서 실행되는 항목
+        self._streams: Dict[Tuple[str, str], _SummaryStream] = {}  # (날짜, 별자리) -> 진행 중인 스트림
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def lookup(self, date: datetime.date, zodiac: str) -> Optional[dict]:
+        """
+        메모리나 디스크 저장소에 있는 결과를 바로 반환합니다.
+
+        새로 고칠 시점이 지난 결과는 그대로 반환하고 백그라운드 새로 고침을 예약합니다.
+
+        Returns:
+            {'date', 'zodiac', 'marie_claire', 'summary', 'summary_source', 'stale'}
+            딕셔너리, 결과가 없으면 None
+        """
+        key = (date.isoformat(), zodiac)
+        entry = self.results.get(key)
+        if entry is None:
+            entry = self._load_from_store(date, zodiac)
+            if entry is None:
+                CACHE_MISSES.inc(cache="result")
+                return None
+
+        stale = time.time() >= entry["fresh_until"]
+        CACHE_HITS.inc(cache="result", stale=str(stale).lower())
+        if stale:
+            self.refresh(date, zodiac)
+        result = dict(entry)
+        result["stale"] = stale
+        return result
+
+    def get_horoscope(self, date: datetime.date, zodiac: str, timeout: Optional[float] = None) -> dict:
+        """
+        운세 결과를 반환합니다. 결과가 없으면 마감 시간까지 생성을 기다립니다.
+
+        Args:
+            date: 선택된 날짜
+            zodiac: 별자리 이름
+            timeout: 결과가 없을 때 기다릴 최대 시간(초). None이면 cold_deadline 사용
+
+        Returns:
+            lookup()과 같은 형식의 딕셔너리. 마감을 넘기면 기본 요약으로 채운 결과
+            (생성은 백그라운드에서 계속되어 다음 요청부터 반영)
+        """
+        entry = self.lookup(date, zodiac)
+        if entry is not None:
+            return entry
+        if self.is_overloaded():
+            return self._deadline_result(date, zodiac, kind="shed")
+
+        future = self._submit_refresh(date, zodiac)
+        try:
+            entry = future.result(timeout=self.cold_deadline if timeout is None else timeout)
+        except FuturesTimeoutError:
+            return self._deadline_result(date, zodiac)
+        except Exception as e:
+            logger.exception("운세 생성 오류: %s", e)
+            return self._deadline_result(date, zodiac)
+        result = dict(entry)
+        result["stale"] = False
+        return result
+
+    def get_horoscopes(self, date: datetime.date, zodiacs: List[str], timeout: Optional[float] = None) -> Dict[str, dict]:
+        """
+        여러 별자리의 운세 결과를 한 번에 반환합니다.
+
+        Returns:
+            {별자리: lookup()과 같은 형식의 딕셔너리} (zodiacs 순서)
+        """
+        results = {entry["zodiac"]: entry for entry in self.iter_horoscopes(date, zodiacs, timeout)}
+        return {zodiac: results[zodiac] for zodiac in zodiacs}
+
+    def iter_horoscopes(self, date: datetime.date, zodiacs: List[str], timeout: Optional[float] = None) -> Iterator[dict]:
+        """
+        여러 별자리의 운세 결과를 준비되는 순서대로 반환합니다 (점진적 렌더링용).
+
+        이미 있는 결과를 먼저 반환하고, 없는 별자리는 작업자 풀(최대 동시 실행 수 제한)에서
+        생성해 끝나는 대로 반환합니다. 월별 페이지는 별자리 수와 관계없이 한 번만
+        요청 / 파싱되며, 하나의 마감 시간을 넘긴 별자리는 기본 요약으로 대신합니다.
+
+        Yields:
+            lookup()과 같은 형식의 딕셔너리
+        """
+        missing = []
+        for zodiac in zodiacs:
+            entry = self.lookup(date, zodiac)
+            if entry is not None:
+                yield entry
+            else:
+                missing.append(zodiac)
+        if not missing:
+            return
+        if self.is_overloaded():
+            for zodiac in missing:
+                yield self._deadline_result(date, zodiac, kind="shed")
+            return
+
+        deadline = time.monotonic() + (self.cold_deadline if timeout is None else timeout)
+        futures = {self._submit_refresh(date, zodiac): zodiac for zodiac in missing}
+        try:
+            for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                zodiac = futures.pop(future)
+                if future.exception() is None:
+                    yield dict(future.result(), stale=False)
+                else:
+                    logger.warning("%s 운세 생성 오류: %s", zodiac, future.exception())
+                    yield self._deadline_result(date, zodiac)
+        except FuturesTimeoutError:
+            pass
+        # 마감까지 끝나지 않은 별자리 (생성은 백그라운드에서 계속됨)
+        for zodiac in futures.values():
+            yield self._deadline_result(date, zodiac)
+
+    def _deadline_result(self, date: datetime.date, zodiac: str, kind: str = "deadline") -> dict:
+        """마감 시간 안에 생성하지 못한(kind=deadline) / 부하로 생성하지 않은(kind=shed) 별자리의 기본 요약 결과 (캐시에는 기록하지 않음)"""
+        logger.info("%s %s 운세를 기본 요약으로 대신합니다 (%s).", zodiac, date, kind)
+        FALLBACKS.inc(kind=kind)
+        marie_claire = None
+        if self.store is not None:
+            # 스크래핑은 끝나고 종합 운세만 늦어지는 경우 저장된 원문을 사용
+            marie_claire = self.store.get_raw("marie_claire", month_key(date), zodiac)
+        result = self._make_entry(date, zodiac, marie_claire or self._sample_marie_claire(zodiac), None)
+        result["stale"] = False
+        return result
+
+    def get_marie_claire(self, date: datetime.date, zodiac: str, timeout: Optional[float] = None) -> str:
+        """마리끌레어 운세를 마감 시간 안에 가져옵니다. 마감을 넘기면 샘플 운세를 반환합니다."""
+        future = self._executor.submit(self.scraper.get_marie_claire_horoscope, date, zodiac)
+        try:
+            return future.result(timeout=self.cold_deadline if timeout is None else timeout)
+        except FuturesTimeoutError:
+            logger.info("%s 마리끌레어 운세가 마감 시간을 넘겨 샘플 운세를 사용합니다.", zodiac)
+            FALLBACKS.inc(kind="sample", source="marie_claire")
+        except Exception as e:
+            logger.exception("마리끌레어 운세 오류: %s", e)
+        return self._sample_marie_claire(zodiac)
+
+    def get_marie_claire_all(self, date: datetime.date, zodiacs: List[str], timeout: Optional[float] = None) -> Dict[str, str]:
+        """
+        월별 페이지를 한 번만 파싱해 여러 별자리의 마리끌레어 운세를 마감 시간 안에 가져옵니다.
+
+        Returns:
+            {별자리: 운세내용} (가져오지 못한 별자리는 샘플 운세)
+        """
+        sections = {}
+        if self.store is not None:
+            sections = self.store.get_period(KIND_RAW, "marie_claire", month_key(date))
+
+        if any(zodiac not in sections for zodiac in zodiacs):
+            future = self._executor.submit(self.scraper.get_marie_claire_sections, date)
+            try:
+                sections = {**future.result(timeout=self.cold_deadline if timeout is None else timeout), **sections}
+            except FuturesTimeoutError:
+                logger.info("마리끌레어 월별 페이지가 마감 시간을 넘겨 샘플 운세를 사용합니다.")
+            except Exception as e:
+                logger.warning("마리끌레어 월별 페이지 오류: %s", e)
+
+        results = {}
+        for zodiac in zodiacs:
+            if not sections.get(zodiac):
+                FALLBACKS.inc(kind="sample", source="marie_claire")
+            results[zodiac] = sections.get(zodiac) or self._sample_marie_claire(zodiac)
+        return results
+
+    def stream_summary(self, date: datetime.date, zodiac: str, marie_claire: str,
+                       first_chunk_timeout: Optional[float] = None) -> Optional[Iterator[str]]:
+        """
+        종합 운세를 스트리밍으로 생성합니다 (결과가 없을 때의 화면 경로).
+
+        생성은 작업자 풀에서 진행되고, 첫 조각이 마감 시간 안에 오지 않으면 None을 반환합니다.
+        이때도 생성은 계속되어 완료되면 결과가 캐시에 기록됩니다.
+        같은 (날짜, 별자리)의 스트림이 이미 진행 중이면 새로 요청하지 않고 그 스트림을 함께 구독하며,
+        백그라운드 새로 고침이 진행 중이면 그 결과를 기다립니다 (API 호출은 항목당 한 번).
+        스트림이 중간에 끊기면 반환한 이터레이터가 받은 조각 뒤에 StreamIncompleteError를 냅니다
+        (화면은 부분 결과 대신 기본 요약을 표시).
+
+        Returns:
+            텍스트 조각 이터레이터, 마감을 넘기거나 첫 조각 전에 실패하면 None
+        """
+        if not self.claude_api.is_available():
+            # API 장애로 회로 차단기가 열려 있으면 기다리지 않고 기본 요약으로 대신
+            FALLBACKS.inc(kind="summary")
+            return None
+        if self.scraper.is_sample(zodiac, marie_claire):
+            # 샘플 운세로는 종합 운세를 생성하지 않음 (실제 운세를 가져오면 그때 생성)
+            return None
+        timeout = self.cold_deadline if first_chunk_timeout is None else first_chunk_timeout
+
+        key = (date.isoformat(), zodiac)
+        with self._lock:
+            refreshing = self._refreshing.get(key)
+            stream = self._streams.get(key)
+            started = refreshing is None and stream is None
+            if started and self._foreground_pending() < self.max_pending:
+                stream = self._streams[key] = _SummaryStream()
+
+        if refreshing is not None and stream is None:
+            # 백그라운드 새로 고침이 같은 항목을 생성 중이면 그 결과를 한 번에 표시
+            try:
+                entry = refreshing.result(timeout=timeout)
+            except Exception:
+                FALLBACKS.inc(kind="deadline")
+                return None
+            # 새로 고침 결과가 기본 요약이면 remember()에서 이미 기록됨
+            return iter([entry["summary"]]) if entry["summary_source"] == SUMMARY_SOURCE_CLAUDE else None
+        if stream is None:
+            FALLBACKS.inc(kind="shed")
+            return None
+        if started:
+            self._executor.submit(self._produce_stream, stream, key, date, zodiac, marie_claire)
+        if not stream.wait_first(timeout):
+            FALLBACKS.inc(kind="deadline")
+            return None
+        return stream.subscribe()
+
+    def _produce_stream(self, stream: _SummaryStream, key: Tuple[str, str],
+                        date: datetime.date, zodiac: str, marie_claire: str) -> None:
+        """종합 운세를 스트리밍으로 생성해 구독자에게 전달하고, 완료되면 결과를 기록합니다."""
+        horoscope_data = [(MARIE_CLAIRE_SITE, marie_claire)]
+        end = _STREAM_FAILED
+        try:
+            for delta in self.claude_api.stream_comprehensive_summary(horoscope_data, zodiac, date):
+                stream.put(delta)
+            # 스트림이 완료되었으면 저장소 / 캐시에 결과가 남아 있음
+            summary = self.claude_api.lookup_comprehensive_summary(horoscope_data, zodiac, date)
+            if summary:
+                self.remember(date, zodiac, marie_claire, summary)
+            end = _STREAM_END
+        except StreamIncompleteError as e:
+            logger.warning("%s", e)
+        except Exception as e:
+            logger.exception("종합 운세 스트리밍 오류: %s", e)
+        finally:
+            stream.finish(end)
+            with self._lock:
+                self._streams.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # 기록 / 새로 고침
+    # ------------------------------------------------------------------
+    def remember(self, date: datetime.date, zodiac: str, marie_claire: str, summary: Optional[str]) -> dict:
+        """
+        결과를 메모리 캐시에 기록합니다. summary가 None이면 기본 요약으로 채우고
+        FALLBACK_RETRY_INTERVAL 뒤 새로 고침 대상으로 표시합니다 (연속 실패 시 간격을 늘림).
+        """
+        key = (date.isoformat(), zodiac)
+        previous = self.results.get(key)
+        attempts = 1
+        if not summary:
+            FALLBACKS.inc(kind="summary")
+            if previous is not None and previous["summary_source"] == SUMMARY_SOURCE_FALLBACK:
+                attempts = previous.get("fallback_attempts", 1) + 1
+        entry = self._make_entry(date, zodiac, marie_claire, summary, attempts)
+        self.results.set(key, entry)
+        return entry
+
+    def refresh(self, date: datetime.date, zodiac: str) -> bool:
+        """
+        백그라운드 새로 고침을 예약합니다. 같은 항목이 이미 진행 중이면 그 작업을 그대로 두고,
+        백그라운드 작업이 max_pending_background 이상 쌓여 있으면 무시합니다 (기존 결과를 계속 제공).
+
+        Returns:
+            예약했거나 이미 진행 중이면 True
+        """
+        with self._lock:
+            if len(self._background) >= self.max_pending_background:
+                return False
+        self._submit_refresh(date, zodiac, revalidate=True, background=True)
+        return True
+
+    def is_overloaded(self) -> bool:
+        """사용자 요청으로 진행 / 대기 중인 생성 작업(생성 + 스트리밍)이 max_pending 이상이면 True"""
+        with self._lock:
+            return self._foreground_pending() >= self.max_pending
+
+    def _foreground_pending(self) -> int:
+        # self._lock 안에서 호출
+        return len(self._refreshing) - len(self._background) + len(self._streams)
+
+    def prewarm(self, date: datetime.date, zodiacs: List[str]) -> int:
+        """
+        사용자 요청 전에 결과를 미리 생성합니다 (스케줄러용, 캐시 적중 지표에는 포함하지 않음).
+
+        결과가 없거나 새로 고칠 시점이 지난 별자리만 작업자 풀에 예약합니다.
+
+        Returns:
+            예약한 별자리 수
+        """
+        submitted = 0
+        for zodiac in zodiacs:
+            entry = self.results.get((date.isoformat(), zodiac)) or self._load_from_store(date, zodiac)
+            if (entry is None or time.time() >= entry["fresh_until"]) and self.refresh(date, zodiac):
+                submitted += 1
+        return submitted
+
+    def _submit_refresh(self, date: datetime.date, zodiac: str, revalidate: bool = False, background: bool = False):
+        key = (date.isoformat(), zodiac)
+        with self._lock:
+            future = self._refreshing.get(key)
+            if future is not None:
+                return future
+            executor = self._background_executor if background else self._executor
+            future = executor.submit(self._regenerate, date, zodiac, revalidate)
+            self._refreshing[key] = future
+            if background:
+                self._background.add(key)
+
+        def done(_):
+            with self._lock:
+                if self._refreshing.get(key) is future:
+                    del self._refreshing[key]
+                    self._background.discard(key)
+        future.add_done_callback(done)
+        return future
+
+    def _regenerate(self, date: datetime.date, zodiac: str, revalidate: bool = False) -> dict:
+        """
+        스크래핑과 종합 운세 생성을 다시 실행하고 결과를 기록합니다.
+
+        revalidate면(새로 고칠 시점이 지난 결과) 저장소의 원문 대신 월별 페이지를 다시 확인합니다
+        (페이지 캐시 / 조건부 요청). 종합 운세는 입력 해시로 저장되므로 운세가 그대로면
+        저장된 종합 운세를 API 호출 없이 재사용하고, 페이지가 수정되었을 때만 다시 생성합니다.
+        """
+        marie_claire = self._revalidate_marie_claire(date, zodiac) if revalidate else None
+        if not marie_claire:
+            marie_claire = self.scraper.get_marie_claire_horoscope(date, zodiac)
+        summary = None
+        # 스크래핑에 실패해 샘플 운세를 받았으면 종합 운세를 생성 / 저장하지 않고
+        # 기본 요약(바로 새로 고침 대상)으로 두어 페이지가 복구된 뒤 다시 생성
+        if self.claude_api.is_available() and marie_claire and not self.scraper.is_sample(zodiac, marie_claire):
+            horoscope_data = [(MARIE_CLAIRE_SITE, marie_claire)]
+            self.claude_api.get_comprehensive_summary(horoscope_data, zodiac, date)
+            summary = self.claude_api.lookup_comprehensive_summary(horoscope_data, zodiac, date)
+        return self.remember(date, zodiac, marie_claire, summary)
+
+    def _revalidate_marie_claire(self, date: datetime.date, zodiac: str) -> Optional[str]:
+        """월별 페이지를 저장소를 거치지 않고 다시 확인한 마리끌레어 운세 (실패하면 None)"""
+        try:
+            return self.scraper.get_marie_claire_sections(date).get(zodiac)
+        except Exception as e:
+            logger.warning("마리끌레어 월별 페이지 재확인 오류: %s", e)
+            return None
+
+    def _load_from_store(self, date: datetime.date, zodiac: str) -> Optional[dict]:
+        """디스크 저장소에 마리끌레어 운세와 그 운세로 생성한 종합 운세가 모두 있으면 결과로 기록합니다."""
+        if self.store is None:
+            return None
+        marie_claire = self.store.get_raw("marie_claire", month_key(date), zodiac)
+        if not marie_claire:
+            return None
+        key = self.claude_api.summary_key([(MARIE_CLAIRE_SITE, marie_claire)], zodiac, date)
+        summary = self.store.get_summary("claude", day_key(date), zodiac, key)
+        if not summary:
+            return None
+        return self.remember(date, zodiac, marie_claire, summary)
+
+    def _sample_marie_claire(self, zodiac: str) -> str:
+        return self.scraper.sample_horoscopes.get(zodiac, {}).get("marie_claire", "")
+
+    def _make_entry(self, date: datetime.date, zodiac: str, marie_claire: str, summary: Optional[str],
+                    attempts: int = 1) -> dict:
+        if summary:
+            source, fresh_ttl, attempts = SUMMARY_SOURCE_CLAUDE, self.fresh_ttl, 0
+        else:
+            horoscope_data: List[Tuple[str, str]] = [(MARIE_CLAIRE_SITE, marie_claire)] if marie_claire else []
+            summary = create_comprehensive_summary(horoscope_data, zodiac, date)
+            # API 키가 없으면 기본 요약이 최종 결과이므로 다시 생성하지 않음
+            source = SUMMARY_SOURCE_FALLBACK
+            if self.claude_api.api_key:
+                fresh_ttl = min(FALLBACK_RETRY_MAX, FALLBACK_RETRY_INTERVAL * 2 ** (attempts - 1))
+            else:
+                fresh_ttl = self.fresh_ttl
+        return {
+            "date": date,
+            "zodiac": zodiac,
+            "marie_claire": marie_claire,
+            "summary": summary,
+            "summary_source": source,
+            "fresh_until": time.time() + fresh_ttl,
+            "fallback_attempts": attempts,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait)
+        self._background_executor.shutdown(wait=wait)
+
+
+_default_service = None
+_default_service_lock = threading.Lock()
+
+
+def get_default_service() -> HoroscopeService:
+    """프로세스 전체에서 공유하는 서비스를 반환합니다 (기본 저장소 사용)."""
+    global _default_service
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = HoroscopeService(store=get_default_store())
+        return _default_service
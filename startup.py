@@ -0,0 +1,105 @@
+"""
+앱 시작 비용 관리
+
+Streamlit은 화면을 다시 그릴 때마다 main.py를 다시 실행하므로, 프로세스당 한 번이면 되는
+작업(.env 로드, 무거운 모듈 로드)을 여기서 한 번만 처리하고 소요 시간을 기록합니다.
+
+    horoscope_stage_seconds{stage="import",module=...}  지연 로드한 모듈의 로드 시간
+    horoscope_stage_seconds{stage="first_render"}       프로세스의 첫 화면 스크립트 실행 시간
+    horoscope_stage_seconds{stage="render"}             이후 재실행 시간
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Callable, Iterable, Optional
+
+from metrics import STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_env_loaded = False
+_first_render_done = False
+_preloading = set()
+
+
+def load_env() -> None:
+    """.env 파일을 프로세스당 한 번만 읽습니다 (이미 설정된 환경 변수는 덮어쓰지 않음)."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _lock:
+        if _env_loaded:
+            return
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    모듈을 처음 필요할 때 불러오고 로드 시간을 기록합니다.
+
+    이미 불러온 모듈은 sys.modules에서 바로 반환하므로 재실행마다 호출해도 비용이 없습니다.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - started
+    STAGE_SECONDS.observe(elapsed, stage="import", module=name)
+    logger.info("%s 모듈 로드: %.1fms", name, elapsed * 1000)
+    return module
+
+
+def preload(names: Iterable[str], on_loaded: Optional[Callable[[], None]] = None) -> None:
+    """
+    첫 화면을 그린 뒤 백그라운드 스레드에서 모듈을 미리 불러옵니다 (모듈마다 한 번).
+
+    사용자가 첫 버튼을 누를 때 모듈 로드 시간을 기다리지 않도록 하기 위한 것으로,
+    로드에 실패해도 실제로 사용할 때 다시 시도되므로 경고만 남깁니다.
+    on_loaded는 모듈을 새로 불러왔을 때 같은 스레드에서 이어서 실행됩니다.
+    """
+    with _lock:
+        pending = [name for name in names if name not in sys.modules and name not in _preloading]
+        _preloading.update(pending)
+    if not pending:
+        return
+
+    def run():
+        for name in pending:
+            try:
+                lazy_import(name)
+            except Exception as e:
+                logger.warning("%s 모듈 미리 로드 실패: %s", name, e)
+                return
+        if on_loaded is not None:
+            try:
+                on_loaded()
+            except Exception as e:
+                logger.warning("미리 로드 후 작업 실패: %s", e)
+
+    threading.Thread(target=run, name="preload", daemon=True).start()
+
+
+@contextmanager
+def measure_render():
+    """스크립트 실행 시간을 기록합니다. 프로세스의 첫 실행은 first_render로 따로 기록합니다."""
+    global _first_render_done
+    with _lock:
+        first = not _first_render_done
+        _first_render_done = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage="first_render" if first else "render")
+        if first:
+            logger.info("첫 화면 렌더링: %.1fms", elapsed * 1000)
@@ -0,0 +1,170 @@
+import os
+import sqlite3
+import threading
+import time
+import datetime
+from typing import Dict, Optional
+
+# 기본 저장 경로 (.env 또는 환경 변수 HOROSCOPE_DB_PATH로 변경 가능)
+DEFAULT_DB_PATH = "horoscope_cache.db"
+
+# 저장 항목 종류
+KIND_RAW = "raw"          # 사이트에서 스크래핑한 원문
+KIND_SUMMARY = "summary"  # AI가 생성한 종합 운세
+
+
+def month_key(date: datetime.date) -> str:
+    """월별 운세용 기간 키 (예: 2025-07)"""
+    return f"{date.year:04d}-{date.month:02d}"
+
+
+def day_key(date: datetime.date) -> str:
+    """일별 운세용 기간 키 (예: 2025-07-15)"""
+    return date.isoformat()
+
+
+class HoroscopeStore:
+    """(종류, 출처, 기간, 별자리)를 키로 운세를 디스크에 저장하는 SQLite 저장소"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.getenv("HOROSCOPE_DB_PATH", DEFAULT_DB_PATH)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS horoscopes (
+                kind TEXT NOT NULL,
+                source TEXT NOT NULL,
+                period TEXT NOT NULL,
+                zodiac TEXT NOT NULL,
+                content TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                input_hash TEXT,
+                PRIMARY KEY (kind, source, period, zodiac)
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(horoscopes)")}
+        if "input_hash" not in columns:
+            # 이전 버전 저장소: 입력 해시가 없는 종합 운세는 get_summary에서 찾지 않으므로 다시 생성됨
+            self._conn.execute("ALTER TABLE horoscopes ADD COLUMN input_hash TEXT")
+        # 조건부 요청용 URL별 검증자(ETag / Last-Modified)와 마지막 본문
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, kind: str, source: str, period: str, zodiac: str) -> Optional[str]:
+        """저장된 운세를 반환합니다. 없으면 None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM horoscopes WHERE kind=? AND source=? AND period=? AND zodiac=?",
+                (kind, source, period, zodiac),
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_period(self, kind: str, source: str, period: str) -> Dict[str, str]:
+        """한 기간에 저장된 모든 별자리 운세를 {별자리: 내용}으로 반환합니다."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT zodiac, content FROM horoscopes WHERE kind=? AND source=? AND period=?",
+                (kind, source, period),
+            ).fetchall()
+        return dict(rows)
+
+    def put(self, kind: str, source: str, period: str, zodiac: str, content: str) -> None:
+        """운세를 저장합니다 (같은 키가 있으면 덮어씀)."""
+        self.put_many(kind, source, period, {zodiac: content})
+
+    def put_many(self, kind: str, source: str, period: str, contents: Dict[str, str]) -> None:
+        """한 기간의 여러 별자리 운세를 한 트랜잭션으로 저장합니다."""
+        if not contents:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO horoscopes (kind, source, period, zodiac, content, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(kind, source, period, zodiac, content, now) for zodiac, content in contents.items()],
+            )
+            self._conn.commit()
+
+    def get_raw(self, source: str, period: str, zodiac: str) -> Optional[str]:
+        return self.get(KIND_RAW, source, period, zodiac)
+
+    def put_raw_sections(self, source: str, period: str, sections: Dict[str, str]) -> None:
+        self.put_many(KIND_RAW, source, period, sections)
+
+    def get_summary(self, source: str, period: str, zodiac: str, input_hash: str) -> Optional[str]:
+        """같은 입력(input_hash)으로 생성된 종합 운세를 반환합니다. 없거나 입력이 다르면 None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM horoscopes WHERE kind=? AND source=? AND period=? AND zodiac=? AND input_hash=?",
+                (KIND_SUMMARY, source, period, zodiac, input_hash),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_summary(self, source: str, period: str, zodiac: str, content: str, input_hash: str) -> None:
+        """종합 운세를 생성에 사용한 입력의 해시와 함께 저장합니다 (같은 키가 있으면 덮어씀)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO horoscopes (kind, source, period, zodiac, content, updated_at, input_hash) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (KIND_SUMMARY, source, period, zodiac, content, time.time(), input_hash),
+            )
+            self._conn.commit()
+
+    def get_http_cache(self, url: str) -> Optional[dict]:
+        """URL의 검증자와 본문을 {'etag', 'last_modified', 'body'}로 반환합니다. 없으면 None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body FROM http_cache WHERE url=?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "body": bytes(row[2])}
+
+    def put_http_cache(self, url: str, etag: Optional[str], last_modified: Optional[str], body: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, time.time()),
+            )
+            self._conn.commit()
+
+    def touch_http_cache(self, url: str) -> None:
+        """304 응답으로 재검증된 시각을 기록합니다."""
+        with self._lock:
+            self._conn.execute("UPDATE http_cache SET updated_at=? WHERE url=?", (time.time(), url))
+            self._conn.commit()
+
+    def delete_http_cache(self, url: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM http_cache WHERE url=?", (url,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store() -> HoroscopeStore:
+    """프로세스 전체에서 공유하는 기본 저장소를 반환합니다."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = HoroscopeStore()
+        return _default_store
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 저장소 루트의 모듈(store, claude_api 등)을 tests/에서 바로 불러올 수 있도록 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
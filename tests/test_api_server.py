@@ -0,0 +1,96 @@
+import datetime
+
+import pytest
+
+import api_server
+from service import SUMMARY_SOURCE_CLAUDE, SUMMARY_SOURCE_FALLBACK
+
+
+class FakeService:
+    def __init__(self, summary_source=SUMMARY_SOURCE_CLAUDE):
+        self.summary_source = summary_source
+        self.calls = []
+
+    def get_horoscope(self, date, zodiac):
+        self.calls.append((date, zodiac))
+        return {
+            "date": date,
+            "zodiac": zodiac,
+            "marie_claire": f"{zodiac} 원문",
+            "summary": f"{zodiac} 종합 운세",
+            "summary_source": self.summary_source,
+            "stale": False,
+        }
+
+
+@pytest.fixture
+def service(monkeypatch):
+    fake = FakeService()
+    monkeypatch.setattr(api_server, "get_default_service", lambda: fake)
+    monkeypatch.setattr(api_server, "_scheduler_checked", True)
+    return fake
+
+
+def call(path, method="GET", **environ):
+    captured = {}
+
+    def start_response(status, headers):
+        captured["status"] = status
+        captured["headers"] = dict(headers)
+
+    environ.update(REQUEST_METHOD=method, PATH_INFO=path)
+    body = b"".join(api_server.application(environ, start_response))
+    return int(captured["status"].split()[0]), captured["headers"], body
+
+
+def test_etag_match_returns_304(service):
+    status, headers, body = call("/horoscope/leo/2025-07-15")
+    assert status == 200
+    assert headers["Cache-Control"] == f"public, max-age={api_server.FRESH_MAX_AGE}"
+    etag = headers["ETag"]
+
+    status, headers, body = call("/horoscope/leo/2025-07-15", HTTP_IF_NONE_MATCH=etag)
+    assert status == 304
+    assert body == b""
+    assert headers["ETag"] == etag
+    assert "Content-Length" not in headers
+
+
+def test_weak_and_listed_etags_match(service):
+    etag = call("/horoscope/leo/2025-07-15")[1]["ETag"]
+    assert call("/horoscope/leo/2025-07-15", HTTP_IF_NONE_MATCH=f'"other", W/{etag}')[0] == 304
+    assert call("/horoscope/leo/2025-07-15", HTTP_IF_NONE_MATCH='"other"')[0] == 200
+
+
+def test_if_none_match_star_matches_any_200(service):
+    assert call("/horoscope/leo/2025-07-15", HTTP_IF_NONE_MATCH="*")[0] == 304
+
+
+def test_errors_are_never_304(service):
+    assert call("/horoscope/leo/2031-01-01", HTTP_IF_NONE_MATCH="*")[0] == 400
+    assert call("/horoscope/unknown/2025-07-15", HTTP_IF_NONE_MATCH="*")[0] == 404
+    assert service.calls == []
+
+
+def test_fallback_results_are_not_cached_by_clients(service):
+    service.summary_source = SUMMARY_SOURCE_FALLBACK
+    assert call("/horoscope/leo/2025-07-15")[1]["Cache-Control"] == "no-cache"
+
+
+def test_today_uses_current_date(service):
+    # PEP 3333: PATH_INFO는 UTF-8 바이트를 latin-1로 읽은 문자열
+    assert call("/horoscope/사자자리/today".encode("utf-8").decode("latin-1"))[0] == 200
+    assert service.calls == [(datetime.date.today(), "사자자리")]
+
+
+def test_metrics_is_loopback_only_by_default(service, monkeypatch):
+    monkeypatch.setattr(api_server, "METRICS_ACCESS", "local")
+    assert call("/metrics", REMOTE_ADDR="203.0.113.7")[0] == 404
+    assert call("/metrics", REMOTE_ADDR="127.0.0.1")[0] == 200
+    assert call("/metrics", REMOTE_ADDR="::1")[0] == 200
+
+    monkeypatch.setattr(api_server, "METRICS_ACCESS", "public")
+    assert call("/metrics", REMOTE_ADDR="203.0.113.7")[0] == 200
+
+    monkeypatch.setattr(api_server, "METRICS_ACCESS", "off")
+    assert call("/metrics", REMOTE_ADDR="127.0.0.1")[0] == 404
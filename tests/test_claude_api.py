@@ -0,0 +1,151 @@
+import datetime
+import itertools
+import json
+
+import pytest
+import requests
+
+import claude_api
+import http_client
+from cache import TTLCache
+from claude_api import ClaudeAPI
+
+_hosts = itertools.count()
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None, content=b""):
+        self.status_code = status_code
+        self._payload = payload
+        self.content = content
+        self.headers = {}
+        self.text = json.dumps(payload) if payload is not None else ""
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}")
+
+    def close(self):
+        pass
+
+
+class FakeBatchSession:
+    """Message Batches API 흉내: 제출 / 상태 확인 / 취소 / 결과 요청을 기록합니다."""
+
+    def __init__(self, statuses, results=b"", poll_errors=0):
+        self.statuses = list(statuses)
+        self.results = results
+        self.poll_errors = poll_errors
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        if method == "POST" and url.endswith("/cancel"):
+            return FakeResponse(200, {"id": "batch-1", "processing_status": "canceling"})
+        if method == "POST":
+            return FakeResponse(200, {"id": "batch-1", "processing_status": "in_progress"})
+        if url.endswith("/results"):
+            return FakeResponse(200, content=self.results)
+        if self.poll_errors:
+            self.poll_errors -= 1
+            raise requests.ConnectionError("poll failed")
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        payload = {"id": "batch-1", "processing_status": status}
+        if status == "ended":
+            payload["results_url"] = url + "/results"
+        return FakeResponse(200, payload)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+def _succeeded(custom_id, text):
+    return json.dumps({"custom_id": custom_id, "result": {"type": "succeeded", "message": {"content": [{"type": "text", "text": text}]}}})
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(http_client, "retry_delay", lambda *args, **kwargs: 0)
+    monkeypatch.setattr(claude_api, "BATCH_CANCEL_GRACE", 0.05)
+    client = ClaudeAPI()
+    # 테스트마다 다른 호스트를 사용해 회로 차단기 상태를 공유하지 않음
+    client.base_url = f"https://batch-{next(_hosts)}.test/v1/messages"
+    return client
+
+
+def test_parse_batch_results_keeps_good_lines(api):
+    content = "\n".join([
+        _succeeded("a", "사자자리 운세"),
+        "{not json",
+        json.dumps({"result": {"type": "succeeded"}}),  # custom_id 없음
+        json.dumps({"custom_id": "b", "result": {"type": "errored", "error": {"error": {"message": "overloaded"}}}}),
+        json.dumps({"custom_id": "c", "result": {"type": "succeeded", "message": {"content": [{}]}}}),
+        "",
+    ]).encode("utf-8")
+
+    outcomes = api._parse_batch_results(content)
+
+    assert outcomes["a"] == ("사자자리 운세", None)
+    assert outcomes["b"] == (None, "일괄 처리 항목 실패: overloaded")
+    summary, error = outcomes["c"]
+    assert summary is None and "읽을 수 없습니다" in error
+    assert set(outcomes) == {"a", "b", "c"}
+
+
+def test_batch_retries_failed_poll_and_collects_results(api):
+    session = FakeBatchSession(["in_progress", "ended"], results=_succeeded("a", "결과").encode("utf-8"), poll_errors=1)
+    api.session = session
+
+    outcomes = api._run_message_batch({"a": "프롬프트 a", "b": "프롬프트 b"}, poll_interval=0, timeout=5)
+
+    assert outcomes["a"] == ("결과", None)
+    assert outcomes["b"][0] is None
+    assert not any(url.endswith("/cancel") for _, url in session.calls)
+
+
+def test_batch_deadline_cancels_and_never_returns_none(api):
+    session = FakeBatchSession(["in_progress"])
+    api.session = session
+
+    outcomes = api._run_message_batch({"a": "프롬프트 a"}, poll_interval=0.01, timeout=0.03)
+
+    assert outcomes is not None
+    assert outcomes["a"][0] is None and "batch-1" in outcomes["a"][1]
+    assert ("POST", api.base_url + "/batches/batch-1/cancel") in session.calls
+
+
+def test_no_sync_fallback_after_submit(api, monkeypatch):
+    api.api_key = "test-key"
+    session = FakeBatchSession(["in_progress"])
+    api.session = session
+    monkeypatch.setattr(api, "_run_concurrent", lambda *args, **kwargs: pytest.fail("동시 호출로 다시 보내면 안 됨"))
+    monkeypatch.setattr(api, "summary_cache", TTLCache())
+
+    results = api.get_comprehensive_summaries(
+        [([("마리끌레어 코리아", "사자자리 운세 원문")], "사자자리", datetime.date(2025, 7, 15))],
+        poll_interval=0.01, timeout=0.03,
+    )
+
+    assert results[0]["summary"] is None
+    assert results[0]["error"]
+
+
+def test_submit_failure_falls_back_to_concurrent_calls(api, monkeypatch):
+    api.api_key = "test-key"
+
+    class FailingSession:
+        def request(self, method, url, **kwargs):
+            return FakeResponse(400, {"error": {"message": "batches disabled"}})
+
+    api.session = FailingSession()
+    monkeypatch.setattr(api, "summary_cache", TTLCache())
+    monkeypatch.setattr(api, "_run_concurrent", lambda prompts, *args: {custom_id: ("동시 호출 결과", None) for custom_id in prompts})
+
+    results = api.get_comprehensive_summaries(
+        [([("마리끌레어 코리아", "사자자리 운세 원문")], "사자자리", datetime.date(2025, 7, 15))],
+    )
+
+    assert results[0]["summary"] == "동시 호출 결과"
@@ -0,0 +1,84 @@
+import pytest
+
+import http_client
+from http_client import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(http_client.time, "monotonic", fake)
+    return fake
+
+
+def _breaker(**kwargs):
+    options = dict(window=4, min_requests=4, failure_rate=0.5, open_seconds=30)
+    options.update(kwargs)
+    return CircuitBreaker("test-host", **options)
+
+
+def test_stays_closed_below_min_requests(clock):
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CIRCUIT_CLOSED
+    assert breaker.allow()
+
+
+def test_opens_when_failure_rate_reached(clock):
+    breaker = _breaker()
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_CLOSED
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    assert breaker.is_open()
+    assert not breaker.allow()
+
+
+def test_half_open_allows_one_probe_then_closes_on_success(clock):
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    assert not breaker.is_open()
+
+    assert breaker.allow()
+    assert not breaker.allow()  # 시험 요청은 하나만
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+def test_release_returns_probe_slot(clock):
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
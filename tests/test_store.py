@@ -0,0 +1,72 @@
+import sqlite3
+
+from store import HoroscopeStore, KIND_SUMMARY
+
+
+def _create_old_store(path):
+    """input_hash 열이 없던 이전 버전의 저장소를 만듭니다."""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE horoscopes (
+            kind TEXT NOT NULL,
+            source TEXT NOT NULL,
+            period TEXT NOT NULL,
+            zodiac TEXT NOT NULL,
+            content TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (kind, source, period, zodiac)
+        )
+        """
+    )
+    conn.execute(
+        "INSERT INTO horoscopes VALUES (?, ?, ?, ?, ?, ?)",
+        (KIND_SUMMARY, "claude", "2025-07-15", "사자자리", "이전 종합 운세", 0.0),
+    )
+    conn.execute(
+        "INSERT INTO horoscopes VALUES (?, ?, ?, ?, ?, ?)",
+        ("raw", "marie_claire", "2025-07", "사자자리", "사자자리 원문", 0.0),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_old_store_gets_input_hash_column(tmp_path):
+    path = str(tmp_path / "old.db")
+    _create_old_store(path)
+
+    store = HoroscopeStore(path)
+    columns = {row[1] for row in store._conn.execute("PRAGMA table_info(horoscopes)")}
+    assert "input_hash" in columns
+    # 원문은 그대로 유지되고, 입력 해시가 없는 종합 운세는 찾지 않음 (다시 생성 대상)
+    assert store.get_raw("marie_claire", "2025-07", "사자자리") == "사자자리 원문"
+    assert store.get_summary("claude", "2025-07-15", "사자자리", "abc") is None
+
+    store.put_summary("claude", "2025-07-15", "사자자리", "새 종합 운세", "abc")
+    assert store.get_summary("claude", "2025-07-15", "사자자리", "abc") == "새 종합 운세"
+    assert store.get_summary("claude", "2025-07-15", "사자자리", "other") is None
+    store.close()
+
+
+def test_migration_is_idempotent(tmp_path):
+    path = str(tmp_path / "old.db")
+    _create_old_store(path)
+    HoroscopeStore(path).close()
+
+    store = HoroscopeStore(path)
+    store.put_summary("claude", "2025-07-15", "사자자리", "종합 운세", "abc")
+    store.close()
+
+    reopened = HoroscopeStore(path)
+    assert reopened.get_summary("claude", "2025-07-15", "사자자리", "abc") == "종합 운세"
+    reopened.close()
+
+
+def test_http_cache_round_trip_and_delete(tmp_path):
+    store = HoroscopeStore(str(tmp_path / "h.db"))
+    store.put_http_cache("https://example.com/a", '"etag"', None, b"body")
+    assert store.get_http_cache("https://example.com/a") == {"etag": '"etag"', "last_modified": None, "body": b"body"}
+
+    store.delete_http_cache("https://example.com/a")
+    assert store.get_http_cache("https://example.com/a") is None
+    store.close()